@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from threading import Lock, RLock
+from atheriz.singletons.lockpool import new_lock
 from atheriz.logger import logger
 from atheriz.utils import get_import_path, instance_from_string
 
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
 
 class CmdSet:
     def __init__(self):
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.commands: dict[str, Command] = {}
 
     def get_all(self) -> list[Command]:
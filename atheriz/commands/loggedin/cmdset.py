@@ -27,6 +27,8 @@ from atheriz.commands.loggedin.set import SetCommand, UnsetCommand
 from atheriz.commands.loggedin.delete import DeleteCommand
 from atheriz.commands.loggedin.wander import WanderCommand
 from atheriz.commands.loggedin.move import MoveCommand
+from atheriz.commands.loggedin.queues import QueuesCommand
+from atheriz.commands.loggedin.find import FindCommand
 
 class LoggedinCmdSet(CmdSet):
     def __init__(self):
@@ -61,3 +63,5 @@ class LoggedinCmdSet(CmdSet):
         self.add(DeleteCommand())
         self.add(WanderCommand())
         self.add(MoveCommand())
+        self.add(QueuesCommand())
+        self.add(FindCommand())
@@ -1,6 +1,5 @@
 from atheriz.commands.base_cmd import Command
 from atheriz.objects.base_obj import Object
-from atheriz.singletons.objects import remove_object
 import argparse
 from typing import TYPE_CHECKING
 
@@ -62,7 +61,7 @@ class DeleteCommand(Command):
 
         full_name = target.get_display_name(caller)
         if args.recursive:
-            count = self._delete_recursive(target)
+            count = Object.delete_many([target], recursive=True)
             caller.msg(f"Deleted {full_name} and {count-1} contained objects.")
         else:
             # Move contents to current location
@@ -74,37 +73,5 @@ class DeleteCommand(Command):
                     caller.msg(f"Moved contents of {full_name} to {location.get_display_name(caller)}.")
             
             # Delete the object
-            self._delete_object(target)
+            Object.delete_many([target])
             caller.msg(f"Deleted {full_name}.")
-
-    def _delete_recursive(self, obj: Object) -> int:
-        """
-        Recursively delete an object and its contents.
-        Returns the number of objects deleted.
-        """
-        count = 0
-        if obj.contents:
-             # Iterate over a copy since we are modifying the list
-            for content in list(obj.contents):
-                count += self._delete_recursive(content)
-        
-        self._delete_object(obj)
-        count += 1
-        return count
-
-    def _delete_object(self, obj: Object):
-        """
-        Perform the actual deletion of an object.
-        """
-        # Remove from location
-        if obj.location:
-            obj.location.remove_object(obj)
-            obj.location = None
-            
-        if obj.is_connected and obj.session and obj.session.connection:
-            obj.is_deleted = True
-            obj.session.account.remove_character(obj)
-            obj.session.connection.close()
-            
-        # Remove from global registry
-        remove_object(obj)
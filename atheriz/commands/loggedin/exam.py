@@ -77,7 +77,10 @@ class ExamineCommand(Command):
 
         ignore = ["access"]
 
-        attrs = vars(target)
+        attrs = dict(vars(target))
+        # Object's schema fields are slots, vars() doesn't have them
+        for f in getattr(target, "_schema", ()):
+            attrs[f.name] = getattr(target, f.name)
         sorted_keys = sorted(attrs.keys())
 
         for key in sorted_keys:
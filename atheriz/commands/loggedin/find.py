@@ -0,0 +1,62 @@
+from atheriz.commands.base_cmd import Command
+from atheriz.singletons.objects import fuzzy_search
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from atheriz.objects.base_obj import Object
+
+
+def _kind(obj) -> str:
+    if getattr(obj, "is_account", False):
+        return "account"
+    if getattr(obj, "is_channel", False):
+        return "channel"
+    if getattr(obj, "is_pc", False):
+        return "pc"
+    if getattr(obj, "is_npc", False):
+        return "npc"
+    if getattr(obj, "is_item", False):
+        return "item"
+    return "object"
+
+
+class FindCommand(Command):
+    key = "find"
+    category = "Admin"
+    desc = "Find objects and accounts anywhere by name, typos allowed."
+    use_parser = True
+
+    # pyrefly: ignore
+    def access(self, caller: Object) -> bool:
+        return caller.is_builder
+
+    def setup_parser(self):
+        self.parser.add_argument("name", nargs="+", help="Name to look for.")
+        self.parser.add_argument(
+            "-d", "--distance", type=int, default=2, help="Most typos a match can have."
+        )
+        self.parser.add_argument("-n", "--limit", type=int, default=10, help="Most matches to show.")
+        self.parser.add_argument("-a", "--accounts", action="store_true", help="Only accounts.")
+
+    # pyrefly: ignore
+    def run(self, caller: Object, args):
+        if not args:
+            caller.msg(self.print_help())
+            return
+        name = " ".join(args.name)
+        start = time.perf_counter()
+        matches = fuzzy_search(
+            name,
+            max(0, args.distance),
+            max(1, args.limit),
+            (lambda x: x.is_account) if args.accounts else None,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if not matches:
+            caller.msg(f"Nothing found for '{name}' ({elapsed:.2f} ms).")
+            return
+        lines = [f"Matches for '{name}' ({elapsed:.2f} ms):"]
+        for d, obj in matches:
+            lines.append(f"  #{obj.id} {obj.name} ({_kind(obj)}, {d} off)")
+        caller.msg("\n".join(lines))
@@ -1,9 +1,11 @@
-from random import choice
+import asyncio
 from atheriz.objects.nodes import Node, NodeLink, NodeGrid, NodeArea
 from atheriz.singletons.get import get_node_handler, get_map_handler
 from atheriz.singletons.map import MapInfo, LegendEntry
 from atheriz.commands.base_cmd import Command
 from atheriz.singletons.objects import get_by_type
+from atheriz.singletons.asyncthreadpool import offload_async
+from atheriz.mazegen import gen_maze
 import atheriz.settings as settings
 from atheriz.utils import wrap_xterm256
 import time
@@ -27,15 +29,18 @@ class MazeCommand(Command):
         super().__init__()
 
     # pyrefly: ignore
-    def run(self, caller: Object, args):
+    async def run(self, caller: Object, args):
         nh = get_node_handler()
         width = 50
         height = 20
         # map returned is a rectangular outline around grid, so actual map size returned is +2
         start = time.time()
-        map1, grid1 = gen_map_and_grid(width, height, "maze1")
-        map2, grid2 = gen_map_and_grid(width, height, "maze2")
-        map3, grid3 = gen_map_and_grid(width, height, "maze3")
+        # the mazes themselves are generated in parallel outside the threadpool
+        mazes = await asyncio.gather(*(offload_async(gen_maze, width, height) for _ in range(3)))
+        (cells1, map1), (cells2, map2), (cells3, map3) = mazes
+        grid1 = create_grid(cells1, "maze1")
+        grid2 = create_grid(cells2, "maze2")
+        grid3 = create_grid(cells3, "maze3")
         rooms = len(grid1) + len(grid2) + len(grid3)
         elapsed = (time.time() - start) * 1000
         caller.msg(
@@ -100,102 +105,10 @@ class MazeCommand(Command):
             caller.map_enabled = True
 
 
-def create_maze(width: int, height: int) -> dict:
-    visited = {}
-
-    def get_valid_neighbors(coord: tuple, width: int, height: int) -> list:
-        coords_to_check = []
-        if coord[0] > 0:
-            coords_to_check.append((coord[0] - 1, coord[1]))
-        if coord[0] < width - 1:
-            coords_to_check.append((coord[0] + 1, coord[1]))
-        if coord[1] > 0:
-            coords_to_check.append((coord[0], coord[1] - 1))
-        if coord[1] < height - 1:
-            coords_to_check.append((coord[0], coord[1] + 1))
-        results = []
-        for c in coords_to_check:
-            v = visited.get(c, False)
-            if not v:
-                results.append(c)
-        return results
-
-    start = (0, 0)
-    valid = get_valid_neighbors(start, width, height)
-    current = start
-    path = []
-    maze = {}
-    nodes = maze.get(current, [])
-    done = False
-    while not done:
-        c = choice(valid)
-        visited[c] = True
-        path.append(c)
-        if len(nodes) == 0:
-            maze[current] = [c]
-        else:
-            nodes.append(c)
-            maze[current] = nodes
-        current = c
-        nodes = maze.get(current, [])
-        valid = get_valid_neighbors(current, width, height)
-        while not bool(valid):
-            path = path[:-1]
-            if not bool(path):
-                done = True
-                break
-            current = path[-1]
-            nodes = maze.get(current, [])
-            valid = get_valid_neighbors(current, width, height)
-    return maze
-
-
-def create_map(maze: dict, width: int, height: int, area: str):
-    def get_dirs(src: tuple, dest: list, maze: dict) -> tuple:
-        n = False
-        s = False
-        e = False
-        w = False
-        for d in dest:
-            if d == (src[0] + 1, src[1]):
-                e = True
-            if d == (src[0] - 1, src[1]):
-                w = True
-            if d == (src[0], src[1] + 1):
-                n = True
-            if d == (src[0], src[1] - 1):
-                s = True
-        if src[0] > 0:
-            nodes = maze.get((src[0] - 1, src[1]), [])
-            for node in nodes:
-                if node == src:
-                    w = True
-                    break
-        if src[0] < width - 1:
-            nodes = maze.get((src[0] + 1, src[1]), [])
-            for node in nodes:
-                if node == src:
-                    e = True
-                    break
-        if src[1] > 0:
-            nodes = maze.get((src[0], src[1] - 1), [])
-            for node in nodes:
-                if node == src:
-                    s = True
-                    break
-        if src[1] < height - 1:
-            nodes = maze.get((src[0], src[1] + 1), [])
-            for node in nodes:
-                if node == src:
-                    n = True
-                    break
-        return (n, s, e, w)
-
-    # map = [" "] * width * height
-    map: dict[tuple[int, int], str] = {}
+def create_grid(cells: dict, area: str) -> NodeGrid:
+    """build the nodes for cells from atheriz.mazegen.gen_maze"""
     grid = NodeGrid(area, 0)
-    for k, v in maze.items():
-        dirs = get_dirs(k, v, maze)
+    for k, dirs in cells.items():
         node = Node((area, k[0], k[1], 0), "Somewhere in a mysterious maze.")
         if dirs[0]:
             node.add_link(NodeLink("north", (area, k[0], k[1] + 1, 0), ["n"]))
@@ -206,29 +119,7 @@ def create_map(maze: dict, width: int, height: int, area: str):
         if dirs[3]:
             node.add_link(NodeLink("west", (area, k[0] - 1, k[1], 0), ["w"]))
         grid.add_node(node)
-        if dirs[0] and dirs[1] and dirs[2] and dirs[3]:
-            map[(k[0], k[1])] = "╬"
-        elif dirs[0] and dirs[1] and dirs[2]:
-            map[(k[0], k[1])] = "╠"
-        elif dirs[0] and dirs[1] and dirs[3]:
-            map[(k[0], k[1])] = "╣"
-        elif dirs[1] and dirs[2] and dirs[3]:
-            map[(k[0], k[1])] = "╦"
-        elif dirs[0] and dirs[2] and dirs[3]:
-            map[(k[0], k[1])] = "╩"
-        elif dirs[1] and dirs[2]:
-            map[(k[0], k[1])] = "╔"
-        elif dirs[1] and dirs[3]:
-            map[(k[0], k[1])] = "╗"
-        elif dirs[0] and dirs[2]:
-            map[(k[0], k[1])] = "╚"
-        elif dirs[0] and dirs[3]:
-            map[(k[0], k[1])] = "╝"
-        elif dirs[0] or dirs[1]:
-            map[(k[0], k[1])] = "║"
-        elif dirs[2] or dirs[3]:
-            map[(k[0], k[1])] = "═"
-    return map, grid
+    return grid
 
 
 def map_to_string(map: list, w: int, h: int):
@@ -241,6 +132,5 @@ def map_to_string(map: list, w: int, h: int):
 
 
 def gen_map_and_grid(w: int, h: int, area: str):
-    maze = create_maze(w, h)
-    map, grid = create_map(maze, w, h, area)
-    return map, grid
+    cells, map = gen_maze(w, h)
+    return map, create_grid(cells, area)
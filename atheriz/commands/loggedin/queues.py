@@ -0,0 +1,38 @@
+from atheriz.commands.base_cmd import Command
+from atheriz.singletons.get import get_async_threadpool
+from atheriz.singletons.access import access_stats
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from atheriz.objects.base_obj import Object
+
+
+class QueuesCommand(Command):
+    key = "queues"
+    category = "Admin"
+    desc = "Show threadpool queue counters."
+    hide = True
+    use_parser = False
+
+    # pyrefly: ignore
+    def access(self, caller: Object) -> bool:
+        return caller.is_superuser
+
+    # pyrefly: ignore
+    def run(self, caller: Object, args):
+        atp = get_async_threadpool()
+        columns = ["queued", "limit", "enqueued", "served", "dropped", "rejected", "blocked"]
+        lines = [f"{'lane':<12}{'policy':<13}" + "".join(f"{c:>10}" for c in columns)]
+        for lane, stats in atp.stats().items():
+            lines.append(
+                f"{lane:<12}{stats['policy']:<13}" + "".join(f"{stats[c]:>10}" for c in columns)
+            )
+        with atp.mailbox_lock:
+            mailboxes = len(atp.mailboxes)
+        lines.append(f"Busy mailboxes: {mailboxes}")
+        acc = access_stats()
+        lines.append(
+            f"Access cache: {acc['hits']} hits, {acc['misses']} misses "
+            f"({acc['hit_rate']:.0%}), generation {acc['generation']}"
+        )
+        caller.msg("\n".join(lines))
@@ -2,7 +2,6 @@ from atheriz.commands.base_cmd import Command
 from atheriz.objects.base_account import Account
 from atheriz.objects.base_obj import Object
 from atheriz.objects.persist import save
-from atheriz.singletons.objects import add_object
 from atheriz.singletons.get import get_node_handler
 from atheriz import settings
 from pathlib import Path
@@ -44,6 +43,7 @@ class SpamCommand(Command):
         home = caller.location
 
         created = []
+        accounts = []
         start = time.time()
         for i in range(1, count + 1):
             account_name = f"account{i}"
@@ -54,18 +54,17 @@ class SpamCommand(Command):
             if not account:
                 caller.msg(f"Account '{account_name}' already exists, skipping...")
                 continue
+            accounts.append(account)
+            created.append((account_name, password, char_name))
 
-            character = Object.create(None, char_name, is_pc=True, is_mapable=True)
+        characters = Object.create_many(
+            None, [c[2] for c in created], location=home, is_pc=True, is_mapable=True
+        )
+        for account, character in zip(accounts, characters):
             character.symbol = "A"
             character.home = settings.DEFAULT_HOME
-            character.move_to(home)
             account.add_character(character)
-            add_object(account)
-            add_object(character)
-            save(account)
-            save(character)
-
-            created.append((account_name, password, char_name))
+        save(accounts + characters)
 
         # Save credentials to file
         save_path = Path(settings.SAVE_PATH)
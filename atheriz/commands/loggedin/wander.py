@@ -1,5 +1,6 @@
 from atheriz.commands.base_cmd import Command
 from atheriz.objects.base_obj import Object
+from atheriz.objects.prototypes import Prototype, spawn
 from atheriz.singletons.get import get_node_handler
 import time
 from typing import TYPE_CHECKING
@@ -24,6 +25,16 @@ class Wanderer(Object):
             return
         self.move_to(node)
 
+WANDERER = Prototype(
+    "wanderer",
+    Wanderer,
+    name="Wanderer",
+    desc="Someone wandering around.",
+    is_npc=True,
+    is_tickable=True,
+    is_mapable=True,
+)
+
 class WanderCommand(Command):
     key = "wander"
     desc = "Spawn 100 NPCs to your location to wander around"
@@ -37,8 +48,6 @@ class WanderCommand(Command):
     # pyrefly: ignore
     def run(self, caller: Object, args):
         start = time.time()
-        for i in range(100):
-            npc = Wanderer.create(caller.session, f"Wanderer {i}", f"Wanderer {i}", is_npc=True, is_tickable=True, is_mapable=True)
-            npc.move_to(caller.location)
+        spawn(WANDERER, 100, caller.location)
         end = time.time()
         caller.msg(f"Spawned 100 NPCs in {(end - start) * 1000:.2f} milliseconds")
\ No newline at end of file
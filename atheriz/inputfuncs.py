@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from atheriz.websocket import Connection
     from atheriz.objects.nodes import Node
     from atheriz.objects.base_obj import Object
+    from atheriz.singletons.asyncthreadpool import AsyncThreadPool
 
 def inputfunc(name: str | None = None):
     """
@@ -52,6 +53,13 @@ class InputFuncs:
                 handlers[attr._inputfunc_name] = attr
         return handlers
 
+    def run_command(self, atp: AsyncThreadPool, caller: Object | Connection, func, eargs):
+        """queue a command for the caller, telling them if the server is too busy to take it"""
+        if not atp.submit(
+            func, (caller, eargs), owner=caller, mailbox_limit=settings.ACTOR_MAILBOX_LIMIT
+        ):
+            caller.msg(settings.SERVER_BUSY_MESSAGE)
+
     @inputfunc()
     def text(self, connection: Connection, args: list, kwargs: dict):
         """Handle plain text/command input from the client."""
@@ -61,9 +69,9 @@ class InputFuncs:
         # if we are waiting for input pass it to the future.
         if connection.session.input_future:
             if not connection.session.input_future.done():
-                get_async_threadpool().loop.call_soon_threadsafe(
-                    connection.session.input_future.set_result, text
-                )
+                # the future belongs to whichever loop is running the prompt
+                future = connection.session.input_future
+                future.get_loop().call_soon_threadsafe(future.set_result, text)
                 connection.session.input_future = None
                 return
 
@@ -84,7 +92,7 @@ class InputFuncs:
             if cmd:
                 func, caller, eargs = cmd.execute(connection.session.puppet, cmd_args)
                 if func:
-                    atp.add_task(func, caller, eargs)
+                    self.run_command(atp, caller, func, eargs)
                 else:
                     logger.warning(f"Command {cmd_key} execute returned no func")
             else:
@@ -121,14 +129,14 @@ class InputFuncs:
                 if cmd:
                     func, caller, eargs = cmd.execute(connection.session.puppet, cmd_key)
                     if func:
-                        atp.add_task(func, caller, eargs)
+                        self.run_command(atp, caller, func, eargs)
         else:
             # Player is NOT logged in
             cmd = get_unloggedin_cmdset().get(cmd_key)
             if cmd:
                 func, caller, eargs = cmd.execute(connection, cmd_args)
                 if func:
-                    atp.add_task(func, caller, eargs)
+                    self.run_command(atp, caller, func, eargs)
             else:
                 if settings.AUTO_COMMAND_ALIASING:
                     keys = get_unloggedin_cmdset().get_keys()
@@ -143,7 +151,7 @@ class InputFuncs:
                 if cmd:
                     func, caller, eargs = cmd.execute(connection, cmd_key)
                     if func:
-                        atp.add_task(func, caller, eargs)
+                        self.run_command(atp, caller, func, eargs)
 
     @inputfunc()
     def term_size(self, connection: Connection, args: list, kwargs: dict):
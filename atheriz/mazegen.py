@@ -0,0 +1,146 @@
+"""
+maze generation as plain data, kept free of other atheriz imports so it's cheap to run through
+offload() in a subinterpreter or another process. see commands/loggedin/maze.py for turning the
+result into nodes and a map.
+"""
+
+from random import choice
+
+
+def create_maze(width: int, height: int) -> dict:
+    visited = {}
+
+    def get_valid_neighbors(coord: tuple, width: int, height: int) -> list:
+        coords_to_check = []
+        if coord[0] > 0:
+            coords_to_check.append((coord[0] - 1, coord[1]))
+        if coord[0] < width - 1:
+            coords_to_check.append((coord[0] + 1, coord[1]))
+        if coord[1] > 0:
+            coords_to_check.append((coord[0], coord[1] - 1))
+        if coord[1] < height - 1:
+            coords_to_check.append((coord[0], coord[1] + 1))
+        results = []
+        for c in coords_to_check:
+            v = visited.get(c, False)
+            if not v:
+                results.append(c)
+        return results
+
+    start = (0, 0)
+    valid = get_valid_neighbors(start, width, height)
+    current = start
+    path = []
+    maze = {}
+    nodes = maze.get(current, [])
+    done = False
+    while not done:
+        c = choice(valid)
+        visited[c] = True
+        path.append(c)
+        if len(nodes) == 0:
+            maze[current] = [c]
+        else:
+            nodes.append(c)
+            maze[current] = nodes
+        current = c
+        nodes = maze.get(current, [])
+        valid = get_valid_neighbors(current, width, height)
+        while not bool(valid):
+            path = path[:-1]
+            if not bool(path):
+                done = True
+                break
+            current = path[-1]
+            nodes = maze.get(current, [])
+            valid = get_valid_neighbors(current, width, height)
+    return maze
+
+
+def get_dirs(src: tuple, dest: list, maze: dict, width: int, height: int) -> tuple:
+    """(north, south, east, west) exits of the cell at src"""
+    n = False
+    s = False
+    e = False
+    w = False
+    for d in dest:
+        if d == (src[0] + 1, src[1]):
+            e = True
+        if d == (src[0] - 1, src[1]):
+            w = True
+        if d == (src[0], src[1] + 1):
+            n = True
+        if d == (src[0], src[1] - 1):
+            s = True
+    if src[0] > 0:
+        nodes = maze.get((src[0] - 1, src[1]), [])
+        for node in nodes:
+            if node == src:
+                w = True
+                break
+    if src[0] < width - 1:
+        nodes = maze.get((src[0] + 1, src[1]), [])
+        for node in nodes:
+            if node == src:
+                e = True
+                break
+    if src[1] > 0:
+        nodes = maze.get((src[0], src[1] - 1), [])
+        for node in nodes:
+            if node == src:
+                s = True
+                break
+    if src[1] < height - 1:
+        nodes = maze.get((src[0], src[1] + 1), [])
+        for node in nodes:
+            if node == src:
+                n = True
+                break
+    return (n, s, e, w)
+
+
+def get_symbol(dirs: tuple) -> str | None:
+    """the map symbol for a cell with these (north, south, east, west) exits"""
+    if dirs[0] and dirs[1] and dirs[2] and dirs[3]:
+        return "╬"
+    elif dirs[0] and dirs[1] and dirs[2]:
+        return "╠"
+    elif dirs[0] and dirs[1] and dirs[3]:
+        return "╣"
+    elif dirs[1] and dirs[2] and dirs[3]:
+        return "╦"
+    elif dirs[0] and dirs[2] and dirs[3]:
+        return "╩"
+    elif dirs[1] and dirs[2]:
+        return "╔"
+    elif dirs[1] and dirs[3]:
+        return "╗"
+    elif dirs[0] and dirs[2]:
+        return "╚"
+    elif dirs[0] and dirs[3]:
+        return "╝"
+    elif dirs[0] or dirs[1]:
+        return "║"
+    elif dirs[2] or dirs[3]:
+        return "═"
+    return None
+
+
+def gen_maze(width: int, height: int) -> tuple[dict, dict]:
+    """
+    generate a maze
+    Returns:
+        tuple[dict, dict]: {(x, y): (north, south, east, west)} exits for every cell the maze
+            leads out of, and
+            {(x, y): symbol} for the map
+    """
+    maze = create_maze(width, height)
+    cells = {}
+    map: dict[tuple[int, int], str] = {}
+    for k, v in maze.items():
+        dirs = get_dirs(k, v, maze, width, height)
+        cells[k] = dirs
+        symbol = get_symbol(dirs)
+        if symbol:
+            map[k] = symbol
+    return cells, map
@@ -275,6 +275,7 @@ TEMPLATE_CONFIGS = [
     ("channel.py", "atheriz.objects.base_channel", "Channel"),
     ("object.py", "atheriz.objects.base_obj", "Object"),
     ("node.py", "atheriz.objects.nodes", "Node"),
+    ("script.py", "atheriz.objects.base_script", "Script"),
 ]
 
 
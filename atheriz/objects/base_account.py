@@ -1,11 +1,11 @@
 from atheriz.singletons.objects import filter_by_type, add_object
 from atheriz.utils import get_import_path, ensure_thread_safe
 from atheriz.singletons.salt import get_salt
-from atheriz.singletons.get import get_unique_id
+from atheriz.singletons.get import get_unique_id, get_execution_profile
 from atheriz.logger import logger
 import hashlib
 import atheriz.settings as settings
-from threading import Lock, RLock
+from atheriz.singletons.lockpool import new_lock
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -16,9 +16,20 @@ IGNORE_FIELDS = ["lock"]
 
 class Account:
     group_save: bool = False
+    # fields that get an AtomicField when settings.THREADSAFE_MODE is "fields"
+    thread_safe_fields = (
+        "id",
+        "name",
+        "password",
+        "characters",
+        "is_connected",
+        "is_banned",
+        "ban_reason",
+        "is_deleted",
+    )
 
     def __init__(self):
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.id = -1
         self.name = ""
         self.password = ""
@@ -31,7 +42,7 @@ class Account:
         self.is_item = False
         self.is_account = True
         self.is_deleted = False
-        if settings.THREADSAFE_GETTERS_SETTERS:
+        if get_execution_profile().threadsafe_getters_setters:
             ensure_thread_safe(self)
 
     @classmethod
@@ -1,9 +1,9 @@
 from collections import deque
-from threading import Lock, RLock
+from atheriz.singletons.lockpool import new_lock
 import atheriz.settings as settings
 from atheriz.utils import get_import_path, wrap_truecolor, ensure_thread_safe
 from atheriz.singletons.objects import get, add_object, filter_by_type
-from atheriz.singletons.get import get_unique_id
+from atheriz.singletons.get import get_unique_id, get_execution_profile
 from atheriz.commands.base_cmd import Command
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -74,9 +74,11 @@ class BaseChannelCommand(Command):
 
 class Channel:
     group_save: bool = False
+    # fields that get an AtomicField when settings.THREADSAFE_MODE is "fields"
+    thread_safe_fields = ("name", "desc", "id", "history", "listeners", "is_deleted")
 
     def __init__(self):
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.name: str = ""
         self.desc: str = ""
         self.id: int = -1
@@ -92,7 +94,7 @@ class Channel:
         self.is_account = False
         self.is_channel = True
         self.is_deleted = False
-        if settings.THREADSAFE_GETTERS_SETTERS:
+        if get_execution_profile().threadsafe_getters_setters:
             ensure_thread_safe(self)
 
     @classmethod
@@ -1,19 +1,24 @@
 from atheriz.utils import compress_whitespace
-from typing import Callable
+from typing import Any, Callable, Iterable
 from atheriz.utils import get_import_path
-from atheriz.singletons.objects import get, add_object
+from atheriz.singletons.objects import get, add_object, add_objects, remove_objects, rename_object
 from atheriz.singletons.get import (
     get_node_handler,
     get_map_handler,
     get_server_channel,
     get_unique_id,
+    get_unique_ids,
     get_loggedin_cmdset,
     get_async_ticker,
+    get_async_threadpool,
+    get_execution_profile,
 )
+from atheriz.singletons.asyncthreadpool import LANE_BACKGROUND
 from atheriz.objects.persist import save
 from atheriz.objects.contents import search, group_by_name
 from atheriz.commands.cmdset import CmdSet
 from atheriz.utils import (
+    instance_from_string,
     make_iter,
     is_iter,
     get_reverse_link,
@@ -26,70 +31,271 @@ from typing import TYPE_CHECKING, Self
 from atheriz.logger import logger
 from atheriz.objects import funcparser
 import atheriz.settings as settings
-from threading import Lock, RLock
+from atheriz.singletons.lockpool import new_lock, lock_all
+from atheriz.singletons.access import cached_access, invalidate_access
 import time
 import dill
 import base64
+from functools import lru_cache
 
 if TYPE_CHECKING:
     from atheriz.commands.cmdset import CmdSet
     from atheriz.objects.session import Session
     from atheriz.singletons.node import Node, NodeLink
-    from atheriz.objects.base_account import Account
     from atheriz.objects.base_channel import Channel
-    from atheriz.singletons.map import MapInfo
+    from atheriz.singletons.map import MapInfo, ExploredCells
+    from atheriz.objects.base_script import Script
 IGNORE_FIELDS = ["lock", "internal_cmdset", "external_cmdset", "access", "_contents", "session"]
+
+
+class Field:
+    """
+    one field of an Object's schema. schema fields are slots instead of __dict__ entries, and
+    only the persisted ones that aren't at their default get saved.
+    Args:
+        name: the attribute it's stored in
+        type: what it holds, for reference
+        default: value for new objects
+        factory: called to make the default instead, for lists, dicts and such
+        persist: False for fields that aren't saved, or that __getstate__ saves itself
+        key: name in saves, if it isn't name
+    """
+
+    __slots__ = ("name", "type", "default", "factory", "persist", "key")
+
+    def __init__(self, name, type=object, default=None, factory=None, persist=True, key=None):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.factory = factory
+        self.persist = persist
+        self.key = key if key else name
+
+    def make_default(self):
+        return self.factory() if self.factory else self.default
+
+    def is_default(self, value) -> bool:
+        default = self.make_default()
+        return value is default or (type(value) is type(default) and value == default)
+
+
+OBJECT_SCHEMA = (
+    Field("id", int, -1),
+    Field("is_deleted", bool, False),
+    # the properties that change how a node lists this object are saved without the underscore
+    Field("_name", str, "", key="name"),
+    Field("desc", str, ""),
+    # symbol to be used on map
+    Field("symbol", str, "X"),
+    Field("move_verb", str, "walk"),
+    Field("_aliases", list, factory=list, key="aliases"),
+    Field("internal_cmdset", object, persist=False),
+    Field("external_cmdset", object, persist=False),
+    Field("date_created", float),
+    Field("location", object, persist=False),
+    Field("home", tuple, persist=False),
+    Field("_contents", set, factory=set, persist=False),
+    # ContentsIndex for search, once this holds settings.SEARCH_INDEX_THRESHOLD objects
+    Field("_search_index", object, persist=False),
+    Field("_privilege_level", int, 0, key="privilege_level"),
+    Field("is_connected", bool, False),
+    Field("created_by", int, -1),
+    Field("last_touched_by", int, -1),
+    Field("_is_pc", bool, False, key="is_pc"),
+    Field("_is_npc", bool, False, key="is_npc"),
+    Field("_is_item", bool, False, key="is_item"),
+    Field("is_mapable", bool, False),
+    Field("is_container", bool, False),
+    Field("_is_tickable", bool, False),
+    Field("is_account", bool, False),
+    Field("is_channel", bool, False),
+    Field("is_node", bool, False),
+    Field("last_map_time", float, factory=time.time),
+    Field("_quelled", bool, False, key="quelled"),
+    Field("map_enabled", bool, True),
+    # map cells this object has explored, only used by PCs when settings.FOG_OF_WAR is on
+    Field("explored", object, persist=False),
+    Field("_seconds_played", float, 0),
+    # list of channel ids subscribed to
+    Field("channels", list, factory=list),
+    Field("session", object, persist=False),
+    Field("locks", dict, factory=dict, persist=False),
+    Field("scripts", list, factory=list, persist=False),
+    Field("group_save", bool, True),
+    Field("access", object, persist=False),
+    # (generation, {(accessor id, lock name): result}) when settings.ACCESS_CACHE is on
+    Field("_access_cache", object, persist=False),
+    # the Prototype this object was spawned from, saved as its key
+    Field("prototype", object, persist=False),
+)
 _MSG_CONTENTS_PARSER = funcparser.FuncParser(funcparser.ACTOR_STANCE_CALLABLES)
 _LEGEND_ENTRY = None
+_EXPLORED_CELLS = None
+_GET_PROTOTYPE = None
+
+
+@lru_cache(maxsize=1024)
+def _format_appearance(appearance: str) -> str:
+    # the same few appearances get formatted over and over, so skip the regexes for repeats
+    return compress_whitespace(appearance).strip()
+
+
+def _render_for(template, you: Any, receiver: Any, mapping: dict) -> str:
+    # actor-stance replacements
+    outmessage = template.render(return_string=True, caller=you, receiver=receiver, mapping=mapping)
+    # director-stance replacements
+    return outmessage.format_map(
+        {
+            key: (
+                obj.get_display_name(looker=receiver)
+                if hasattr(obj, "get_display_name")
+                else str(obj)
+            )
+            for key, obj in mapping.items()
+        }
+    )
+
+
+def _display_name_key(obj: Any) -> Callable[[Any], Any] | None:
+    """
+    obj.display_name_key, if it belongs with the get_display_name obj actually uses, None if
+    there's no telling how obj's display name depends on the looker
+    """
+    if not hasattr(obj, "get_display_name"):
+        # shown with str(), the same for everyone
+        return _same_for_everyone
+    if "get_display_name" in getattr(obj, "__dict__", ()):
+        return None
+    for klass in type(obj).__mro__:
+        if "get_display_name" in vars(klass):
+            if klass is Object:
+                return _same_for_everyone
+            return obj.display_name_key if "display_name_key" in vars(klass) else None
+    return None
+
+
+def _same_for_everyone(looker: Any) -> None:
+    return None
+
+
+def display_name_perspective(objs: Iterable[Any], looker: Any) -> tuple | None:
+    """
+    what sets looker's view of the display names of objs apart from other lookers', for caching
+    listings of them. None if some obj doesn't say (it overrides get_display_name without
+    display_name_key)
+    """
+    perspective = []
+    for obj in objs:
+        key = _display_name_key(obj)
+        if key is None:
+            return None
+        if key is not _same_for_everyone:
+            perspective.append((obj.id, key(looker)))
+    return tuple(perspective)
+
+
+def _msg_does_nothing(receiver: Any) -> bool:
+    """receiver.msg would drop the message without anything seeing it"""
+    if getattr(receiver, "session", None) is not None:
+        return False
+    # looked up on the instance, so hooks swapped in on one object count as overridden
+    return (
+        getattr(receiver.msg, "__func__", None) is Object.msg
+        and getattr(receiver.at_msg_receive, "__func__", None) is Object.at_msg_receive
+    )
+
+
+def msg_each(
+    receivers: Iterable[Any],
+    text: str,
+    you: Any,
+    mapping: dict,
+    from_obj: Any = None,
+    outkwargs: dict | None = None,
+    raise_funcparse_errors: bool = False,
+    **kwargs,
+) -> None:
+    """
+    the fan-out behind msg_contents, renders text for each receiver and msgs it to them.
+    outkwargs None sends the plain string instead of (text, outkwargs).
+
+    the funcparser callables and {key}s only tell receivers apart by whether they're one of the
+    mapped objects (you included), and by passing them as the looker to get_display_name. so
+    everyone else (the bystanders) is grouped by the display_name_key of every mapped object, and
+    text is rendered once per group. if a mapped object overrides get_display_name without
+    display_name_key, or the text uses a callable like $random(), bystanders are all rendered
+    separately.
+    receivers with no session and default msg hooks are skipped, nobody would see their text.
+    """
+    # tokenized once (and cached), not once per receiver
+    template = _MSG_CONTENTS_PARSER.compile(text, raise_errors=raise_funcparse_errors)
+    # the callables compare receivers to mapped objects with ==, which is identity for objects
+    mapped = {id(obj) for obj in mapping.values()}
+    keys = [_display_name_key(obj) for obj in mapping.values()]
+    if None in keys or not template.deterministic:
+        # $random() and friends give every receiver their own roll
+        keys = None
+    else:
+        keys = [key for key in keys if key is not _same_for_everyone]
+    # msg calls at_msg_send on the senders, skipping a receiver mustn't skip that
+    senders = make_iter(from_obj) if from_obj else ()
+    can_skip = all(getattr(s.at_msg_send, "__func__", None) is Object.at_msg_send for s in senders)
+    # perspective -> text
+    rendered = {}
+    for receiver in receivers:
+        if can_skip and _msg_does_nothing(receiver):
+            continue
+        if keys is not None and id(receiver) not in mapped:
+            perspective = tuple(key(receiver) for key in keys) if keys else ()
+            outmessage = rendered.get(perspective)
+            if outmessage is None:
+                outmessage = _render_for(template, you, receiver, mapping)
+                rendered[perspective] = outmessage
+        else:
+            outmessage = _render_for(template, you, receiver, mapping)
+        receiver.msg(
+            text=outmessage if outkwargs is None else (outmessage, outkwargs),
+            from_obj=from_obj,
+            **kwargs,
+        )
 
 
 class Object:
     appearance_template = "{name}: {desc}{things}"
+    # subclasses can add fields of their own with a schema tuple, they're appended to this one.
+    # add `__slots__ = tuple(f.name for f in schema)` too, or they'll live in __dict__
+    schema: tuple[Field, ...] = OBJECT_SCHEMA
+    # anything not in the schema (like fields subclasses set without declaring them) still goes
+    # in __dict__
+    __slots__ = tuple(f.name for f in OBJECT_SCHEMA) + ("lock", "__dict__", "__weakref__")
+    # every field in the schema, this class's and its bases'
+    _schema: tuple[Field, ...] = OBJECT_SCHEMA
+    # save key -> field
+    _schema_keys: dict[str, Field] = {f.key: f for f in OBJECT_SCHEMA}
+    # (name, default, factory) for __init__, which runs for every object made
+    _defaults: tuple[tuple[str, Any, Callable | None], ...] = tuple(
+        (f.name, f.default, f.factory) for f in OBJECT_SCHEMA
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        own = cls.__dict__.get("schema")
+        if own and own is not cls._schema:
+            cls._schema = cls._schema + tuple(own)
+            cls._schema_keys = {f.key: f for f in cls._schema}
+            cls._defaults = tuple((f.name, f.default, f.factory) for f in cls._schema)
 
     def __init__(self):
-        self.lock = RLock()
-        self.id = -1
-        self.is_deleted = False
-        self.name = ""
-        self.desc = ""
-        # symbol to be used on map
-        self.symbol = "X"
-        self.move_verb = "walk"
-        self.aliases: list[str] = []
-        self.internal_cmdset: CmdSet | None = None
-        self.external_cmdset: CmdSet | None = None
-        self.date_created = None
-        self.location = None
-        self.home = None
-        self._contents = set()
-        self.privilege_level = 0
-        self.is_connected = False
-        self.created_by = -1
-        self.last_touched_by = -1
-        self.is_pc = False
-        self.is_npc = False
-        self.is_item = False
-        self.is_mapable = False
-        self.is_container = False
-        self._is_tickable = False
-        self.is_account = False
-        self.is_channel = False
-        self.is_node = False
-        self.last_map_time = time.time()
-        self.quelled = False
-        self.map_enabled = True
-        self._seconds_played = 0
-        # list of channel ids subscribed to
-        self.channels: list[int] = []
-        self.session: Session | None = None
-        # self.account: Account | None = None
-        self.locks: dict[str, list[Callable]] = {}
-        self.group_save = True
-        if settings.SLOW_LOCKS:
+        self.lock = new_lock(self)
+        for name, default, factory in self._defaults:
+            setattr(self, name, factory() if factory else default)
+        if settings.ACCESS_CACHE:
+            self.access = self._cached_access
+        elif settings.SLOW_LOCKS:
             self.access = self._safe_access
         else:
             self.access = self._fast_access
-        if settings.THREADSAFE_GETTERS_SETTERS:
+        if get_execution_profile().threadsafe_getters_setters:
             ensure_thread_safe(self)
 
     @classmethod
@@ -122,8 +328,157 @@ class Object:
         Returns:
             Self: The created object.
         """
+        obj = cls._new(
+            get_unique_id(),
+            session,
+            name,
+            desc,
+            aliases,
+            is_pc,
+            is_item,
+            is_npc,
+            is_mapable,
+            is_container,
+            is_tickable,
+        )
+        if is_tickable:
+            get_async_ticker().add_coro(obj.at_tick, settings.TICK_SECONDS)
+        add_object(obj)
+        return obj
+
+    @classmethod
+    def create_many(
+        cls,
+        session: Session | None,
+        names: list[str],
+        desc: str = "",
+        location: Node | Object | None = None,
+        aliases: list[str] | None = None,
+        is_pc: bool = False,
+        is_item: bool = False,
+        is_npc: bool = False,
+        is_mapable: bool = False,
+        is_container: bool = False,
+        is_tickable: bool = False,
+    ) -> list[Self]:
+        """
+        Create one object per name and put them all in location, like calling create and
+        move_to for each but with the ids, registry, location, ticker and map each updated once.
+        at_pre_move isn't called (there's no way to refuse part of a batch), at_post_move is,
+        once everything is in place.
+
+        Args:
+            session (Session | None): The session to create the objects for.
+            names (list[str]): The names of the objects, one object is made per name.
+            location (Node | Object | None, optional): Where to put them. Defaults to None.
+            everything else is the same as create, and applies to every object.
+
+        Returns:
+            list[Self]: The created objects, in the same order as names.
+        """
+        names = list(names)
+        objs = [
+            cls._new(
+                obj_id,
+                session,
+                name,
+                desc,
+                list(aliases) if aliases else None,
+                is_pc,
+                is_item,
+                is_npc,
+                is_mapable,
+                is_container,
+                is_tickable,
+            )
+            for obj_id, name in zip(get_unique_ids(len(names)), names)
+        ]
+        add_objects(objs)
+        if is_tickable:
+            get_async_ticker().add_coros([o.at_tick for o in objs], settings.TICK_SECONDS)
+        if location is not None:
+            for obj in objs:
+                obj.location = location
+                if not location.is_node:
+                    obj.last_touched_by = location.id
+            location.add_objects(objs)
+            if location.is_node and settings.MAP_ENABLED:
+                mh = get_map_handler()
+                mapables = [o for o in objs if o.is_mapable]
+                if mapables:
+                    mh.add_mapables(mapables, location.coord)
+                for obj in objs:
+                    if obj.is_pc:
+                        if settings.FOG_OF_WAR:
+                            obj.reveal_map(location.coord)
+                        mh.move_listener(obj, location.coord, None)
+            for obj in objs:
+                obj.at_post_move(location, None)
+        return objs
+
+    @staticmethod
+    def delete_many(objs: list[Object], recursive: bool = False) -> int:
+        """
+        Delete objects, taking each location's lock, the registry locks and the map once per
+        batch instead of once per object.
+
+        Args:
+            objs (list[Object]): The objects to delete.
+            recursive (bool, optional): Delete their contents too. Defaults to False.
+
+        Returns:
+            int: How many objects were deleted.
+        """
+        todo: dict[int, Object] = {}
+        stack = list(objs)
+        while stack:
+            obj = stack.pop()
+            if obj.id in todo:
+                continue
+            todo[obj.id] = obj
+            if recursive:
+                stack.extend(obj.contents)
+        objs = list(todo.values())
+        for obj in objs:
+            obj.clear_scripts()
+        ticking = [o.at_tick for o in objs if o._is_tickable]
+        if ticking:
+            get_async_ticker().remove_coros(ticking, settings.TICK_SECONDS)
+        if settings.MAP_ENABLED:
+            get_map_handler().remove_mapables([o for o in objs if o.is_mapable])
+        by_location: dict[int, tuple[Node | Object, list[Object]]] = {}
+        for obj in objs:
+            if obj.location is not None:
+                by_location.setdefault(id(obj.location), (obj.location, []))[1].append(obj)
+        for loc, group in by_location.values():
+            loc.remove_objects(group)
+        for obj in objs:
+            obj.location = None
+            obj.is_deleted = True
+            if obj.is_connected and obj.session and obj.session.connection:
+                obj.session.account.remove_character(obj)
+                obj.session.connection.close()
+        remove_objects(objs)
+        return len(objs)
+
+    @classmethod
+    def _new(
+        cls,
+        id: int,
+        session: Session | None,
+        name: str,
+        desc: str,
+        aliases: list[str] | None,
+        is_pc: bool,
+        is_item: bool,
+        is_npc: bool,
+        is_mapable: bool,
+        is_container: bool,
+        is_tickable: bool,
+    ) -> Self:
+        # create's field setup, without registering the object anywhere
         obj = cls()
-        obj.id = get_unique_id()
+        obj.id = id
         obj.date_created = time.time()
         if session:
             obj.session = session
@@ -138,16 +493,13 @@ class Object:
             obj.is_container = True
         obj.is_item = is_item
         obj.is_npc = is_npc
-        obj.is_tickable = is_tickable
+        obj._is_tickable = is_tickable
         obj.name = name
         obj.desc = desc
         obj.aliases = aliases if aliases else []
         obj.group_save = not is_pc
         obj.internal_cmdset = CmdSet()
         obj.external_cmdset = CmdSet()
-        if is_tickable:
-            get_async_ticker().add_coro(obj.at_tick, settings.TICK_SECONDS)
-        add_object(obj)
         return obj
 
     def _safe_access(self, accessing_obj: Object, name: str):
@@ -169,65 +521,144 @@ class Object:
                 return False
         return True
 
+    def _cached_access(self, accessing_obj: Object, name: str):
+        if accessing_obj.is_superuser:
+            return True
+        check = self._safe_access if settings.SLOW_LOCKS else self._fast_access
+        return cached_access(self, accessing_obj, name, check)
+
     def __getstate__(self):
-        d = self.__dict__.copy()
-        for field in IGNORE_FIELDS:
-            d.pop(field, None)
-        d["_contents"] = list(self._contents)
+        # only what differs from a new object (or from its prototype), loading starts from one
+        proto = self.prototype
+        shared = proto.shared if proto else {}
+        d = {}
+        for f in self._schema:
+            if f.persist:
+                value = getattr(self, f.name)
+                if f.name in shared:
+                    pv = shared[f.name]
+                    if value is pv or (type(value) is type(pv) and value == pv):
+                        continue
+                elif f.is_default(value):
+                    continue
+                d[f.key] = value
+        if proto:
+            d["prototype"] = proto.key
+        for k, v in self.__dict__.items():
+            if k not in IGNORE_FIELDS:
+                d[k] = v
+        if self._contents:
+            d["_contents"] = list(self._contents)
         if self.internal_cmdset:
             d["internal_cmdset"] = self.internal_cmdset.__getstate__()
-        else:
-            d["internal_cmdset"] = None
-        if self.external_cmdset:
+        ext = self.external_cmdset
+        if ext and not (proto and proto.shares("external_cmdset", ext)):
             d["external_cmdset"] = self.external_cmdset.__getstate__()
-        else:
-            d["external_cmdset"] = None
         d["__import_path__"] = get_import_path(self)
-        d["locks"] = base64.b64encode(dill.dumps(self.locks)).decode("utf-8")
+        if self.locks and not (proto and proto.shares("locks", self.locks)):
+            d["locks"] = base64.b64encode(dill.dumps(self.locks)).decode("utf-8")
         if self.location and self.location.is_node:
             d["location"] = tuple_to_str(self.location.coord)
         elif self.location:
             d["location"] = self.location.id
-        else:
-            d["location"] = None
-        d["home"] = tuple_to_str(self.home) if self.home else None
+        if self.home:
+            d["home"] = tuple_to_str(self.home)
+        if self.explored:
+            d["explored"] = self.explored.__getstate__()
+        if self.scripts:
+            d["scripts"] = [s.__getstate__() for s in self.scripts]
         return d
 
     def __setstate__(self, state):
-        self.locks = dill.loads(base64.b64decode(state["locks"]))
-        del state["locks"]
-        self._contents = set(state["_contents"])
-        del state["_contents"]
-        self.__dict__.update(state)
-        if state.get("internal_cmdset"):
+        # saves from before the schema have every field, newer ones only what isn't a default
+        state = state.copy()
+        state.pop("__import_path__", None)
+        self.prototype = None
+        if proto_key := state.pop("prototype", None):
+            global _GET_PROTOTYPE
+            if not _GET_PROTOTYPE:
+                from atheriz.objects.prototypes import get_prototype as _GET_PROTOTYPE
+            proto = _GET_PROTOTYPE(proto_key)
+            if proto:
+                proto.apply(self)
+            else:
+                logger.error(f"Unknown prototype {proto_key} for object {state.get('id')}")
+        locks = state.pop("locks", None)
+        if locks:
+            self.locks = dill.loads(base64.b64decode(locks))
+        elif not self.prototype:
+            self.locks = {}
+        self._contents = set(state.pop("_contents", ()))
+        internal_cmdset = state.pop("internal_cmdset", None)
+        external_cmdset = state.pop("external_cmdset", None)
+        location = state.pop("location", None)
+        home = state.pop("home", None)
+        explored = state.pop("explored", None)
+        scripts = state.pop("scripts", ())
+        keys = self._schema_keys
+        for k, v in state.items():
+            f = keys.get(k)
+            setattr(self, f.name if f else k, v)
+        if internal_cmdset:
             self.internal_cmdset = CmdSet()
-            self.internal_cmdset.__setstate__(state["internal_cmdset"])
+            self.internal_cmdset.__setstate__(internal_cmdset)
         else:
             self.internal_cmdset = None
 
-        if state.get("external_cmdset"):
+        if external_cmdset:
             self.external_cmdset = CmdSet()
-            self.external_cmdset.__setstate__(state["external_cmdset"])
-        else:
+            self.external_cmdset.__setstate__(external_cmdset)
+        elif not self.prototype:
             self.external_cmdset = None
         nh = get_node_handler()
-        if state["location"]:
-            if isinstance(state["location"], str):
-                self.location = nh.get_node(str_to_tuple(state["location"]))
+        if location:
+            if isinstance(location, str):
+                self.location = nh.get_node(str_to_tuple(location))
             else:
-                loc = get(state["location"])
+                loc = get(location)
                 if loc:
                     self.location = loc[0]
                 else:
                     self.location = None
         else:
             self.location = None
-        self.home = str_to_tuple(state["home"]) if state["home"] else None
+        self.home = str_to_tuple(home) if home else None
+        if explored:
+            global _EXPLORED_CELLS
+            if not _EXPLORED_CELLS:
+                from atheriz.singletons.map import ExploredCells as _EXPLORED_CELLS
+            self.explored = _EXPLORED_CELLS.__new__(_EXPLORED_CELLS)
+            self.explored.__setstate__(explored)
+        else:
+            self.explored = None
+        self.scripts = []
+        for s in scripts:
+            script: Script = instance_from_string(s["__import_path__"])
+            script.__setstate__(s)
+            script.obj = self
+            self.scripts.append(script)
+            script.resume()
         if self._is_tickable:
             at = get_async_ticker()
             at.add_coro(self.at_tick, settings.TICK_SECONDS)
         self.at_init()
 
+    def own(self, name: str):
+        """
+        get field name, copying it first if it's still shared with this object's prototype.
+        call it before changing a list, dict or cmdset field in place.
+        """
+        f = self._schema_keys.get(name)
+        if f:
+            name = f.name
+        with self.lock:
+            value = getattr(self, name)
+            proto = self.prototype
+            if proto and proto.shares(name, value):
+                value = proto.copy_value(name, value)
+                setattr(self, name, value)
+            return value
+
     @property
     def is_tickable(self):
         return self._is_tickable
@@ -241,6 +672,86 @@ class Object:
         else:
             at.remove_coro(self.at_tick, settings.TICK_SECONDS)
 
+    def _listing_changed(self):
+        # nodes cache how their contents are listed, see Node.invalidate_appearance
+        loc = getattr(self, "location", None)
+        if loc and loc.is_node:
+            loc.invalidate_appearance()
+
+    def _search_changed(self):
+        loc = getattr(self, "location", None)
+        if loc:
+            loc.reindex(self)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        old = self._name
+        self._name = value
+        self._listing_changed()
+        self._search_changed()
+        if old != value:
+            rename_object(self, old)
+
+    @property
+    def aliases(self) -> list[str]:
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, value: list[str]):
+        # assign a new list to change aliases, changes made in place don't reach search indexes
+        self._aliases = value
+        self._search_changed()
+
+    @property
+    def is_pc(self) -> bool:
+        return self._is_pc
+
+    @is_pc.setter
+    def is_pc(self, value: bool):
+        self._is_pc = value
+        self._listing_changed()
+
+    @property
+    def is_npc(self) -> bool:
+        return self._is_npc
+
+    @is_npc.setter
+    def is_npc(self, value: bool):
+        self._is_npc = value
+        self._listing_changed()
+
+    @property
+    def is_item(self) -> bool:
+        return self._is_item
+
+    @is_item.setter
+    def is_item(self, value: bool):
+        self._is_item = value
+        self._listing_changed()
+
+    @property
+    def privilege_level(self) -> int:
+        return self._privilege_level
+
+    @privilege_level.setter
+    def privilege_level(self, value: int):
+        self._privilege_level = value
+        # locks mostly look at privileges, so cached access results are stale now
+        invalidate_access()
+
+    @property
+    def quelled(self) -> bool:
+        return self._quelled
+
+    @quelled.setter
+    def quelled(self, value: bool):
+        self._quelled = value
+        invalidate_access()
+
     @property
     def seconds_played(self):
         return self._seconds_played + (time.time() - self.session.conn_time if self.session else 0)
@@ -268,16 +779,61 @@ class Object:
         if channel:
             channel.msg(f"{self.name} has disconnected.")
         if settings.AUTOSAVE_PLAYERS_ON_DISCONNECT:
-            with self.lock:
-                save(self)
-            if self._contents:
-                save(self.contents)
+            # nobody is waiting on this, so keep it out of the way of player commands
+            get_async_threadpool().submit(self.autosave, owner=self, lane=LANE_BACKGROUND)
+
+    def autosave(self):
+        with self.lock:
+            save(self)
+        if self._contents:
+            save(self.contents)
+
+    def add_script(self, script: Script, autostart: bool = True):
+        """
+        attach a script to this object, it's saved along with the object
+        Args:
+            script (Script): the script to attach
+            autostart (bool, optional): start its timer right away. Defaults to True.
+        """
+        with self.lock:
+            script.obj = self
+            self.scripts.append(script)
+        if autostart:
+            script.start()
+
+    def get_script(self, key: str) -> Script | None:
+        with self.lock:
+            for s in self.scripts:
+                if s.key == key:
+                    return s
+        return None
+
+    def remove_script(self, script: Script | str):
+        """
+        stop a script and detach it from this object
+        Args:
+            script (Script | str): the script or its key
+        """
+        with self.lock:
+            if isinstance(script, str):
+                script = self.get_script(script)
+            if script is None or script not in self.scripts:
+                return
+            self.scripts.remove(script)
+        script.stop()
+
+    def clear_scripts(self):
+        with self.lock:
+            scripts = self.scripts
+            self.scripts = []
+        for s in scripts:
+            s.stop()
 
     def subscribe(self, channel: Channel):
         """Subscribe to a channel."""
         with self.lock:
             if channel.id not in self.channels:
-                self.channels.append(channel.id)
+                self.own("channels").append(channel.id)
                 cmd = channel.get_command()
                 self.internal_cmdset.add(cmd)
                 channel.add_listener(self)
@@ -286,7 +842,7 @@ class Object:
         """Unsubscribe from a channel."""
         with self.lock:
             if channel.id in self.channels:
-                self.channels.remove(channel.id)
+                self.own("channels").remove(channel.id)
                 cmd = channel.get_command()
                 self.internal_cmdset.remove(cmd)
                 channel.remove_listener(self)
@@ -348,6 +904,9 @@ class Object:
         """
         with self.lock:
             self._contents.update([obj.id for obj in objs])
+            if self._search_index is not None:
+                for o in objs:
+                    self._search_index.add(o)
 
     def add_object(self, obj: Object):
         """
@@ -357,6 +916,8 @@ class Object:
         """
         with self.lock:
             self._contents.add(obj.id)
+            if self._search_index is not None:
+                self._search_index.add(obj)
 
     def remove_object(self, obj):
         """
@@ -366,6 +927,28 @@ class Object:
         """
         with self.lock:
             self._contents.discard(obj.id)
+            if self._search_index is not None:
+                self._search_index.remove(obj)
+
+    def remove_objects(self, objs: list[Object]):
+        """
+        remove objects from this object's inventory
+        Args:
+            objs (list): list of objects to remove
+        """
+        with self.lock:
+            self._contents.difference_update([obj.id for obj in objs])
+            if self._search_index is not None:
+                for o in objs:
+                    self._search_index.remove(o)
+
+    def reindex(self, obj: Object):
+        """
+        update the search index for obj, something in here that changed its name or aliases
+        """
+        with self.lock:
+            if self._search_index is not None and obj.id in self._contents:
+                self._search_index.update(obj)
 
     def add_lock(self, lock_name: str, callable: Callable):
         """
@@ -381,9 +964,13 @@ class Object:
             callable (Callable): The callable to add to the lock.
         """
         with self.lock:
-            l = self.locks.get(lock_name, [])
+            locks = self.own("locks")
+            l = locks.get(lock_name, [])
             l.append(callable)
-            self.locks[lock_name] = l
+            locks[lock_name] = l
+        invalidate_access()
+        # locks can decide who sees this listed
+        self._listing_changed()
 
     def clear_locks_by_name(self, lock_name: str):
         """
@@ -393,7 +980,9 @@ class Object:
             lock_name (str): The name of the lock to clear.
         """
         with self.lock:
-            self.locks.pop(lock_name, None)
+            self.own("locks").pop(lock_name, None)
+        invalidate_access()
+        self._listing_changed()
 
     @property
     def legend_entry(self):
@@ -406,6 +995,20 @@ class Object:
         else:
             return None
 
+    def reveal_map(self, coord: tuple[str, int, int, int], radius: int | None = None):
+        """
+        mark the map cells around coord as explored for fog of war
+        """
+        global _EXPLORED_CELLS
+        if not _EXPLORED_CELLS:
+            from atheriz.singletons.map import ExploredCells as _EXPLORED_CELLS
+        with self.lock:
+            if self.explored is None:
+                self.explored = _EXPLORED_CELLS()
+            self.explored.reveal(
+                coord, settings.FOG_OF_WAR_RADIUS if radius is None else radius
+            )
+
     @property
     def contents(self) -> list[Object]:
         with self.lock:
@@ -561,30 +1164,16 @@ class Object:
             exclude = make_iter(exclude)
             contents = [obj for obj in contents if obj not in exclude]
 
-        for receiver in contents:
-            # actor-stance replacements
-            outmessage = _MSG_CONTENTS_PARSER.parse(
-                inmessage,
-                raise_errors=raise_funcparse_errors,
-                return_string=True,
-                caller=you,
-                receiver=receiver,
-                mapping=mapping,
-            )
-
-            # director-stance replacements
-            outmessage = outmessage.format_map(
-                {
-                    key: (
-                        obj.get_display_name(looker=receiver)
-                        if hasattr(obj, "get_display_name")
-                        else str(obj)
-                    )
-                    for key, obj in mapping.items()
-                }
-            )
-
-            receiver.msg(text=(outmessage, outkwargs), from_obj=from_obj, **kwargs)
+        msg_each(
+            contents,
+            inmessage,
+            you,
+            mapping,
+            from_obj=from_obj,
+            outkwargs=outkwargs,
+            raise_funcparse_errors=raise_funcparse_errors,
+            **kwargs,
+        )
 
     def move_to(
         self,
@@ -604,10 +1193,11 @@ class Object:
                 return True
 
         def do_item_move():
-            if self.location:
-                self.location.remove_object(self)
-            self.location = destination
-            destination.add_object(self)
+            with lock_all(self.location, destination):
+                if self.location:
+                    self.location.remove_object(self)
+                self.location = destination
+                destination.add_object(self)
             self.last_touched_by = destination.id
 
         if not destination.is_node:
@@ -632,11 +1222,14 @@ class Object:
                 self.announce_move_to(destination, to_exit.name)
             # Capture old location BEFORE setting the new one
             old_coord = self.location.coord if self.location and self.location.is_node else None
-            if self.location:
-                self.location.remove_object(self)
-            self.location = destination
-            destination.add_object(self)
+            with lock_all(self.location, destination):
+                if self.location:
+                    self.location.remove_object(self)
+                self.location = destination
+                destination.add_object(self)
             if settings.MAP_ENABLED:
+                if settings.FOG_OF_WAR and self.is_pc:
+                    self.reveal_map(destination.coord)
                 mh = get_map_handler()
                 if self.is_pc:
                     # PCs are always listeners (they view the map)
@@ -666,6 +1259,13 @@ class Object:
         """Get the display name of this object."""
         return self.name
 
+    def display_name_key(self, looker: Object) -> Any:
+        """
+        lookers with the same key get the same get_display_name, msg_contents renders a message
+        once per key. override it along with get_display_name if that depends on the looker
+        """
+        return None
+
     def get_display_desc(self, looker: Object | None = None, **kwargs):
         """Get the display description of this object."""
         return self.desc
@@ -716,7 +1316,7 @@ class Object:
                 self.msg(map_enable="")
                 mi: MapInfo | None = mh.get_mapinfo(self.location.coord[0], self.location.coord[3])
                 if mi:
-                    mi.render(True)
+                    mh.renderer.queue_render(mi, True)
             self.move_to(self.location)
 
     def at_server_reload(self):
@@ -1142,4 +1742,6 @@ class Object:
         pass
 
     def format_appearance(self, appearance, looker, **kwargs):
+        if settings.APPEARANCE_CACHE:
+            return _format_appearance(appearance)
         return compress_whitespace(appearance).strip()
@@ -0,0 +1,131 @@
+from threading import RLock
+import time
+from atheriz.utils import get_import_path
+from atheriz.singletons.get import get_timing_wheel
+from atheriz.logger import logger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from atheriz.objects.base_obj import Object
+    from atheriz.singletons.asyncthreadpool import TimerHandle
+
+IGNORE_FIELDS = ["lock", "obj", "handle"]
+
+
+class Script:
+    """
+    a timer attached to an object, saved with it and picked back up where it left off on reload.
+    subclass it and override at_repeat, then attach it with Object.add_script.
+    """
+
+    def __init__(
+        self, key: str = "", interval: float = 60.0, repeats: int = 0, jitter: float = 0.0
+    ):
+        self.lock = RLock()
+        self.key = key if key else self.__class__.__name__.lower()
+        # seconds between calls to at_repeat
+        self.interval = interval
+        # how many times to call at_repeat before stopping, 0 to keep going forever
+        self.repeats = repeats
+        self.repeats_done = 0
+        # up to this many seconds are randomly added to each interval
+        self.jitter = jitter
+        # time.time() of the next at_repeat, so the remaining delay survives a reload
+        self.next_run: float | None = None
+        self.is_active = False
+        # anything json serializable
+        self.data: dict = {}
+        self.obj: Object | None = None
+        self.handle: TimerHandle | None = None
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        for field in IGNORE_FIELDS:
+            d.pop(field, None)
+        d["__import_path__"] = get_import_path(self)
+        return d
+
+    def __setstate__(self, state):
+        state = state.copy()
+        state.pop("__import_path__", None)
+        self.__dict__.update(state)
+        self.lock = RLock()
+        self.obj = None
+        self.handle = None
+
+    def start(self, delay: float | None = None):
+        """
+        start the timer, the first at_repeat is after `delay` seconds or a full interval
+        """
+        with self.lock:
+            if self.handle:
+                self.handle.cancel()
+            first = not self.is_active
+            self.is_active = True
+            self._schedule(self.interval if delay is None else delay)
+        if first:
+            self.at_start()
+
+    def resume(self):
+        """
+        restart an active script after a reload, keeping whatever was left of its delay
+        """
+        with self.lock:
+            if not self.is_active or self.handle:
+                return
+            remaining = self.next_run - time.time() if self.next_run else self.interval
+            self._schedule(max(0.0, remaining))
+
+    def stop(self):
+        with self.lock:
+            if not self.is_active:
+                return
+            self.is_active = False
+            self.next_run = None
+            if self.handle:
+                self.handle.cancel()
+                self.handle = None
+        self.at_stop()
+
+    def _schedule(self, delay: float):
+        self.next_run = time.time() + delay
+        self.handle = get_timing_wheel().schedule(
+            delay, self._fire, jitter=self.jitter, owner=self.obj
+        )
+
+    def _fire(self):
+        with self.lock:
+            if not self.is_active:
+                return
+            self.handle = None
+            self.repeats_done += 1
+            done = self.repeats and self.repeats_done >= self.repeats
+            if not done:
+                self._schedule(self.interval)
+        try:
+            self.at_repeat()
+        except Exception:
+            logger.exception(f"Error in script {self.key} on {self.obj}")
+        if done:
+            if self.obj:
+                self.obj.remove_script(self)
+            else:
+                self.stop()
+
+    def at_start(self):
+        """
+        Called when the script is started, but not when it's resumed after a reload.
+        """
+        pass
+
+    def at_repeat(self):
+        """
+        Called every interval.
+        """
+        pass
+
+    def at_stop(self):
+        """
+        Called when the script is stopped or removed from its object.
+        """
+        pass
@@ -1,4 +1,6 @@
 from typing import TYPE_CHECKING, Callable, Any
+from atheriz.singletons.objects import get
+import atheriz.settings as settings
 
 if TYPE_CHECKING:
     from atheriz.objects.base_obj import Object
@@ -33,14 +35,21 @@ def group_by_name(objs: list[Object], looker: Object | None = None) -> str:
     """
     if not objs:
         return ""
+    return group_names([o.get_display_name(looker) if looker else o.name for o in objs])
+
+
+def group_names(names: list[str]) -> str:
+    """Group display names, i.e. ["rat", "cat", "rat"] -> "rat(2), cat".
+
+    Args:
+        names (list[str]): The names to group.
+
+    Returns:
+        str: The grouped names.
+    """
     groups = {}
-    for o in objs:
-        name = o.get_display_name(looker) if looker else o.name
-        count = groups.get(name, 0)
-        if count == 0:
-            groups[name] = 1
-        else:
-            groups[name] = count + 1
+    for name in names:
+        groups[name] = groups.get(name, 0) + 1
     return ", ".join([f"{name}({count})" if count > 1 else name for name, count in groups.items()])
 
 
@@ -62,6 +71,104 @@ def filter_contents(obj: Object | Node, l: Callable[[Any], bool]) -> list[Any]:
     return [o for o in obj.contents if l(o)]
 
 
+def search_text(obj: Object) -> str:
+    """what search matches query terms against, as substrings"""
+    return "".join(obj.aliases) + obj.name
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class ContentsIndex:
+    """
+    trigram index over the names and aliases of a container's contents. a search term can only
+    be a substring of objects that have all of its trigrams, so search checks those instead of
+    every object in the container.
+    containers make one once they hold settings.SEARCH_INDEX_THRESHOLD objects and keep it up to
+    date as objects come and go or get renamed. only use it under the container's lock.
+    """
+
+    def __init__(self):
+        # trigram -> ids of the objects whose search text has it
+        self.grams: dict[str, set[int]] = {}
+        # id -> search text it was indexed under
+        self.text: dict[int, str] = {}
+
+    def add(self, obj: Object):
+        text = search_text(obj)
+        self.text[obj.id] = text
+        for g in _grams(text):
+            ids = self.grams.get(g)
+            if ids is None:
+                self.grams[g] = {obj.id}
+            else:
+                ids.add(obj.id)
+
+    def remove(self, obj: Object):
+        text = self.text.pop(obj.id, None)
+        if text is None:
+            return
+        for g in _grams(text):
+            ids = self.grams.get(g)
+            if ids is not None:
+                ids.discard(obj.id)
+                if not ids:
+                    del self.grams[g]
+
+    def update(self, obj: Object):
+        self.remove(obj)
+        self.add(obj)
+
+    def candidates(self, term: str) -> set[int] | None:
+        """ids that might contain term, or None if term is too short to narrow it down"""
+        if len(term) < 3:
+            return None
+        postings = []
+        for g in _grams(term):
+            ids = self.grams.get(g)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+
+def get_search_index(obj: Object | Node) -> ContentsIndex | None:
+    """obj's ContentsIndex, made now if it just got big enough to need one"""
+    index = obj._search_index
+    if index is None and 0 < settings.SEARCH_INDEX_THRESHOLD <= len(obj._contents):
+        with obj.lock:
+            if obj._search_index is None:
+                index = ContentsIndex()
+                for o in obj.contents:
+                    index.add(o)
+                obj._search_index = index
+            index = obj._search_index
+    return index
+
+
+def _candidates(obj: Object | Node, index: ContentsIndex, required: list[str], optional: list[str]):
+    # objects that could match all of required or any of optional, in id order
+    with obj.lock:
+        ids = set()
+        if required:
+            narrowed = [c for s in required if (c := index.candidates(s)) is not None]
+            if narrowed:
+                ids = narrowed[0].intersection(*narrowed[1:])
+            else:
+                ids = set(obj._contents)
+        for s in optional:
+            c = index.candidates(s)
+            if c is None:
+                ids = set(obj._contents)
+                break
+            ids |= c
+        # the index can be behind on objects that just left
+        ids &= obj._contents
+    return get(sorted(ids))
+
+
 def search(obj: Object | Node, query: str) -> list:
     """
     search for matching objects
@@ -135,11 +242,18 @@ def search(obj: Object | Node, query: str) -> list:
         else:
             required.append(split[x])
     matches = {}
-    objs = obj.contents
+    search_index = get_search_index(obj)
+    if search_index is not None:
+        objs = _candidates(obj, search_index, required, optional)
+    else:
+        # id order like _candidates, so "sword 2" is the same sword once the index kicks in
+        with obj.lock:
+            objs = get(sorted(obj._contents))
     for x in range(len(objs)):
         found = False
+        text = search_text(objs[x])
         for s in required:
-            if s in "".join(objs[x].aliases) + "".join(objs[x].name):
+            if s in text:
                 found = True
             else:
                 found = False
@@ -152,19 +266,20 @@ def search(obj: Object | Node, query: str) -> list:
                 if len(matches) == count and index == 0:
                     return [v for v in matches.values()]
         for s in optional:
-            if s in "".join(objs[x].aliases) + "".join(objs[x].name):
+            if s in text:
                 if count == 1 and index == 0:
                     return [objs[x]]
                 else:
                     matches[x] = objs[x]
                     if len(matches) == count and index == 0:
                         return [v for v in matches.values()]
+    results = list(matches.values())
     if count == 0:  # 0 means all
-        return [v for v in matches.values()]
-    if index == 0 and len(matches) > count:  # we have more matches than requested
-        return [matches[x] for x in range(count)]
-    if index != 0 and index <= len(matches):  # specific match index was requested
-        return [matches[index - 1]]
-    elif index != 0 and index > len(matches):  # match not found
+        return results
+    if index == 0 and len(results) > count:  # we have more matches than requested
+        return results[:count]
+    if index != 0 and index <= len(results):  # specific match index was requested
+        return [results[index - 1]]
+    elif index != 0 and index > len(results):  # match not found
         return []
-    return [v for v in matches.values()]  # count >= matches
+    return results  # count >= matches
@@ -46,9 +46,12 @@ The `FuncParser` also accepts a direct dict mapping of `{'name': callable, ...}`
 
 """
 
+import copy
 import dataclasses
 import inspect
 import random
+import re
+from functools import lru_cache
 from .verb_conjugation.conjugate import verb_actor_stance_components
 from .verb_conjugation.pronouns import pronoun_to_viewpoints
 import atheriz.settings as settings
@@ -59,6 +62,10 @@ _CLIENT_DEFAULT_WIDTH = settings.CLIENT_DEFAULT_WIDTH
 _MAX_NESTING = settings.FUNCPARSER_MAX_NESTING
 _START_CHAR = settings.FUNCPARSER_START_CHAR
 _ESCAPE_CHAR = settings.FUNCPARSER_ESCAPE_CHAR
+_TEMPLATE_CACHE_SIZE = settings.FUNCPARSER_TEMPLATE_CACHE_SIZE
+# stands in for a call's result while compiling, "\x00<index of the call>\x00"
+_MARK = "\x00"
+_MARK_RE = re.compile("\x00(\\d+)\x00")
 from atheriz.logger import logger
 
 
@@ -100,6 +107,74 @@ class ParsingError(RuntimeError):
     pass
 
 
+class _Template:
+    """
+    A string compiled by `FuncParser.compile`. Finding the `$funcname(...)` calls in the string
+    and splitting out their arguments is done once, rendering only runs the calls.
+
+    """
+
+    __slots__ = ("parser", "string", "raise_errors", "parts", "calls", "deterministic")
+
+    def __init__(self, parser, string, raise_errors, parts=None, calls=None, deterministic=False):
+        self.parser = parser
+        self.string = string
+        self.raise_errors = raise_errors
+        # False if rendering twice with the same kwargs can give different text (like $random),
+        # or if there's no telling
+        self.deterministic = deterministic
+        # text and indexes into the call results, None if the string couldn't be compiled
+        self.parts = parts
+        # (parsedfunc, args, kwargs) in the order parse would run them, inner calls first. an int
+        # in args or kwargs is the result of an earlier call
+        self.calls = calls
+
+    def render(self, **reserved_kwargs):
+        """
+        Run the calls and put the string back together, the same as
+        `parser.parse(string, raise_errors=raise_errors, **reserved_kwargs)`.
+
+        Args:
+            **reserved_kwargs: Passed into every callable, as for `FuncParser.parse`.
+
+        Returns:
+            str: The parsed string.
+
+        """
+        if self.parts is None:
+            return self.parser.parse(
+                self.string, raise_errors=self.raise_errors, **reserved_kwargs
+            )
+        execute = self.parser.execute
+        results = []
+        for parsedfunc, args, kwargs in self.calls:
+            call_args = []
+            for arg in args:
+                if arg.__class__ is int:
+                    arg = results[arg]
+                    if isinstance(arg, str) and not arg:
+                        # parse drops positional args from inner calls that return ""
+                        continue
+                call_args.append(arg)
+            call = _ParsedFunc(
+                prefix=parsedfunc.prefix,
+                funcname=parsedfunc.funcname,
+                args=call_args,
+                kwargs={
+                    key: results[value] if value.__class__ is int else value
+                    for key, value in kwargs.items()
+                },
+                rawstr=parsedfunc.rawstr,
+                infuncstr=parsedfunc.infuncstr,
+            )
+            ret = execute(call, raise_errors=self.raise_errors, **reserved_kwargs)
+            if isinstance(ret, str) and _MARK in ret:
+                # a failed call comes back as its raw text, which can hold inner results
+                ret = _MARK_RE.sub(lambda m: str(results[int(m.group(1))]), ret)
+            results.append(ret)
+        return "".join(part if part.__class__ is str else str(results[part]) for part in self.parts)
+
+
 class FuncParser:
     """
     Sets up a parser for strings containing `$funcname(*args, **kwargs)`
@@ -168,6 +243,7 @@ class FuncParser:
         self.escape_char = escape_char
         self.start_char = start_char
         self.default_kwargs = default_kwargs
+        self._compile_cached = lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)(self._compile)
 
     def validate_callables(self, callables):
         """
@@ -631,6 +707,72 @@ class FuncParser:
             **reserved_kwargs,
         )
 
+    def compile(self, string, raise_errors=False):
+        """
+        Compile a string for rendering many times over, like a message going to everyone in a
+        room. Compiled strings are cached, the last `settings.FUNCPARSER_TEMPLATE_CACHE_SIZE`
+        used are kept.
+
+        Args:
+            string (str): The string to compile.
+            raise_errors (bool, optional): As for `.parse`.
+
+        Returns:
+            _Template: Call `.render(**reserved_kwargs)` on it to get what
+                `.parse(string, raise_errors=raise_errors, **reserved_kwargs)` would return.
+
+        Examples:
+            ::
+
+                template = parser.compile("$You() $conj(smile).")
+                for receiver in receivers:
+                    receiver.msg(template.render(caller=caller, receiver=receiver))
+
+        """
+        return self._compile_cached(string, bool(raise_errors))
+
+    def _compile(self, string, raise_errors):
+        if _MARK in string:
+            return _Template(self, string, raise_errors)
+
+        calls = []
+
+        def record(parsedfunc, raise_errors=False, **reserved_kwargs):
+            calls.append(parsedfunc)
+            return f"{_MARK}{len(calls) - 1}{_MARK}"
+
+        # parse with every call standing in for its result, so the parsing rules live in one place
+        recorder = copy.copy(self)
+        recorder.execute = record
+        text = recorder.parse(string, raise_errors=raise_errors)
+        deterministic = not any(
+            self.callables.get(parsedfunc.funcname) in NONDETERMINISTIC_CALLABLES
+            for parsedfunc in calls
+        )
+
+        compiled = []
+        for parsedfunc in calls:
+            args = [_compile_arg(arg) for arg in parsedfunc.args]
+            kwargs = {key: _compile_arg(value) for key, value in parsedfunc.kwargs.items()}
+            if None in args or None in kwargs.values() or any(_MARK in key for key in kwargs):
+                # an inner call's result mixed into other text gets stripped and merged in ways
+                # that depend on the result, so leave those to parse
+                return _Template(self, string, raise_errors, deterministic=deterministic)
+            compiled.append((parsedfunc, args, kwargs))
+
+        parts = _MARK_RE.split(text)
+        # split leaves the call indexes at odd positions
+        parts = [part if i % 2 == 0 else int(part) for i, part in enumerate(parts) if part != ""]
+        return _Template(self, string, raise_errors, parts, compiled, deterministic)
+
+
+def _compile_arg(arg):
+    """an arg as compile stores it, its call index if it's an inner call, None if it can't be"""
+    if not isinstance(arg, str) or _MARK not in arg:
+        return arg
+    m = _MARK_RE.fullmatch(arg)
+    return int(m.group(1)) if m else None
+
 
 #
 # Default funcparser callables. These are made available from this module's
@@ -1614,6 +1756,13 @@ FUNCPARSER_CALLABLES = {
     "an": funcparser_callable_an,
 }
 
+# callables that can return something else every time, see _Template.deterministic
+NONDETERMINISTIC_CALLABLES = {
+    funcparser_callable_random,
+    funcparser_callable_randint,
+    funcparser_callable_choice,
+}
+
 # SEARCHING_CALLABLES = {
 #     # requires `caller` and optionally `access` to be passed into parser
 #     "search": funcparser_callable_search,
@@ -3,7 +3,8 @@ from atheriz.utils import is_iter, make_iter, iter_to_str
 from typing import Any, Iterable, Optional
 from atheriz.singletons.objects import get
 import random
-from threading import Lock, RLock
+from atheriz.singletons.lockpool import new_lock
+from atheriz.singletons.access import cached_access, invalidate_access
 from typing import TYPE_CHECKING
 from pyatomix import AtomicFlag, AtomicInt
 from atheriz.utils import (
@@ -14,7 +15,6 @@ from atheriz.utils import (
     tuple_to_str,
     str_to_tuple,
 )
-from atheriz.objects import funcparser
 from atheriz.singletons.objects import get, filter_by
 from atheriz.objects.contents import search
 from atheriz.singletons.get import get_node_handler, get_async_ticker
@@ -30,7 +30,8 @@ import base64
 if TYPE_CHECKING:
     from atheriz.objects.base_obj import Object
 
-_MSG_CONTENTS_PARSER = funcparser.FuncParser(funcparser.ACTOR_STANCE_CALLABLES)
+_MSG_EACH = None
+_PERSPECTIVE = None
 
 appearance_template = """{name}{desc}{doors}{exits}{characters}{things}"""
 
@@ -127,6 +128,10 @@ class Node:
         data: dict = None,
         links: list[NodeLink] = None,
     ):
+        self.lock = new_lock(self)
+        # bumped whenever something shown by return_appearance changes
+        self.appearance_version = 0
+        self._appearance_cache: dict[tuple, Any] = {}
         self.coord = coord
         self.desc = desc
         self._is_tickable = False
@@ -136,15 +141,58 @@ class Node:
         self.data = data if data else {}
         self.links = links
         self._contents = set()
-        self.lock = RLock()
         self.is_deleted = False
         self.nouns = {}
         self.locks: dict[str, list[Callable]] = {}
-        if settings.SLOW_LOCKS:
+        self._access_cache = None
+        # ContentsIndex for search, once this holds settings.SEARCH_INDEX_THRESHOLD objects
+        self._search_index = None
+        if settings.ACCESS_CACHE:
+            self.access = self._cached_access
+        elif settings.SLOW_LOCKS:
             self.access = self._safe_access
         else:
             self.access = self._fast_access
 
+    @property
+    def desc(self) -> str | None:
+        return self._desc
+
+    @desc.setter
+    def desc(self, value: str | None):
+        self._desc = value
+        self.invalidate_appearance()
+
+    def invalidate_appearance(self):
+        """
+        throw away cached appearance fragments.
+        contents, exits and desc changes already do this, call it if you change something else
+        that return_appearance shows (like the name of an object in this node)
+        """
+        with self.lock:
+            self.appearance_version += 1
+            self._appearance_cache.clear()
+
+    def appearance_key(self, looker: Object) -> tuple:
+        """
+        lookers with the same key share cached appearance fragments, override this if a subclass
+        shows things based on more than the looker's class and builder status
+        """
+        return (looker.__class__, looker.is_builder)
+
+    def _cached_fragment(self, key: tuple, build: Callable[[], Any]) -> Any:
+        with self.lock:
+            value = self._appearance_cache.get(key)
+            version = self.appearance_version
+        if value is not None:
+            return value
+        value = build()
+        with self.lock:
+            # don't cache something built from contents that changed while we were building it
+            if self.appearance_version == version:
+                self._appearance_cache[key] = value
+        return value
+
     def _safe_access(self, accessing_obj: Object, name: str):
         if accessing_obj.is_superuser:
             return True
@@ -164,6 +212,12 @@ class Node:
                 return False
         return True
 
+    def _cached_access(self, accessing_obj: Object, name: str):
+        if accessing_obj.is_superuser:
+            return True
+        check = self._safe_access if settings.SLOW_LOCKS else self._fast_access
+        return cached_access(self, accessing_obj, name, check)
+
     def add_lock(self, lock_name: str, callable: Callable):
         """
         Add a lock to this object.
@@ -181,6 +235,7 @@ class Node:
             l = self.locks.get(lock_name, [])
             l.append(callable)
             self.locks[lock_name] = l
+        invalidate_access()
 
     def clear_locks_by_name(self, lock_name: str):
         """
@@ -191,11 +246,16 @@ class Node:
         """
         with self.lock:
             self.locks.pop(lock_name, None)
+        invalidate_access()
 
     def __getstate__(self):
         state = self.__dict__.copy()
         state["_contents"] = list(state["_contents"])
         del state["lock"]
+        del state["_appearance_cache"]
+        state.pop("_access_cache", None)
+        state.pop("_search_index", None)
+        state["desc"] = state.pop("_desc")
         if "access" in state:
             del state["access"]
         if self.links:
@@ -206,7 +266,10 @@ class Node:
         return state
 
     def __setstate__(self, state):
-        self.lock = RLock()
+        self.lock = new_lock(self)
+        self.appearance_version = 0
+        self._appearance_cache = {}
+        state["_desc"] = state.pop("desc", None)
         self.locks = dill.loads(base64.b64decode(state["locks"]))
         del state["locks"]
         self._contents = set(state["_contents"])
@@ -215,7 +278,11 @@ class Node:
         del state["links"]
         state["coord"] = str_to_tuple(state["coord"])
         self.__dict__.update(state)
-        if settings.SLOW_LOCKS:
+        self._access_cache = None
+        self._search_index = None
+        if settings.ACCESS_CACHE:
+            self.access = self._cached_access
+        elif settings.SLOW_LOCKS:
             self.access = self._safe_access
         else:
             self.access = self._fast_access
@@ -366,6 +433,7 @@ class Node:
                 self.links.append(link)
             elif not self.links:
                 self.links = [link]
+            self.invalidate_appearance()
             for o in self.contents:
                 self.add_exits(o)
 
@@ -384,6 +452,7 @@ class Node:
                         break
                 if index != -1:
                     found = self.links.pop(index)
+                    self.invalidate_appearance()
         if found:
             if self.coord[0] != found.coord[0]:  # need to remove a transition too
                 nh = get_node_handler()
@@ -422,8 +491,11 @@ class Node:
         """
         with self.lock:
             self._contents.update([obj.id for obj in objs])
+            self.invalidate_appearance()
             for o in objs:
                 self.add_exits(o)
+                if self._search_index is not None:
+                    self._search_index.add(o)
 
     def add_object(self, obj: Object):
         """
@@ -433,7 +505,10 @@ class Node:
         """
         with self.lock:
             self._contents.add(obj.id)
+            self.invalidate_appearance()
             self.add_exits(obj)
+            if self._search_index is not None:
+                self._search_index.add(obj)
 
     def remove_object(self, obj):
         """
@@ -443,8 +518,34 @@ class Node:
         """
         with self.lock:
             self._contents.discard(obj.id)
+            self.invalidate_appearance()
+            if self._search_index is not None:
+                self._search_index.remove(obj)
         obj.internal_cmdset.remove_by_tag("exits")
 
+    def remove_objects(self, objs: list[Object]):
+        """
+        remove objects from this node's inventory
+        Args:
+            objs (list): list of objects to remove
+        """
+        with self.lock:
+            self._contents.difference_update([obj.id for obj in objs])
+            self.invalidate_appearance()
+            if self._search_index is not None:
+                for obj in objs:
+                    self._search_index.remove(obj)
+        for obj in objs:
+            obj.internal_cmdset.remove_by_tag("exits")
+
+    def reindex(self, obj: Object):
+        """
+        update the search index for obj, something here that changed its name or aliases
+        """
+        with self.lock:
+            if self._search_index is not None and obj.id in self._contents:
+                self._search_index.update(obj)
+
     def msg_contents(
         self,
         text=None,
@@ -456,7 +557,6 @@ class Node:
     ):
         is_outcmd = text and is_iter(text)
         inmessage = text[0] if is_outcmd else text
-        outkwargs = text[1] if is_outcmd and len(text) > 1 else {}
         mapping = mapping or {}
         you = from_obj or self
 
@@ -468,29 +568,20 @@ class Node:
             exclude = make_iter(exclude)
             contents = [obj for obj in contents if obj not in exclude]
 
-        for receiver in contents:
-            # actor-stance replacements
-            outmessage = _MSG_CONTENTS_PARSER.parse(
-                inmessage,
-                raise_errors=raise_funcparse_errors,
-                return_string=True,
-                caller=you,
-                receiver=receiver,
-                mapping=mapping,
-            )
-            outmessage = outmessage.format_map(
-                {
-                    key: (
-                        obj.get_display_name(looker=receiver)
-                        if hasattr(obj, "get_display_name")
-                        else str(obj)
-                    )
-                    for key, obj in mapping.items()
-                }
-            )
-            # debug_msg(outmessage)
-            # receiver.msg(text=(outmessage, outkwargs), from_obj=from_obj, **kwargs)
-            receiver.msg(text=outmessage, from_obj=from_obj, **kwargs)
+        global _MSG_EACH
+        if not _MSG_EACH:
+            from atheriz.objects.base_obj import msg_each as _MSG_EACH
+        # nodes send the plain string, any outcommand kwargs are dropped
+        _MSG_EACH(
+            contents,
+            inmessage,
+            you,
+            mapping,
+            from_obj=from_obj,
+            outkwargs=None,
+            raise_funcparse_errors=raise_funcparse_errors,
+            **kwargs,
+        )
 
     # def at_pre_object_leave(self, leaving_object, destination, **kwargs):
     #     return True
@@ -512,8 +603,12 @@ class Node:
             f"{wrap_xterm256('You see:', fg=15, bold=True)} {thing_names}\n" if thing_names else ""
         )
 
+    def get_characters(self, looker) -> list[Object]:
+        """the characters in here that looker sees listed, which is everyone but themselves"""
+        return filter_contents(self, lambda x: (x.is_pc or x.is_npc) and x != looker)
+
     def get_display_characters(self, looker, **kwargs):
-        characters = filter_contents(self, lambda x: (x.is_pc or x.is_npc) and x != looker)
+        characters = self.get_characters(looker)
         character_names = group_by_name(characters, looker)
         return (
             f"{wrap_xterm256('Characters:', fg=15, bold=True)} {character_names}\n"
@@ -566,9 +661,15 @@ class Node:
                 )
         return ""
 
+    def display_name_key(self, looker: Object) -> Any:
+        """lookers with the same key get the same get_display_name, see Object.display_name_key"""
+        return looker.is_builder
+
     def return_appearance(self, looker, **kwargs):
         if not looker:
             return "You see nothing here."
+        if settings.APPEARANCE_CACHE and not kwargs:
+            return self._cached_appearance(looker)
         return appearance_template.format(
             name=self.get_display_name(looker, **kwargs),
             desc=self.get_display_desc(looker, **kwargs),
@@ -579,6 +680,56 @@ class Node:
         )
 
 
+    def _cached_appearance(self, looker: Object) -> str:
+        """
+        return_appearance put together from fragments cached per appearance_key(looker)
+        """
+        variant = self.appearance_key(looker)
+        name, desc, exits = self._cached_fragment(
+            ("header", variant),
+            lambda: (
+                self.get_display_name(looker),
+                self.get_display_desc(looker),
+                self.get_display_exits(looker),
+            ),
+        )
+        global _PERSPECTIVE
+        if not _PERSPECTIVE:
+            from atheriz.objects.base_obj import display_name_perspective as _PERSPECTIVE
+        # the names of things in here can depend on who's looking too
+        perspective = _PERSPECTIVE(self.contents, looker)
+        if perspective is None:
+            things = self.get_display_things(looker)
+            characters = self.get_display_characters(looker)
+        else:
+            things = self._cached_fragment(
+                ("things", variant, perspective), lambda: self.get_display_things(looker)
+            )
+            # get_characters leaves the looker out, so anyone standing in here gets their own entry
+            with self.lock:
+                present = looker.id if looker.id in self._contents else None
+            characters = self._cached_fragment(
+                ("characters", variant, present, perspective),
+                lambda: self.get_display_characters(looker),
+            )
+        doors = ""
+        d = get_node_handler().get_doors(self.coord)
+        if d:
+            # doors open and close without touching this node, so their state is part of the key
+            doors = self._cached_fragment(
+                ("doors", variant, tuple((id(v), v.closed.test()) for v in d.values())),
+                lambda: self.get_display_doors(looker),
+            )
+        return appearance_template.format(
+            name=name,
+            desc=desc,
+            exits=exits,
+            characters=characters,
+            things=things,
+            doors=doors,
+        )
+
+
 def _tuple_to_str(t: tuple) -> str:
     return repr(t)
 
@@ -595,7 +746,7 @@ class NodeGrid:
         self.area: str | None = area
         self.z = z
         self.nodes: dict[tuple[int, int], Node] = {}  # x,y coord: Node
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.data = data if data else {}
 
     def __str__(self):
@@ -664,7 +815,7 @@ class NodeGrid:
         return state
 
     def __setstate__(self, state):
-        self.lock = RLock()
+        self.lock = new_lock(self)
         nodes = state["nodes"]
         del state["nodes"]
         self.__dict__.update(state)
@@ -681,7 +832,7 @@ class NodeArea:
         self.name = name
         self.theme = theme
         self.grids: dict[int, NodeGrid] = {}  # {z: map}
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.data = {}
         self.linked_areas = None  # any yells from this area will be broadcast to these areas
 
@@ -799,7 +950,7 @@ class NodeArea:
         grids = state["grids"]
         del state["grids"]
         self.__dict__.update(state)
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.grids = {}
         for k, v in grids.items():
             if k == "null":
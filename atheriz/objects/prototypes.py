@@ -0,0 +1,132 @@
+from atheriz.objects.base_obj import Object
+from atheriz.commands.cmdset import CmdSet
+from atheriz.singletons.objects import add_objects
+from atheriz.singletons.get import get_unique_ids, get_async_ticker, get_map_handler
+import atheriz.settings as settings
+from threading import RLock
+from typing import Any, Callable, TYPE_CHECKING
+import time
+
+if TYPE_CHECKING:
+    from atheriz.objects.nodes import Node
+
+# key = prototype key, value = Prototype
+# only access via the lock
+_PROTOTYPES: dict[str, "Prototype"] = {}
+_PROTOTYPES_LOCK = RLock()
+
+
+class Prototype:
+    """
+    a template for objects that get made by the hundred, like goblins or coins. objects spawned
+    from it share its field values, locks and external cmdset instead of each getting their own,
+    and only save the prototype key plus whatever they changed.
+
+    assigning a field on a spawned object is always fine, but call obj.own(field) before changing
+    a shared list, dict or cmdset in place. Object's own methods (add_lock, subscribe...) do.
+
+    prototypes register themselves by key, and spawned objects find theirs by key when they
+    load, so define them at module level next to their typeclass.
+    Args:
+        key: unique name of the prototype
+        typeclass: class to spawn
+        locks: locks shared by every spawned object, like Object.locks
+        **fields: field values by their save key, like name="goblin" or is_npc=True
+    """
+
+    def __init__(
+        self,
+        key: str,
+        typeclass: type[Object] = Object,
+        locks: dict[str, list[Callable]] | None = None,
+        **fields,
+    ):
+        self.key = key
+        self.typeclass = typeclass
+        # storage name -> value, handed out to every spawned object
+        self.shared: dict[str, Any] = {}
+        schema = typeclass._schema_keys
+        for k, v in fields.items():
+            f = schema.get(k) or schema.get("_" + k)
+            if f is None or not f.persist:
+                raise ValueError(f"{typeclass.__name__} has no field {k} to put in a prototype")
+            self.shared[f.name] = v
+        self.shared["locks"] = locks if locks is not None else {}
+        # commands others can use on spawned objects
+        self.external_cmdset = CmdSet()
+        self.shared["external_cmdset"] = self.external_cmdset
+        with _PROTOTYPES_LOCK:
+            _PROTOTYPES[key] = self
+
+    def __repr__(self):
+        return f"Prototype({self.key!r}, {self.typeclass.__name__})"
+
+    def apply(self, obj: Object):
+        """point obj's fields at the shared values"""
+        for name, value in self.shared.items():
+            setattr(obj, name, value)
+        obj.prototype = self
+
+    def shares(self, name: str, value: Any) -> bool:
+        """True if value is the one this prototype hands out for field name"""
+        return name in self.shared and self.shared[name] is value
+
+    def copy_value(self, name: str, value: Any) -> Any:
+        """a copy of a shared value for an object that's about to change it"""
+        if isinstance(value, CmdSet):
+            cs = CmdSet()
+            with value.lock:
+                cs.commands = value.commands.copy()
+            return cs
+        if name == "locks":
+            return {k: list(v) for k, v in value.items()}
+        if isinstance(value, (list, dict, set)):
+            return value.copy()
+        return value
+
+    def new(self, id: int) -> Object:
+        """make one object from this prototype, without registering or placing it"""
+        obj = self.typeclass()
+        obj.id = id
+        obj.date_created = time.time()
+        self.apply(obj)
+        # exits get added to and removed from this on every move, so it's never shared
+        obj.internal_cmdset = CmdSet()
+        return obj
+
+
+def get_prototype(key: str) -> Prototype | None:
+    with _PROTOTYPES_LOCK:
+        return _PROTOTYPES.get(key)
+
+
+def spawn(
+    prototype: Prototype | str, n: int = 1, location: Node | Object | None = None
+) -> list[Object]:
+    """
+    make n objects from a prototype and put them in location.
+    objects are placed all at once, without move hooks or announcements.
+    Args:
+        prototype: the prototype or its key
+        n: how many to make
+        location: node or container to put them in
+
+    Returns:
+        list[Object]: the new objects
+    """
+    proto = prototype if isinstance(prototype, Prototype) else get_prototype(prototype)
+    if proto is None:
+        raise ValueError(f"Unknown prototype: {prototype}")
+    objs = [proto.new(id) for id in get_unique_ids(n)]
+    add_objects(objs)
+    if location is not None:
+        for obj in objs:
+            obj.location = location
+            if not location.is_node:
+                obj.last_touched_by = location.id
+        location.add_objects(objs)
+        if location.is_node and settings.MAP_ENABLED and proto.shared.get("is_mapable"):
+            get_map_handler().add_mapables(objs, location.coord)
+    if proto.shared.get("_is_tickable"):
+        get_async_ticker().add_coros([o.at_tick for o in objs], settings.TICK_SECONDS)
+    return objs
@@ -13,6 +13,9 @@ http://www.cis.upenn.edu/~xtag/
 """
 
 import os
+from functools import lru_cache
+from threading import Lock
+import atheriz.settings as settings
 
 _VERBS_FILE = "verbs.txt"
 
@@ -58,23 +61,47 @@ verb_tenses_aliases = {
 # Additionally, the following verbs can be negated:
 # be, can, do, will, must, have, may, need, dare, ought.
 
-# load the conjugation forms from ./verbs.txt
-verb_tenses = {}
-
-path = os.path.join(os.path.dirname(__file__), _VERBS_FILE)
-with open(path) as fil:
-    for line in fil.readlines():
-        wordlist = [part.strip() for part in line.split(",")]
-        verb_tenses[wordlist[0]] = wordlist
-
-# Each verb can be lemmatised:
-# inflected morphs of the verb point
-# to its infinitive in this dictionary.
-verb_lemmas = {}
-for infinitive in verb_tenses:
-    for tense in verb_tenses[infinitive]:
-        if tense:
-            verb_lemmas[tense] = infinitive
+# the conjugation forms from ./verbs.txt, {infinitive: [forms]}, and each form pointing back at
+# its infinitive. loaded the first time they're needed, use _tables() to get them (verb_tenses and
+# verb_lemmas still work as module attributes)
+_VERB_TENSES = None
+_VERB_LEMMAS = None
+_LOAD_LOCK = Lock()
+
+
+def _tables():
+    global _VERB_TENSES, _VERB_LEMMAS
+    if _VERB_LEMMAS is not None:
+        return _VERB_TENSES, _VERB_LEMMAS
+    with _LOAD_LOCK:
+        if _VERB_LEMMAS is None:
+            verb_tenses = {}
+            path = os.path.join(os.path.dirname(__file__), _VERBS_FILE)
+            with open(path) as fil:
+                for line in fil.readlines():
+                    wordlist = [part.strip() for part in line.split(",")]
+                    verb_tenses[wordlist[0]] = wordlist
+
+            # Each verb can be lemmatised:
+            # inflected morphs of the verb point
+            # to its infinitive in this dictionary.
+            verb_lemmas = {}
+            for infinitive in verb_tenses:
+                for tense in verb_tenses[infinitive]:
+                    if tense:
+                        verb_lemmas[tense] = infinitive
+            _VERB_TENSES = verb_tenses
+            # set last, other threads only look at _VERB_LEMMAS before taking the lock
+            _VERB_LEMMAS = verb_lemmas
+    return _VERB_TENSES, _VERB_LEMMAS
+
+
+def __getattr__(name):
+    if name == "verb_tenses":
+        return _tables()[0]
+    if name == "verb_lemmas":
+        return _tables()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def verb_infinitive(verb):
@@ -89,7 +116,7 @@ def verb_infinitive(verb):
 
     """
 
-    return verb_lemmas.get(verb, "")
+    return _tables()[1].get(verb, "")
 
 
 def verb_conjugate(verb, tense="infinitive", negate=False):
@@ -129,7 +156,7 @@ def verb_conjugate(verb, tense="infinitive", negate=False):
     if negate:
         ind += len(verb_tenses_keys)
     try:
-        return verb_tenses[verb][ind]
+        return _tables()[0][verb][ind]
     except (IndexError, KeyError):
         # TODO implement simple algorithm here with +s for certain tenses?
         return verb
@@ -257,7 +284,7 @@ def verb_tense(verb):
 
     """
     infinitive = verb_infinitive(verb)
-    data = verb_tenses.get(infinitive)
+    data = _tables()[0].get(infinitive)
     if not data:
         return infinitive
     for tense in verb_tenses_keys:
@@ -365,6 +392,9 @@ def verb_is_past_participle(verb):
     return tense == "past participle"
 
 
+# $conj runs this for every actor-stance message, and the same few verbs (say, walk) come up over
+# and over
+@lru_cache(maxsize=settings.FUNCPARSER_WORD_CACHE_SIZE)
 def verb_actor_stance_components(verb, plural=False):
     """
     Figure out actor stance components of a verb.
@@ -26,7 +26,9 @@ viewpoint/pronouns    Subject  Object    Possessive  Possessive  Reflexive
 ====================  =======  ========  ==========  ==========  ===========
 """
 
+from functools import lru_cache
 from atheriz.utils import copy_word_case, is_iter
+import atheriz.settings as settings
 
 DEFAULT_PRONOUN_TYPE = "subject pronoun"
 DEFAULT_VIEWPOINT = "2nd person"
@@ -228,6 +230,15 @@ def pronoun_to_viewpoints(pronoun, options=None, pronoun_type=None, gender=None,
         The capitalization of the original word will be retained.
 
     """
+    if options is not None and not isinstance(options, str):
+        # lists can't be cache keys
+        options = tuple(options)
+    return _pronoun_to_viewpoints(pronoun, options, pronoun_type, gender, viewpoint)
+
+
+# $pron runs this for every actor-stance message it's in, with the same few pronouns each time
+@lru_cache(maxsize=settings.FUNCPARSER_WORD_CACHE_SIZE)
+def _pronoun_to_viewpoints(pronoun, options, pronoun_type, gender, viewpoint):
     if not pronoun:
         return pronoun
 
@@ -10,9 +10,60 @@ ACCOUNT_CREATION_ENABLED = True
 WEBSERVER_ENABLED = True
 WEBSERVER_PORT = 8000
 WEBSERVER_INTERFACE = "0.0.0.0"
-THREADPOOL_LIMIT = os.cpu_count()
+# "auto" checks at startup whether python is running with the GIL and picks THREADPOOL_LIMIT and
+# OFFLOAD_WORKERS to suit, for either of them left as None.
+# "free_threaded" or "gil" picks as if it was running that way. see atheriz/singletons/profile.py
+EXECUTION_PROFILE = "auto"
+# threads in the threadpool, None lets EXECUTION_PROFILE pick (every core without the GIL, at most
+# 4 with it)
+THREADPOOL_LIMIT = None
+# how many asyncio event loops run coroutines (commands, prompts, timers), each on its own thread.
+# each object's coroutines always go to the same loop. the first loop uses one of THREADPOOL_LIMIT's
+# threads, the rest are extra threads on top so sync tasks keep THREADPOOL_LIMIT - 1 workers
+ASYNC_LOOPS = 4
+# run tasks that belong to the same object (commands from a player, an NPC's ticks) one at a time
+# and in order, instead of letting any free thread pick them up
+ACTOR_SCHEDULING = True
+# how many tasks a thread runs from one object's mailbox before giving other objects a turn
+ACTOR_MAILBOX_BATCH = 16
+# threadpool tasks are queued in lanes, each round a lane gets up to this many tasks run while it
+# has work. every lane with work gets a turn each round so nothing starves
+THREADPOOL_LANE_WEIGHTS = {"interactive": 8, "tick": 3, "background": 1}
+# most tasks a lane can hold, 0 for no limit
+THREADPOOL_LANE_LIMITS = {"interactive": 10000, "tick": 1000, "background": 10000}
+# what a full lane does with new tasks: "block" makes whoever is adding it wait,
+# "drop_oldest" throws away the oldest queued task, "reject" refuses it (players get told the
+# server is busy)
+THREADPOOL_LANE_POLICIES = {"interactive": "reject", "tick": "drop_oldest", "background": "block"}
+# a player can't have more than this many commands waiting to run, 0 for no limit
+ACTOR_MAILBOX_LIMIT = 100
+# sent to players when their command is rejected because the server is too busy for it
+SERVER_BUSY_MESSAGE = "The server is busy, please try again in a moment."
 MAX_CHARACTERS = 5
 TICK_SECONDS = 1.0
+# tick callbacks are run in batches of up to this many per threadpool task
+TICK_BATCH_SIZE = 1000
+# what to do when a tick comes around before the last one has finished:
+# "skip" drops it, "merge" runs it as soon as the last one finishes (however many were missed),
+# "queue" runs it anyway and lets ticks pile up
+TICK_OVERRUN_POLICY = "merge"
+# each tick interval is split into this many phases and every tickable is given one by its id,
+# so ticks are spread over the interval instead of all running at the same moment
+TICK_PHASES = 10
+# tickables in areas with no players around (no one on the map or in the room) only tick every
+# this many intervals. 1 ticks them as normal, 0 stops them until a player shows up
+TICK_IDLE_DIVISOR = 5
+# per area overrides of TICK_IDLE_DIVISOR, {"area name": divisor}
+TICK_AREA_IDLE_DIVISORS: dict[str, int] = {}
+# how often delayed calls and scripts are checked, delays are rounded up to this
+TIMER_RESOLUTION = 0.05
+# workers for offload(), which runs CPU heavy pure functions (like maze generation) outside the
+# threadpool. 0 runs offloaded work on the threadpool's background lane instead. None lets
+# EXECUTION_PROFILE pick (0 without the GIL, one less than the number of cores with it)
+OFFLOAD_WORKERS = None
+# where offloaded work runs: "interpreter" for subinterpreters (python 3.14+), "process" for other
+# processes, "auto" for subinterpreters if they're available and processes otherwise
+OFFLOAD_BACKEND = "auto"
 #TODO: remove this or figure out something useful to do with it:
 PERMISSION_HIERARCHY = [
     0,  # Guest, note-only used if GUEST_ENABLED=True
@@ -26,6 +77,12 @@ PERMISSION_HIERARCHY = [
 FUNCPARSER_START_CHAR = "$"
 FUNCPARSER_ESCAPE_CHAR = "\\"
 FUNCPARSER_MAX_NESTING = 20
+# how many compiled message templates each FuncParser keeps (least recently used go first), see
+# FuncParser.compile
+FUNCPARSER_TEMPLATE_CACHE_SIZE = 1024
+# how many verb conjugations and pronoun forms $conj and $pron remember (each, least recently used
+# go first)
+FUNCPARSER_WORD_CACHE_SIZE = 512
 CLIENT_DEFAULT_WIDTH = 78
 CLIENT_DEFAULT_HEIGHT = 45
 # print exceptions in-game
@@ -38,6 +95,13 @@ CHANNEL_HISTORY_LIMIT = 50
 # If you plan on changing object permission locks while they are in use, set this to True
 # If you only set locks at object creation, you can set this to False
 SLOW_LOCKS = True
+# remember lock results per (object, accessor, lock name) until a lock or someone's
+# privilege_level/quelled changes. only turn it on if your locks don't look at anything else
+# (inventory, time of day...), or call atheriz.singletons.access.invalidate_access() when it changes
+ACCESS_CACHE = False
+# containers (rooms, bags, shops...) holding at least this many objects keep a name/alias index
+# so searching them doesn't check every object, 0 turns it off
+SEARCH_INDEX_THRESHOLD = 200
 # Max attempts before temporary ban
 MAX_LOGIN_ATTEMPTS = 3
 # Cooldown in seconds for temporary ban
@@ -47,6 +111,16 @@ MAP_ENABLED = True
 LEGEND_ENABLED = True
 # maximum frames per second for map rendering, recommended to be around 5-10
 MAP_FPS_LIMIT = 5
+# render maps on a dedicated thread instead of the thread of whoever moved
+MAP_RENDER_THREAD = True
+# maps are stored and rendered in square chunks of this many cells per side
+MAP_CHUNK_SIZE = 64
+# only chunks within this many chunks of a listener are rendered for them, None = render the whole map
+MAP_CHUNK_RADIUS = 2
+# players only see map cells they have explored
+FOG_OF_WAR = False
+# how many cells around a player are revealed as they move
+FOG_OF_WAR_RADIUS = 3
 # no map legend will be shown if there are more mapable objects than this
 MAX_OBJECTS_PER_LEGEND = 30
 AUTOSAVE_PLAYERS_ON_DISCONNECT = True
@@ -61,6 +135,24 @@ AUTO_COMMAND_ALIASING = True
 # if you disable this, you'll probably run into thread-safety issues because core code is relying on this
 # note: this doesn't work for mutable attributes like lists and dicts, you'll need to manually lock those
 THREADSAFE_GETTERS_SETTERS = True
+# how THREADSAFE_GETTERS_SETTERS makes attributes thread-safe. "lock" takes the object's lock for
+# every attribute access, method lookups included. "fields" only covers the fields a class lists in
+# thread_safe_fields, with descriptors that swap values in the instance dict without locking, and
+# leaves everything else alone. that's accounts and channels: objects keep their schema fields in
+# __slots__, which are already single reference swaps, so nothing is installed on them. it's much
+# faster but relies on code that reads then writes (like move_to) holding the object's lock itself
+THREADSAFE_MODE = "lock"
+# 0 gives every object, node, grid, map and cmdset its own lock. anything else makes them share
+# this many locks, which saves a lot of memory on big worlds. shared locks are still re-entrant,
+# but code holding more than one entity's lock at a time has to use lockpool.lock_all. can't be
+# used with attribute locks in THREADSAFE_MODE "lock", since every attribute access takes a lock
+LOCK_STRIPES = 0
+# cache the pieces of room descriptions between looks, they're rebuilt when the room changes.
+# off by default: anything a description shows that changes without going through
+# Node.invalidate_appearance (or Object._listing_changed for things in the room) is shown stale
+# until the room next changes. what lookers see is told apart by Node.appearance_key and by the
+# display_name_key of everything listed
+APPEARANCE_CACHE = False
 # possible values: single, double, rounded, none
 DEFAULT_ROOM_OUTLINE = "single"
 # choose characters for these which will never be used on a map
@@ -0,0 +1,64 @@
+from threading import Lock
+from typing import Any, Callable
+
+# bumped whenever a lock or an accessor's privileges change anywhere, results cached under an
+# older generation are never used again. reading it is atomic, bumping it takes the lock
+_GENERATION = 0
+_GENERATION_LOCK = Lock()
+# only for stats. counted without a lock, since this is on the path of every access check,
+# so they can come out a little low under free-threading
+_HITS = 0
+_MISSES = 0
+
+
+def invalidate_access() -> None:
+    """
+    forget every cached access result. add_lock, clear_locks_by_name and changing privilege_level
+    or quelled call this, call it yourself after changing anything else a lock looks at.
+    """
+    global _GENERATION
+    with _GENERATION_LOCK:
+        _GENERATION += 1
+
+
+def cached_access(target: Any, accessor: Any, name: str, check: Callable[[Any, str], bool]) -> bool:
+    """
+    check(accessor, name), unless target already has a result for accessor and name from the
+    current generation. results live on target in _access_cache, so they go when it does.
+    """
+    global _HITS, _MISSES
+    key = accessor.id
+    if key < 0:
+        # not registered yet, nothing to key on
+        return check(accessor, name)
+    gen = _GENERATION
+    cache = target._access_cache
+    if cache is None or cache[0] != gen:
+        # a result from a check that raced an invalidation lands in the old dict, never used
+        cache = (gen, {})
+        target._access_cache = cache
+    results = cache[1]
+    result = results.get((key, name))
+    if result is not None:
+        _HITS += 1
+        return result
+    _MISSES += 1
+    result = check(accessor, name)
+    results[(key, name)] = result
+    return result
+
+
+def access_stats() -> dict[str, int | float]:
+    total = _HITS + _MISSES
+    return {
+        "hits": _HITS,
+        "misses": _MISSES,
+        "hit_rate": _HITS / total if total else 0.0,
+        "generation": _GENERATION,
+    }
+
+
+def reset_access_stats() -> None:
+    global _HITS, _MISSES
+    _HITS = 0
+    _MISSES = 0
@@ -1,14 +1,182 @@
 import asyncio
 from asyncio import AbstractEventLoop
 import os
-from threading import Lock, Thread, RLock
+from threading import Lock, Thread, RLock, Condition, get_ident
 import time
 from typing import Optional
 import traceback
-import queue
 from atheriz.logger import logger
-from atheriz.settings import DEBUG
-from atheriz.singletons.get import get_async_threadpool
+from atheriz.settings import (
+    DEBUG,
+    ASYNC_LOOPS,
+    ACTOR_SCHEDULING,
+    ACTOR_MAILBOX_BATCH,
+    THREADPOOL_LANE_WEIGHTS,
+    THREADPOOL_LANE_LIMITS,
+    THREADPOOL_LANE_POLICIES,
+    TICK_BATCH_SIZE,
+    TICK_OVERRUN_POLICY,
+    TICK_PHASES,
+    TICK_IDLE_DIVISOR,
+    TICK_AREA_IDLE_DIVISORS,
+    TIMER_RESOLUTION,
+    OFFLOAD_BACKEND,
+)
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import math
+import random
+from collections import deque
+from itertools import count
+from atheriz.singletons.get import (
+    get_async_threadpool,
+    get_map_handler,
+    get_offload_pool,
+    get_execution_profile,
+)
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:
+    # subinterpreters are new in 3.14
+    InterpreterPoolExecutor = None
+
+# player input and anything else someone is waiting on
+LANE_INTERACTIVE = "interactive"
+# at_tick callbacks
+LANE_TICK = "tick"
+# saves, maintenance, anything nobody is waiting on
+LANE_BACKGROUND = "background"
+
+# what a full lane does with a new task
+# wait for room. the pool's own threads don't wait, they're the ones that make room
+POLICY_BLOCK = "block"
+# throw away the oldest task in the lane to make room
+POLICY_DROP_OLDEST = "drop_oldest"
+# refuse the new task
+POLICY_REJECT = "reject"
+
+
+class LaneQueue:
+    """
+    a FIFO queue per lane. get() picks lanes by weighted round robin: each round, every lane can
+    hand out up to its weight in tasks, in the order the lanes were given. a busy lane can't
+    starve the others because a new round only starts once every lane with work has used its share.
+    lanes can have a limit, what happens when a lane is full depends on its policy.
+    """
+
+    def __init__(
+        self,
+        weights: dict[str, int],
+        limits: dict[str, int] | None = None,
+        policies: dict[str, str] | None = None,
+    ) -> None:
+        for lane, weight in weights.items():
+            # a lane with no share never gets served, and get() would spin waiting for it
+            if weight < 1:
+                raise ValueError(f"Lane weight must be at least 1: {lane}={weight}")
+        self.weights = dict(weights)
+        self.lanes: dict[str, deque] = {k: deque() for k in weights}
+        self.credits = dict(weights)
+        # 0 means no limit
+        self.limits = {k: 0 for k in weights}
+        self.limits.update(limits or {})
+        self.policies = {k: POLICY_BLOCK for k in weights}
+        self.policies.update(policies or {})
+        for policy in self.policies.values():
+            if policy not in (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_REJECT):
+                raise ValueError(f"Unknown lane policy: {policy}")
+        lock = Lock()
+        self.cond = Condition(lock)
+        self.not_full = Condition(lock)
+        self.size = 0
+        # instrumentation
+        self.served = {k: 0 for k in weights}
+        self.enqueued = {k: 0 for k in weights}
+        self.dropped = {k: 0 for k in weights}
+        self.rejected = {k: 0 for k in weights}
+        self.blocked = {k: 0 for k in weights}
+
+    def put(
+        self, item, lane: str = LANE_INTERACTIVE, force=False, on_drop=None, block=True
+    ) -> bool:
+        """
+        Args:
+            item: the task
+            lane (str, optional): lane to queue it in. Defaults to LANE_INTERACTIVE.
+            force (bool, optional): ignore the lane's limit, for tasks that must not be lost.
+                forced tasks are never dropped either. Defaults to False.
+            on_drop (callable, optional): called with no args if the task is dropped.
+            block (bool, optional): False to go over the limit instead of waiting on a lane
+                that blocks. Defaults to True.
+        Returns:
+            bool: False if the task was rejected
+        """
+        dropped = None
+        with self.cond:
+            q = self.lanes[lane]
+            limit = self.limits[lane]
+            if not force and limit and len(q) >= limit:
+                policy = self.policies[lane]
+                if policy == POLICY_REJECT:
+                    self.rejected[lane] += 1
+                    return False
+                if policy == POLICY_DROP_OLDEST:
+                    for i, entry in enumerate(q):
+                        if not entry[1]:
+                            del q[i]
+                            self.size -= 1
+                            self.dropped[lane] += 1
+                            dropped = entry[2]
+                            break
+                elif block:
+                    self.blocked[lane] += 1
+                    while len(q) >= limit:
+                        self.not_full.wait()
+            q.append((item, force, on_drop))
+            self.size += 1
+            self.enqueued[lane] += 1
+            self.cond.notify()
+        if dropped:
+            dropped()
+        return True
+
+    def get(self):
+        with self.cond:
+            while not self.size:
+                self.cond.wait()
+            while True:
+                for lane, q in self.lanes.items():
+                    if q and self.credits[lane] > 0:
+                        self.credits[lane] -= 1
+                        self.served[lane] += 1
+                        self.size -= 1
+                        if self.limits[lane]:
+                            self.not_full.notify_all()
+                        return q.popleft()[0]
+                # every lane with work has used its share, start a new round
+                self.credits = dict(self.weights)
+
+    def qsize(self, lane: str | None = None) -> int:
+        with self.cond:
+            if lane is None:
+                return self.size
+            return len(self.lanes[lane])
+
+    def stats(self) -> dict[str, dict[str, int | str]]:
+        with self.cond:
+            return {
+                lane: {
+                    "queued": len(q),
+                    "limit": self.limits[lane],
+                    "policy": self.policies[lane],
+                    "enqueued": self.enqueued[lane],
+                    "served": self.served[lane],
+                    "dropped": self.dropped[lane],
+                    "rejected": self.rejected[lane],
+                    "blocked": self.blocked[lane],
+                }
+                for lane, q in self.lanes.items()
+            }
 
 
 class AsyncThread(Thread):
@@ -38,55 +206,198 @@ class AsyncThread(Thread):
 
 
 class AsyncThreadPool:
-    def __init__(self, max_threads: Optional[int] = None, default_timeout=None):
+    def __init__(
+        self,
+        max_threads: Optional[int] = None,
+        default_timeout=None,
+        loops: Optional[int] = None,
+    ):
         if max_threads == None:
             max_threads = os.cpu_count() or 4
         self.max_threads = max_threads
+        # the first threads each run an event loop. the first loop takes one thread of max_threads
+        # like it always has, any extra loops are added on top so sync work keeps the rest
+        loops = max(1, ASYNC_LOOPS if loops is None else loops)
         self.threads = []
-        self.loop = asyncio.new_event_loop()
-        self.threads.append(AsyncThread(self.loop, 0))
-        self.threads[0].start()  # first thread is for async
+        self.loops: list[AbstractEventLoop] = []
+        for i in range(loops):
+            loop = asyncio.new_event_loop()
+            t = AsyncThread(loop, i)
+            t.start()
+            self.loops.append(loop)
+            self.threads.append(t)
+        # the first loop, for anything that only needs a loop and doesn't care which
+        self.loop = self.loops[0]
+        self.next_loop = count()
         self.timeout = default_timeout
-        self.task_queue = queue.Queue()
-        for _ in range(max_threads - 1):  # rest of the threads for sync
+        # the built in lanes always exist, settings decide their weights and any extra lanes
+        self.task_queue = LaneQueue(
+            {LANE_INTERACTIVE: 1, LANE_TICK: 1, LANE_BACKGROUND: 1, **THREADPOOL_LANE_WEIGHTS},
+            THREADPOOL_LANE_LIMITS,
+            THREADPOOL_LANE_POLICIES,
+        )
+        self.actor_scheduling = ACTOR_SCHEDULING
+        # id(owner) -> pending tasks for that owner, a mailbox exists while it's queued or running
+        self.mailboxes: dict[int, deque] = {}
+        self.mailbox_lock = Lock()
+        for _ in range(max(1, max_threads - 1)):  # rest of the threads for sync
             t = Thread(daemon=True, target=self._work_loop)
             t.start()
             self.threads.append(t)
+        # the pool's own threads never wait on a full lane, they're the ones that empty it
+        self.thread_ids = {t.ident for t in self.threads}
 
-    def _work_loop(self):
-        async def do_async(func, *args, **kwargs):
-            try:
-                await func(*args, **kwargs)
-            except Exception as e:
-                tb = traceback.format_exc()
-                if DEBUG:
-                    try:
-                        caller = args[0]
-                        caller.msg(f"{tb}")
-                    except Exception as e2:
-                        logger.error(f"Exception while sending exception to caller: {e2}")
-                logger.error(f"{tb}")
+    async def _do_async(self, func, *args, **kwargs):
+        try:
+            await func(*args, **kwargs)
+        except Exception as e:
+            tb = traceback.format_exc()
+            if DEBUG:
+                try:
+                    caller = args[0]
+                    caller.msg(f"{tb}")
+                except Exception as e2:
+                    logger.error(f"Exception while sending exception to caller: {e2}")
+            logger.error(f"{tb}")
+
+    @property
+    def sync_threads(self) -> int:
+        return max(1, self.max_threads - 1)
+
+    def loop_for(self, owner=None) -> AbstractEventLoop:
+        """
+        get the event loop for an owner's coroutines, an owner always gets the same loop so its
+        coroutines can share futures and run in order. objects are spread by their id, anything
+        without one by identity. ownerless coroutines take turns on every loop.
+        """
+        n = len(self.loops)
+        if n == 1:
+            return self.loop
+        if owner is None:
+            return self.loops[next(self.next_loop) % n]
+        key = getattr(owner, "id", None)
+        if not isinstance(key, int) or key < 0:
+            # addresses are aligned, so mix the bits before taking the shard
+            key = (id(owner) >> 4) * 0x9E3779B1 >> 16
+        return self.loops[key % n]
 
+    def _run(self, func, args, kwargs, done=None, owner=None):
+        """
+        run a task on this thread, or hand it to an event loop if it's a coroutine
+        Args:
+            done (callable, optional): called with no args once the task has finished
+            owner (optional): picks the event loop for coroutines, see loop_for
+        Returns: the concurrent.futures.Future for coroutines, otherwise None
+        """
+        if hasattr(func, "__code__") and func.__code__.co_flags & 128 == 128:
+            future = asyncio.run_coroutine_threadsafe(
+                self._do_async(func, *args, **kwargs), self.loop_for(owner)
+            )
+            if done:
+                future.add_done_callback(lambda _: done())
+            return future
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            tb = traceback.format_exc()
+            if DEBUG:
+                try:
+                    caller = args[0]
+                    caller.msg(f"{tb}")
+                except:
+                    pass
+            logger.info(f"{tb}")
+        if done:
+            done()
+
+    def _work_loop(self):
         while True:
             task = self.task_queue.get()
             if task is None:  # kill signal
                 # print("worker thread stopping...")
                 break
             func, args, kwargs = task
-            if hasattr(func, "__code__") and func.__code__.co_flags & 128 == 128:
-                asyncio.run_coroutine_threadsafe(do_async(func, *args, **kwargs), self.loop)
+            self._run(func, args, kwargs)
+
+    def _run_mailbox(self, key: int):
+        """
+        run tasks from one owner's mailbox, the mailbox is only ever run by one thread at a time.
+        coroutines hold the mailbox until they finish so the owner's next task can't overtake them.
+        """
+        for _ in range(ACTOR_MAILBOX_BATCH):
+            with self.mailbox_lock:
+                box = self.mailboxes[key]
+                if not box:
+                    del self.mailboxes[key]
+                    return
+                _, owner, func, args, kwargs, done = box.popleft()
+            future = self._run(func, args, kwargs, done, owner)
+            if future:
+                future.add_done_callback(lambda _: self._queue_mailbox(key))
+                return
+        # let other mailboxes have a turn
+        self._queue_mailbox(key)
+
+    def _run_owned(self, owner, func, args, kwargs, lane: str, done=None):
+        """
+        run func right here if its owner's mailbox is free, holding the mailbox while it runs.
+        otherwise it goes into the mailbox behind the owner's other tasks, and done is called
+        right away so one busy owner doesn't hold up whoever is waiting on it.
+        """
+        key = id(owner)
+        with self.mailbox_lock:
+            box = self.mailboxes.get(key)
+            if box is not None:
+                box.append((lane, owner, func, args, kwargs, None))
             else:
-                try:
-                    func(*args, **kwargs)
-                except Exception as e:
-                    tb = traceback.format_exc()
-                    if DEBUG:
-                        try:
-                            caller = args[0]
-                            caller.msg(f"{tb}")
-                        except:
-                            pass
-                    logger.info(f"{tb}")
+                self.mailboxes[key] = deque()
+        if box is not None:
+            if done:
+                done()
+            return
+        future = self._run(func, args, kwargs, done, owner)
+        if future:
+            future.add_done_callback(lambda _: self._release_mailbox(key))
+        else:
+            self._release_mailbox(key)
+
+    def _release_mailbox(self, key: int):
+        with self.mailbox_lock:
+            if not self.mailboxes[key]:
+                del self.mailboxes[key]
+                return
+        # something was added while we held it
+        self._queue_mailbox(key)
+
+    def _run_batch(self, calls: list, lane: str, on_done, select=None):
+        if select:
+            calls = select(calls)
+        remaining = 1  # the batch itself
+        lock = Lock()
+
+        def finished():
+            nonlocal remaining
+            with lock:
+                remaining -= 1
+                last = remaining == 0
+            if last and on_done:
+                on_done()
+
+        for owner, func, args, kwargs in calls:
+            with lock:
+                remaining += 1
+            if owner is not None and self.actor_scheduling:
+                self._run_owned(owner, func, args, kwargs, lane, finished)
+            else:
+                self._run(func, args, kwargs, finished, owner)
+        finished()
+
+    def _queue_mailbox(self, key: int):
+        # the mailbox waits in the lane of its next task
+        with self.mailbox_lock:
+            box = self.mailboxes.get(key)
+            lane = box[0][0] if box else LANE_INTERACTIVE
+        self.task_queue.put((self._run_mailbox, (key,), {}), lane, True)
 
     def stop(self, wait=True):
         """
@@ -95,73 +406,388 @@ class AsyncThreadPool:
             wait (bool, optional): wait for async tasks to finish. Defaults to True.
         """
         print("at AsyncThreadPool.stop() ...")
-        self.threads[0].stop(wait)
+        for t in self.threads[: len(self.loops)]:
+            t.stop(wait)
         for _ in range(self.max_threads):
-            self.task_queue.put(None)
+            self.task_queue.put(None, force=True)
 
-    def add_task(self, func, *args, **kwargs):
+    def submit(
+        self,
+        func,
+        args: tuple = (),
+        kwargs: dict | None = None,
+        owner=None,
+        lane: str = LANE_INTERACTIVE,
+        force=False,
+        mailbox_limit: int = 0,
+    ) -> bool:
         """
         execute a function on the threadpool
+        Args:
+            func (callable): coroutine or function to execute
+            args (tuple, optional): func args
+            kwargs (dict, optional): func kwargs
+            owner (Object | Node, optional): run after every task previously submitted for the
+                same owner has finished, see add_actor_task. Defaults to None.
+            lane (str, optional): LANE_INTERACTIVE, LANE_TICK, LANE_BACKGROUND or any other lane
+                in settings.THREADPOOL_LANE_WEIGHTS. Defaults to LANE_INTERACTIVE.
+            force (bool, optional): queue it even if the lane is full. Defaults to False.
+            mailbox_limit (int, optional): reject the task if the owner already has this many
+                tasks waiting, 0 for no limit. Defaults to 0.
+        Returns:
+            bool: False if it was rejected, because the lane was full and its policy is to reject
+                new tasks or because of mailbox_limit
+        """
+        if lane not in self.task_queue.lanes:
+            raise ValueError(f"Unknown threadpool lane: {lane}")
+        block = get_ident() not in self.thread_ids
+        task = (func, args, kwargs if kwargs else {})
+        if owner is None:
+            return self.task_queue.put(task, lane, force, block=block)
+        if not self.actor_scheduling:
+            # no ordering, but coroutines still go to the owner's loop
+            task = (self._run, (*task, None, owner), {})
+            return self.task_queue.put(task, lane, force, block=block)
+        key = id(owner)
+        with self.mailbox_lock:
+            box = self.mailboxes.get(key)
+            if box is not None:
+                if not force and mailbox_limit and len(box) >= mailbox_limit:
+                    # one owner flooding their own mailbox
+                    with self.task_queue.cond:
+                        self.task_queue.rejected[lane] += 1
+                    return False
+                # already queued or running, whoever runs it will get to this
+                box.append((lane, owner, *task, None))
+                return True
+            self.mailboxes[key] = deque([(lane, owner, *task, None)])
+        if self.task_queue.put((self._run_mailbox, (key,), {}), lane, force, block=block):
+            return True
+        with self.mailbox_lock:
+            # our task is still at the head, anything behind it was added since
+            box = self.mailboxes[key]
+            box.popleft()
+            if not box:
+                del self.mailboxes[key]
+                return False
+        # something was added in between, the mailbox has to run for that
+        self.task_queue.put((self._run_mailbox, (key,), {}), lane, True)
+        return False
+
+    def submit_batch(self, funcs: list, lane: str = LANE_TICK, on_done=None, select=None):
+        """
+        run a list of callbacks as a single task instead of one task each.
+        with actor scheduling, bound methods still run in order with their object's other tasks.
+        Args:
+            funcs (list[callable]): functions or coroutines to call with no args
+            lane (str, optional): lane to queue the batch in. Defaults to LANE_TICK.
+            on_done (callable, optional): called with no args once every callback has finished,
+                including coroutines, or been queued behind its busy owner's other tasks.
+                Defaults to None.
+            select (callable, optional): called on the worker thread with the list of
+                (owner, func, args, kwargs) calls, returns the ones to actually run. Defaults to
+                None.
+        """
+        calls = [(getattr(f, "__self__", None), f, (), {}) for f in funcs]
+        return self.submit_calls(calls, lane, on_done, select=select)
+
+    def submit_calls(
+        self, calls: list, lane: str = LANE_TICK, on_done=None, force=False, select=None
+    ):
+        """
+        like submit_batch, but for calls that need args or an owner that isn't the bound object
+        Args:
+            calls (list[tuple]): (owner, func, args, kwargs) for each call, owner can be None
+            lane (str, optional): lane to queue the batch in. Defaults to LANE_TICK.
+            on_done (callable, optional): called with no args once every call has finished or
+                been queued behind its busy owner, or if the batch is dropped or rejected.
+            force (bool, optional): queue it even if the lane is full. Defaults to False.
+            select (callable, optional): see submit_batch. Defaults to None.
+        Returns:
+            bool: False if the batch was rejected
+        """
+        block = get_ident() not in self.thread_ids
+        task = (self._run_batch, (calls, lane, on_done, select), {})
+        if self.task_queue.put(task, lane, force, on_done, block):
+            return True
+        if on_done:
+            on_done()
+        return False
+
+    def add_task(self, func, *args, **kwargs):
+        """
+        execute a function on the threadpool, in the interactive lane
         Args:
             func (callable): coroutine or function to execute
             args: func args
             kwargs: func kwargs
+        Returns:
+            bool: False if the task was rejected
         """
-        self.task_queue.put((func, args, kwargs))
+        return self.submit(func, args, kwargs)
+
+    def add_actor_task(self, owner, func, *args, **kwargs):
+        """
+        execute a function on the threadpool after every task previously added for the same owner
+        has finished. tasks for different owners still run in parallel.
+        falls back to add_task if settings.ACTOR_SCHEDULING is off or there's no owner.
+        Args:
+            owner (Object | Node | None): object the task belongs to, usually the caller
+            func (callable): coroutine or function to execute
+            args: func args
+            kwargs: func kwargs
+        Returns:
+            bool: False if the task was rejected
+        """
+        return self.submit(func, args, kwargs, owner)
+
+    def add_background_task(self, func, *args, **kwargs):
+        """
+        execute a function on the threadpool in the background lane, for work nobody is waiting on
+        Args:
+            func (callable): coroutine or function to execute
+            args: func args
+            kwargs: func kwargs
+        """
+        return self.submit(func, args, kwargs, lane=LANE_BACKGROUND)
+
+    def stats(self) -> dict[str, dict[str, int | str]]:
+        """
+        queue counters for each lane
+        """
+        return self.task_queue.stats()
 
 
 class AsyncTicker:
     class TimeSlot:
-        def __init__(self, interval: float) -> None:
-            self.atp = get_async_threadpool()
+        """
+        runs every callback once per interval. callbacks are split into phases by their object's
+        id and each phase runs at its own point in the interval, so ticks are spread out instead of
+        all landing at once. callbacks in areas nobody is watching tick less often, see _is_idle.
+        """
+
+        def __init__(
+            self, interval: float, atp: AsyncThreadPool | None = None, phases: int | None = None
+        ) -> None:
+            self.atp = atp if atp else get_async_threadpool()
             self.lock = RLock()
             self.interval = interval
+            self.phases = max(1, TICK_PHASES if phases is None else phases)
             self.coros = set()
+            # the callbacks in each phase
+            self.buckets: list[set] = [set() for _ in range(self.phases)]
             self.running = False
             self.task = None
+            # full intervals so far, used to pick which ticks idle callbacks get
+            self.cycle = 0
+            # whether each area/room has a player around, worked out once per cycle, see _is_idle
+            self.presence: dict[tuple, bool] = {}
+            # batches of each phase's current tick which haven't finished yet
+            self.busy = [0] * self.phases
+            self.tick_start = [0.0] * self.phases
+            # phases with a tick waiting for their current one to finish, for the "merge" policy
+            self.pending: set[int] = set()
+            # instrumentation
+            self.ticks = 0
+            self.overruns = 0
+            self.idle_skipped = 0
+            self.last_lag = 0.0
+            self.max_lag = 0.0
+            self.last_duration = 0.0
+            self.max_duration = 0.0
+
+        @property
+        def in_flight(self) -> int:
+            return sum(self.busy)
+
+        @property
+        def tick_pending(self) -> bool:
+            return bool(self.pending)
+
+        def phase_of(self, coro) -> int:
+            owner = getattr(coro, "__self__", None)
+            key = getattr(owner, "id", None)
+            if not isinstance(key, int) or key < 0:
+                key = hash(coro)
+            return key % self.phases
 
         def add_coro(self, coro):
             with self.lock:
                 self.coros.add(coro)
+                self.buckets[self.phase_of(coro)].add(coro)
+
+        def add_coros(self, coros):
+            with self.lock:
+                for coro in coros:
+                    self.coros.add(coro)
+                    self.buckets[self.phase_of(coro)].add(coro)
 
         def remove_coro(self, coro):
             with self.lock:
                 try:
                     self.coros.remove(coro)
+                    self.buckets[self.phase_of(coro)].discard(coro)
                 except:
                     pass
 
+        def remove_coros(self, coros):
+            with self.lock:
+                for coro in coros:
+                    self.coros.discard(coro)
+                    self.buckets[self.phase_of(coro)].discard(coro)
+
         def stop(self):
             with self.lock:
                 self.running = False
                 if self.task:
                     self.task.cancel()
 
+        def stats(self) -> dict[str, int | float]:
+            with self.lock:
+                return {
+                    "callbacks": len(self.coros),
+                    "ticks": self.ticks,
+                    "overruns": self.overruns,
+                    "idle_skipped": self.idle_skipped,
+                    "last_lag": self.last_lag,
+                    "max_lag": self.max_lag,
+                    "last_duration": self.last_duration,
+                    "max_duration": self.max_duration,
+                }
+
         async def timer(self):
+            loop = asyncio.get_running_loop()
+            step = self.interval / self.phases
+            index = 1
+            start = loop.time()
             while True:
                 with self.lock:
                     if not self.running:
                         return
-                    self.task = asyncio.create_task(asyncio.sleep(self.interval))
+                    self.task = asyncio.create_task(
+                        asyncio.sleep(max(0.0, start + index * step - loop.time()))
+                    )
                 await self.task
+                lag = loop.time() - (start + index * step)
+                self.tick(lag, index % self.phases)
+                # steps that were missed completely because the loop was busy are dropped
+                index += max(0, math.floor(lag / step)) + 1
+
+        def tick(self, lag: float = 0.0, phase: int | None = None):
+            """
+            run one phase's callbacks, or every phase at once if phase is None
+            """
+            phases = range(self.phases) if phase is None else (phase,)
+            runs = []
+            with self.lock:
+                self.last_lag = lag
+                if lag > self.max_lag:
+                    self.max_lag = lag
+                if phase is None or phase == 0:
+                    self.cycle += 1
+                    self.presence = {}
+                for p in phases:
+                    if self.busy[p]:
+                        # the last tick of this phase is still running
+                        self.overruns += 1
+                        if TICK_OVERRUN_POLICY == "skip":
+                            continue
+                        if TICK_OVERRUN_POLICY == "merge":
+                            self.pending.add(p)
+                            continue
+                    runs.append((p, list(self.buckets[p])))
+            for p, callbacks in runs:
+                self._dispatch(p, callbacks)
+
+        def _is_idle(self, coro, cache: dict, cycle: int) -> bool:
+            """
+            True if coro's object is somewhere no player can see: no one is listening to its
+            map and there's no connected player in its room
+            """
+            loc = getattr(getattr(coro, "__self__", None), "location", None)
+            # things in containers and inventories go by the room they're in
+            for _ in range(8):
+                if loc is None or loc.is_node:
+                    break
+                loc = loc.location
+            if loc is None or not loc.is_node:
+                return False
+            coord = loc.coord
+            key = (coord[0], coord[3])
+            watched = cache.get(key)
+            if watched is None:
+                mi = get_map_handler().get_mapinfo(*key)
+                watched = cache[key] = bool(mi and mi.listeners)
+            if watched:
+                return False
+            # maps might be off, so check the room itself too
+            watched = cache.get(coord)
+            if watched is None:
+                watched = cache[coord] = any(o.is_pc and o.is_connected for o in loc.contents)
+            if watched:
+                return False
+            divisor = TICK_AREA_IDLE_DIVISORS.get(coord[0], TICK_IDLE_DIVISOR)
+            return divisor == 0 or cycle % divisor != 0
+
+        def _active(self, calls: list, cycle: int) -> list:
+            with self.lock:
+                cache = self.presence
+            active = [c for c in calls if not self._is_idle(c[1], cache, cycle)]
+            if len(active) != len(calls):
+                with self.lock:
+                    self.idle_skipped += len(calls) - len(active)
+            return active
+
+        def _dispatch(self, phase: int, callbacks: list):
+            if not callbacks:
+                return
+            select = None
+            if TICK_IDLE_DIVISOR != 1 or TICK_AREA_IDLE_DIVISORS:
+                # walking rooms for players is left to the workers, this can be the loop's thread
                 with self.lock:
-                    for c in self.coros:
-                        self.atp.add_task(c)
+                    cycle = self.cycle
+                select = lambda calls: self._active(calls, cycle)
+            # one batch per worker thread, but small enough that other lanes get a look in
+            workers = self.atp.sync_threads
+            size = max(1, min(TICK_BATCH_SIZE, math.ceil(len(callbacks) / workers)))
+            batches = [callbacks[i : i + size] for i in range(0, len(callbacks), size)]
+            with self.lock:
+                self.ticks += 1
+                self.busy[phase] += len(batches)
+                self.tick_start[phase] = time.perf_counter()
+            for b in batches:
+                self.atp.submit_batch(b, LANE_TICK, lambda: self._batch_done(phase), select)
+
+        def _batch_done(self, phase: int):
+            with self.lock:
+                self.busy[phase] -= 1
+                if self.busy[phase]:
+                    return
+                self.last_duration = time.perf_counter() - self.tick_start[phase]
+                if self.last_duration > self.max_duration:
+                    self.max_duration = self.last_duration
+                if phase not in self.pending or not self.running:
+                    return
+                # run the ticks that piled up during the overrun as one
+                self.pending.discard(phase)
+                callbacks = list(self.buckets[phase])
+            self._dispatch(phase, callbacks)
 
         def start(self):
             if not self.running:
                 self.running = True
-                self.atp.add_task(self.timer)
+                self.atp.submit(self.timer, force=True)
 
-    def __init__(self) -> None:
+    def __init__(self, atp: AsyncThreadPool | None = None) -> None:
         self.lock = RLock()
+        self.atp = atp
         self.slots: dict[float, AsyncTicker.TimeSlot] = {}
 
     def add_coro(self, coro, interval: float):
         with self.lock:
             slot = self.slots.get(interval)
             if not slot:
-                slot = AsyncTicker.TimeSlot(interval)
+                slot = AsyncTicker.TimeSlot(interval, self.atp)
                 slot.add_coro(coro)
                 self.slots[interval] = slot
                 slot.start()
@@ -169,6 +795,16 @@ class AsyncTicker:
         slot.add_coro(coro)
         slot.start()
 
+    def add_coros(self, coros, interval: float):
+        """add_coro for a batch, taking the slot's lock once"""
+        with self.lock:
+            slot = self.slots.get(interval)
+            if not slot:
+                slot = AsyncTicker.TimeSlot(interval, self.atp)
+                self.slots[interval] = slot
+        slot.add_coros(coros)
+        slot.start()
+
     def remove_coro(self, coro, interval: float):
         with self.lock:
             slot = self.slots.get(interval)
@@ -176,6 +812,22 @@ class AsyncTicker:
             slot.remove_coro(coro)
             if len(slot.coros) == 0:
                 slot.stop()
+
+    def remove_coros(self, coros, interval: float):
+        with self.lock:
+            slot = self.slots.get(interval)
+        if slot:
+            slot.remove_coros(coros)
+            if len(slot.coros) == 0:
+                slot.stop()
+
+    def stats(self) -> dict[float, dict[str, int | float]]:
+        """
+        tick lag, duration and overrun counters for each interval
+        """
+        with self.lock:
+            slots = list(self.slots.items())
+        return {k: v.stats() for k, v in slots}
                 
     def clear(self):
         """
@@ -196,3 +848,326 @@ class AsyncTicker:
                     v.stop()
             except:
                 pass
+
+
+class TimerHandle:
+    """
+    a timer scheduled on the TimingWheel, keep it around if you might want to cancel it
+    """
+
+    __slots__ = (
+        "callback",
+        "args",
+        "kwargs",
+        "owner",
+        "interval",
+        "jitter",
+        "deadline",
+        "tick",
+        "cancelled",
+    )
+
+    def __init__(self, callback, args, kwargs, owner, interval, jitter) -> None:
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.owner = owner
+        # seconds between repeats, None for one-shot timers
+        self.interval: float | None = interval
+        self.jitter = jitter
+        # time.monotonic() when this will fire next
+        self.deadline = 0.0
+        self.tick = 0
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def remaining(self) -> float:
+        """seconds until this fires"""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _fire(self):
+        # it might have been cancelled while it was waiting for a thread
+        if not self.cancelled:
+            self.callback(*self.args, **self.kwargs)
+
+
+class TimingWheel:
+    """
+    a hierarchical timing wheel for lots of one-shot and repeating timers, driven by one asyncio
+    task instead of a task per timer.
+    the bottom level has a slot per TIMER_RESOLUTION seconds and each level up covers a whole
+    turn of the level below. timers are placed in the lowest level they fit in and move down as
+    their time gets close, so adding and cancelling a timer is O(1) no matter how many there are.
+    """
+
+    SLOT_BITS = 8
+    SLOTS = 1 << SLOT_BITS
+    LEVELS = 4
+
+    def __init__(self, atp: AsyncThreadPool | None = None, resolution: float | None = None):
+        self.atp = atp if atp else get_async_threadpool()
+        self.resolution = resolution if resolution else TIMER_RESOLUTION
+        self.lock = Lock()
+        self.wheels: list[list[list[TimerHandle]]] = [
+            [[] for _ in range(self.SLOTS)] for _ in range(self.LEVELS)
+        ]
+        self.start = time.monotonic()
+        # wheel ticks since start
+        self.current = 0
+        self.count = 0
+        self.fired = 0
+        self.running = False
+        self.task = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def schedule(
+        self,
+        seconds: float,
+        callback,
+        args: tuple = (),
+        kwargs: dict | None = None,
+        repeat=False,
+        jitter=0.0,
+        owner=None,
+    ) -> TimerHandle:
+        """
+        call a function after a delay, on the threadpool
+        Args:
+            seconds (float): delay, rounded up to the wheel's resolution
+            callback (callable): function or coroutine to call
+            args (tuple, optional): callback args
+            kwargs (dict, optional): callback kwargs
+            repeat (bool, optional): keep calling it every `seconds`. Defaults to False.
+            jitter (float, optional): up to this many seconds are randomly added to each delay,
+                to spread out timers that were made at the same time. Defaults to 0.0.
+            owner (Object | Node, optional): run in order with the owner's other tasks,
+                see AsyncThreadPool.add_actor_task. Defaults to None.
+        Returns:
+            TimerHandle: handle to cancel the timer with
+        """
+        handle = TimerHandle(
+            callback, args, kwargs if kwargs else {}, owner, seconds if repeat else None, jitter
+        )
+        with self.lock:
+            self._add(handle, seconds)
+        self.start_timer()
+        return handle
+
+    def delay(self, seconds: float, callback, *args, repeat=False, jitter=0.0, **kwargs):
+        """
+        call callback(*args, **kwargs) after a delay, bound methods run in order with the other
+        tasks of their object. see schedule() for the rest.
+        Returns:
+            TimerHandle: handle to cancel the timer with
+        """
+        return self.schedule(
+            seconds, callback, args, kwargs, repeat, jitter, getattr(callback, "__self__", None)
+        )
+
+    def _add(self, handle: TimerHandle, seconds: float):
+        if handle.jitter:
+            seconds += random.uniform(0.0, handle.jitter)
+        handle.deadline = time.monotonic() + seconds
+        handle.tick = max(
+            self.current + 1, math.ceil((handle.deadline - self.start) / self.resolution)
+        )
+        self._place(handle)
+        self.count += 1
+
+    def _place(self, handle: TimerHandle):
+        delta = handle.tick - self.current
+        for level in range(self.LEVELS):
+            if delta < 1 << (self.SLOT_BITS * (level + 1)):
+                break
+        # anything past the top level goes as far out as it can and is placed again from there
+        tick = min(handle.tick, self.current + (1 << (self.SLOT_BITS * self.LEVELS)) - 1)
+        self.wheels[level][(tick >> (self.SLOT_BITS * level)) & (self.SLOTS - 1)].append(handle)
+
+    def _advance(self, due: list[TimerHandle]):
+        self.current += 1
+        # move timers down from every level that just finished a turn, top down so they can
+        # drop more than one level in one go
+        for level in range(self.LEVELS - 1, 0, -1):
+            if self.current & ((1 << (self.SLOT_BITS * level)) - 1):
+                continue
+            slots = self.wheels[level]
+            index = (self.current >> (self.SLOT_BITS * level)) & (self.SLOTS - 1)
+            handles = slots[index]
+            slots[index] = []
+            for h in handles:
+                if h.cancelled:
+                    self.count -= 1
+                else:
+                    self._place(h)
+        slots = self.wheels[0]
+        index = self.current & (self.SLOTS - 1)
+        handles = slots[index]
+        slots[index] = []
+        for h in handles:
+            if h.cancelled:
+                self.count -= 1
+            elif h.tick > self.current:
+                self._place(h)
+            else:
+                self.count -= 1
+                due.append(h)
+
+    def start_timer(self):
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        self.atp.submit(self.timer, force=True)
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            if self.task:
+                self.task.get_loop().call_soon_threadsafe(self.task.cancel)
+
+    async def timer(self):
+        while True:
+            with self.lock:
+                if not self.running:
+                    return
+                next_time = self.start + (self.current + 1) * self.resolution
+                self.task = asyncio.create_task(
+                    asyncio.sleep(max(0.0, next_time - time.monotonic()))
+                )
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                return
+            target = int((time.monotonic() - self.start) / self.resolution)
+            due = []
+            with self.lock:
+                while self.current < target:
+                    self._advance(due)
+                for h in due:
+                    if h.interval is not None:
+                        self._add(h, h.interval)
+                self.fired += len(due)
+            for i in range(0, len(due), TICK_BATCH_SIZE):
+                # timers are never dropped, scripts schedule their next run from the callback
+                self.atp.submit_calls(
+                    [(h.owner, h._fire, (), {}) for h in due[i : i + TICK_BATCH_SIZE]],
+                    LANE_TICK,
+                    force=True,
+                )
+
+
+def delay(seconds: float, callback, *args, repeat=False, jitter=0.0, **kwargs) -> TimerHandle:
+    """
+    call callback(*args, **kwargs) after a delay, see TimingWheel.schedule
+    Returns:
+        TimerHandle: handle to cancel the timer with
+    """
+    from atheriz.singletons.get import get_timing_wheel
+
+    wheel = get_timing_wheel()
+    return wheel.delay(seconds, callback, *args, repeat=repeat, jitter=jitter, **kwargs)
+
+
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def is_plain(value) -> bool:
+    """
+    True if value is plain data that can be shipped to offload() and back: None, bools, numbers,
+    strings, bytes and tuples, lists, sets and dicts of them. game objects pickle too, but the
+    other side gets a detached copy, which is never what you want.
+    """
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return all(is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(is_plain(k) and is_plain(v) for k, v in value.items())
+    return False
+
+
+class OffloadPool:
+    """
+    runs CPU heavy pure functions outside the threadpool, in subinterpreters on 3.14+ or other
+    processes otherwise, so they use another core without holding up commands and ticks.
+    functions have to be importable (module level, not lambdas or methods) and everything in and
+    out is pickled, so only ship plain data, see is_plain.
+    """
+
+    def __init__(self, workers: int | None = None, backend: str | None = None):
+        self.lock = Lock()
+        self.workers = get_execution_profile().offload_workers if workers is None else workers
+        self.backend = OFFLOAD_BACKEND if backend is None else backend
+        # started on first use, spinning up interpreters or processes isn't free
+        self.executor: Executor | None = None
+        self.submitted = 0
+
+    def _make_executor(self) -> Executor:
+        backend = self.backend
+        if backend == "auto":
+            backend = "interpreter" if InterpreterPoolExecutor else "process"
+        if backend == "interpreter":
+            if not InterpreterPoolExecutor:
+                raise RuntimeError("OFFLOAD_BACKEND 'interpreter' needs Python 3.14+")
+            return InterpreterPoolExecutor(self.workers)
+        if backend == "process":
+            return ProcessPoolExecutor(self.workers)
+        raise ValueError(f"Unknown offload backend: {self.backend}")
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        run func(*args, **kwargs) in the pool
+        Returns:
+            Future: resolves to whatever func returns, or raises what it raised
+        """
+        if not is_plain(args) or not is_plain(kwargs):
+            raise TypeError(f"Only plain data can be offloaded to {func.__name__}")
+        with self.lock:
+            self.submitted += 1
+            if self.workers > 0 and not self.executor:
+                self.executor = self._make_executor()
+            executor = self.executor
+        if executor:
+            return executor.submit(func, *args, **kwargs)
+        # nowhere to offload to, so it just runs on the threadpool
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        get_async_threadpool().add_background_task(run)
+        return future
+
+    def shutdown(self, wait=False):
+        with self.lock:
+            executor = self.executor
+            self.executor = None
+        if executor:
+            executor.shutdown(wait, cancel_futures=True)
+
+
+def offload(func, *args, **kwargs) -> Future:
+    """
+    run a CPU heavy pure function outside the threadpool, see OffloadPool
+    Returns:
+        concurrent.futures.Future: for the result, see offload_async to await it from a coroutine
+    """
+    return get_offload_pool().submit(func, *args, **kwargs)
+
+
+async def offload_async(func, *args, **kwargs):
+    """
+    offload() for coroutines, like an async Command.run:
+    `maze = await offload_async(gen_maze, 50, 20)`
+    """
+    return await asyncio.wrap_future(offload(func, *args, **kwargs))
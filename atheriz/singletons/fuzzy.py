@@ -0,0 +1,129 @@
+from polyleven import levenshtein
+from threading import Lock
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class BKTree:
+    """
+    BK-tree of strings under levenshtein distance. every child is keyed by its distance to its
+    parent, so a search for words within k of a query only goes down children keyed
+    d - k .. d + k, where d is the query's distance to the parent.
+    """
+
+    def __init__(self):
+        # (word, {distance: child})
+        self.root: tuple[str, dict] | None = None
+        self.size = 0
+
+    def add(self, word: str) -> bool:
+        """add word, False if it was already here"""
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return True
+        node = self.root
+        while True:
+            d = levenshtein(word, node[0])
+            if d == 0:
+                return False
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self.size += 1
+                return True
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """(distance, word) for every word within max_distance of word, in no particular order"""
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            w, children = stack.pop()
+            d = levenshtein(word, w)
+            if d <= max_distance:
+                results.append((d, w))
+            for k in range(max(1, d - max_distance), d + max_distance + 1):
+                child = children.get(k)
+                if child is not None:
+                    stack.append(child)
+        return results
+
+
+class NameIndex:
+    """
+    fuzzy lookup of ids by name. names are normalized (lowercase, single spaces) and each one is
+    in the tree once, however many things share it.
+    BK-trees can't drop words, so names nothing has anymore stay in the tree until there are
+    as many of them as live names, then the tree is rebuilt.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.tree = BKTree()
+        # normalized name -> ids
+        self.ids: dict[str, set[int]] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, name: str, id: int):
+        name = normalize(name)
+        if not name:
+            return
+        with self.lock:
+            ids = self.ids.get(name)
+            if ids is None:
+                self.ids[name] = {id}
+                self.tree.add(name)
+            else:
+                ids.add(id)
+
+    def remove(self, name: str, id: int):
+        name = normalize(name)
+        with self.lock:
+            ids = self.ids.get(name)
+            if ids is None:
+                return
+            ids.discard(id)
+            if not ids:
+                del self.ids[name]
+                if self.tree.size > 2 * len(self.ids) + 64:
+                    self._rebuild()
+
+    def _rebuild(self):
+        tree = BKTree()
+        for name in self.ids:
+            tree.add(name)
+        self.tree = tree
+
+    def search(self, name: str, max_distance: int = 2, limit: int = 10) -> list[tuple[int, int]]:
+        """
+        (distance, id) of the closest matches to name, closest first, ties by name
+        Args:
+            name: what to look for
+            max_distance: most edits a match can be away
+            limit: most matches to return, 0 for all of them
+        """
+        name = normalize(name)
+        with self.lock:
+            # the cost grows fast with the distance, so don't look further than it takes to
+            # fill limit
+            found = []
+            for bound in range(max_distance + 1):
+                if bound == 0:
+                    found = [(0, name)] if name in self.ids else []
+                else:
+                    found = self.tree.search(name, bound)
+                if limit and sum(len(self.ids.get(w, ())) for _, w in found) >= limit:
+                    break
+            found.sort()
+            results = []
+            for d, word in found:
+                for id in sorted(self.ids.get(word, ())):
+                    results.append((d, id))
+                if limit and len(results) >= limit:
+                    return results[:limit]
+        return results
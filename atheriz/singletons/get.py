@@ -1,11 +1,16 @@
 from typing import TYPE_CHECKING
-from atheriz.settings import THREADPOOL_LIMIT
 from atheriz.logger import logger
 from threading import RLock
 
 if TYPE_CHECKING:
     from atheriz.commands.loggedin.cmdset import LoggedinCmdSet
-    from atheriz.singletons.asyncthreadpool import AsyncThreadPool, AsyncTicker
+    from atheriz.singletons.asyncthreadpool import (
+        AsyncThreadPool,
+        AsyncTicker,
+        TimingWheel,
+        OffloadPool,
+    )
+    from atheriz.singletons.profile import ExecutionProfile
     from atheriz.commands.unloggedin.cmdset import UnloggedinCmdSet
     from atheriz.singletons.node import NodeHandler
     from atheriz.singletons.map import MapHandler
@@ -20,6 +25,9 @@ _NODE_HANDLER: NodeHandler | None = None
 _MAP_HANDLER: MapHandler | None = None
 _SERVER_CHANNEL: Channel | None = None
 _ASYNC_TICKER: AsyncTicker | None = None
+_TIMING_WHEEL: TimingWheel | None = None
+_OFFLOAD_POOL: OffloadPool | None = None
+_EXECUTION_PROFILE: ExecutionProfile | None = None
 # _INFLECT_ENGINE: engine | None = None
 
 
@@ -49,6 +57,15 @@ def get_unique_id() -> int:
         return _ID
 
 
+def get_unique_ids(count: int) -> range:
+    """Reserve count unique IDs in one go."""
+    with _ID_LOCK:
+        global _ID
+        start = _ID + 1
+        _ID += count
+        return range(start, _ID + 1)
+
+
 def get_async_ticker() -> AsyncTicker:
     global _ASYNC_TICKER
     if not _ASYNC_TICKER:
@@ -58,6 +75,33 @@ def get_async_ticker() -> AsyncTicker:
     return _ASYNC_TICKER
 
 
+def get_timing_wheel() -> TimingWheel:
+    global _TIMING_WHEEL
+    if not _TIMING_WHEEL:
+        from atheriz.singletons.asyncthreadpool import TimingWheel
+
+        _TIMING_WHEEL = TimingWheel()
+    return _TIMING_WHEEL
+
+
+def get_execution_profile() -> ExecutionProfile:
+    global _EXECUTION_PROFILE
+    if not _EXECUTION_PROFILE:
+        from atheriz.singletons.profile import ExecutionProfile
+
+        _EXECUTION_PROFILE = ExecutionProfile()
+    return _EXECUTION_PROFILE
+
+
+def get_offload_pool() -> OffloadPool:
+    global _OFFLOAD_POOL
+    if not _OFFLOAD_POOL:
+        from atheriz.singletons.asyncthreadpool import OffloadPool
+
+        _OFFLOAD_POOL = OffloadPool()
+    return _OFFLOAD_POOL
+
+
 def get_server_channel() -> Channel | None:
     global _SERVER_CHANNEL
     if not _SERVER_CHANNEL:
@@ -94,7 +138,7 @@ def get_async_threadpool() -> AsyncThreadPool:
     if not _ASYNC_THREAD_POOL:
         from atheriz.singletons.asyncthreadpool import AsyncThreadPool
 
-        _ASYNC_THREAD_POOL = AsyncThreadPool(THREADPOOL_LIMIT)
+        _ASYNC_THREAD_POOL = AsyncThreadPool(get_execution_profile().threadpool_limit)
     return _ASYNC_THREAD_POOL
 
 
@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from threading import Lock, RLock
+import atheriz.settings as settings
+
+_STRIPES: list[RLock] = []
+_STRIPES_LOCK = Lock()
+
+
+def _get_stripes() -> list[RLock]:
+    global _STRIPES
+    if not _STRIPES:
+        with _STRIPES_LOCK:
+            if not _STRIPES:
+                _STRIPES = [RLock() for _ in range(settings.LOCK_STRIPES)]
+    return _STRIPES
+
+
+def new_lock(owner) -> RLock:
+    """
+    the lock for a game entity (object, node, grid, map, cmdset...). its own RLock, or with
+    settings.LOCK_STRIPES one shared with the other entities that land on the same stripe.
+    shared locks are still re-entrant, but two entities can share one, so use lock_all to hold
+    more than one entity's lock at a time.
+    """
+    if not settings.LOCK_STRIPES:
+        return RLock()
+    stripes = _get_stripes()
+    # addresses are aligned, so mix the bits before taking the stripe
+    return stripes[((id(owner) >> 4) * 0x9E3779B1 >> 16) % len(stripes)]
+
+
+@contextmanager
+def lock_all(*entities):
+    """
+    hold the locks of several entities at once, like both containers during a move.
+    locks are always taken in the same order, so two threads locking the same entities (or
+    entities that share a stripe) can't deadlock each other. None is skipped.
+    """
+    locks = {id(e.lock): e.lock for e in entities if e is not None}
+    ordered = [locks[k] for k in sorted(locks)]
+    for lock in ordered:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(ordered):
+            lock.release()
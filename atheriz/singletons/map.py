@@ -8,21 +8,547 @@ from atheriz.utils import (
     tuple_to_str,
     str_to_tuple,
 )
-from threading import Lock, RLock
+from threading import Lock, RLock, Thread
+from atheriz.singletons.lockpool import new_lock
 from atheriz.singletons.node import Node
+from atheriz.singletons.get import get_async_threadpool, get_map_handler
 from pathlib import Path
 from atheriz.logger import logger
 import atheriz.settings as settings
 import json
+import base64
 import time
 import copy
+import queue
+import traceback
 from typing import TYPE_CHECKING, Any
+from collections.abc import MutableMapping
 from time import sleep
 
 if TYPE_CHECKING:
     from atheriz.objects.base_obj import Object
 
 
+def _wall_glyph(n: bool, s: bool, e: bool, w: bool, style: str) -> str | None:
+    """
+    returns the box drawing character for a wall/road/path cell with the given neighbors
+    """
+    if style == "single":
+        if n and s and e and w:
+            return "┼"
+        elif n and s and e:
+            return "├"
+        elif n and s and w:
+            return "┤"
+        elif n and e and w:
+            return "┴"
+        elif s and e and w:
+            return "┬"
+        elif n and e:
+            return "└"
+        elif n and w:
+            return "┘"
+        elif s and e:
+            return "┌"
+        elif s and w:
+            return "┐"
+        elif n and s:
+            return "│"
+        elif e and w:
+            return "─"
+        elif n:
+            return "│"
+        elif s:
+            return "│"
+        elif e:
+            return "─"
+        elif w:
+            return "─"
+        else:
+            return "─"
+    elif style == "double":
+        if n and s and e and w:
+            return "╬"
+        elif n and s and e:
+            return "╠"
+        elif n and s and w:
+            return "╣"
+        elif n and e and w:
+            return "╩"
+        elif s and e and w:
+            return "╦"
+        elif n and e:
+            return "╚"
+        elif n and w:
+            return "╝"
+        elif s and e:
+            return "╔"
+        elif s and w:
+            return "╗"
+        elif n and s:
+            return "║"
+        elif e and w:
+            return "═"
+        elif n:
+            return "║"
+        elif s:
+            return "║"
+        elif e:
+            return "═"
+        elif w:
+            return "═"
+        else:
+            return "═"
+    elif style == "rounded":
+        if n and s and e and w:
+            return "┼"
+        elif n and s and e:
+            return "├"
+        elif n and s and w:
+            return "┤"
+        elif n and e and w:
+            return "┴"
+        elif s and e and w:
+            return "┬"
+        elif n and e:
+            return "╰"
+        elif n and w:
+            return "╯"
+        elif s and e:
+            return "╭"
+        elif s and w:
+            return "╮"
+        elif n and s:
+            return "│"
+        elif e and w:
+            return "─"
+        elif n:
+            return "│"
+        elif s:
+            return "│"
+        elif e:
+            return "─"
+        elif w:
+            return "─"
+        else:
+            return "─"
+    return None
+
+
+_WALL_GLYPHS: dict[str, dict[tuple[bool, bool, bool, bool], str]] = {
+    style: {
+        (n, s, e, w): _wall_glyph(n, s, e, w, style)
+        for n in (False, True)
+        for s in (False, True)
+        for e in (False, True)
+        for w in (False, True)
+    }
+    for style in ("single", "double", "rounded")
+}
+
+
+# marks an empty cell in an encoded chunk row
+_EMPTY_CELL = "\x00"
+
+
+class ChunkedGrid(MutableMapping):
+    """
+    sparse map layer split into fixed-size square chunks, used for MapInfo.pre_grid and post_grid.
+    this behaves like a dict[tuple[int, int], str] so existing code can keep doing
+    grid[(x, y)] = char.
+
+    chunks are only allocated when a cell inside them is set. chunks loaded from disk are kept
+    encoded (one string per row) until something touches them, so big areas load fast and only
+    the chunks near listeners get decoded.
+    this is not thread-safe on its own, access it while holding the owning MapInfo's lock.
+    """
+
+    def __init__(self, cells: dict[tuple[int, int], str] | None = None, size: int | None = None):
+        self.size: int = size if size else settings.MAP_CHUNK_SIZE
+        # key = chunk coord, value = list of rows, each row is a list of cells (None = empty)
+        self.chunks: dict[tuple[int, int], list[list[str | None]]] = {}
+        # chunks which haven't been decoded yet, see _encode_chunk()
+        self.encoded: dict[tuple[int, int], list[str] | dict[str, str]] = {}
+        # chunks shared with a copy of this grid, they must be copied before they're written to
+        self.shared: set[tuple[int, int]] = set()
+        # chunks changed since the last pop_dirty(), used to only re-render what changed
+        self.dirty: set[tuple[int, int]] = set()
+        # key = chunk coord, value = (min_x, max_x, min_y, max_y) of the cells in that chunk
+        self.bounds_cache: dict[tuple[int, int], tuple[int, int, int, int] | None] = {}
+        self.count = 0
+        if cells:
+            self.update(cells)
+
+    def chunk_key(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.size, y // self.size
+
+    def _decode_chunk(self, data: list[str] | dict[str, str]) -> list[list[str | None]]:
+        size = self.size
+        rows = [[None] * size for _ in range(size)]
+        if isinstance(data, dict):
+            for k, v in data.items():
+                lx, ly = k.split(",")
+                rows[int(ly)][int(lx)] = v
+        else:
+            for ly, line in enumerate(data):
+                row = rows[ly]
+                for lx, char in enumerate(line):
+                    if char != _EMPTY_CELL:
+                        row[lx] = char
+        return rows
+
+    @staticmethod
+    def _encode_chunk(rows: list[list[str | None]]) -> list[str] | dict[str, str]:
+        """
+        chunks where every cell is a single character are stored as one string per row,
+        anything else (i.e. ANSI colored symbols) falls back to a sparse dict of 'x,y': value
+        """
+        if all(v is None or (len(v) == 1 and v != _EMPTY_CELL) for row in rows for v in row):
+            lines = [
+                "".join(_EMPTY_CELL if v is None else v for v in row).rstrip(_EMPTY_CELL)
+                for row in rows
+            ]
+            while lines and not lines[-1]:
+                lines.pop()
+            return lines
+        return {
+            f"{lx},{ly}": v
+            for ly, row in enumerate(rows)
+            for lx, v in enumerate(row)
+            if v is not None
+        }
+
+    @staticmethod
+    def _count_cells(data: list[list[str | None]] | list[str] | dict[str, str] | None) -> int:
+        if not data:
+            return 0
+        if isinstance(data, dict):
+            return len(data)
+        if isinstance(data[0], str):
+            return sum(len(line) - line.count(_EMPTY_CELL) for line in data)
+        return sum(1 for row in data for v in row if v is not None)
+
+    def _chunk(
+        self, key: tuple[int, int], create=False, write=False
+    ) -> list[list[str | None]] | None:
+        rows = self.chunks.get(key)
+        if rows is None:
+            data = self.encoded.pop(key, None)
+            if data is not None:
+                rows = self._decode_chunk(data)
+                self.chunks[key] = rows
+            elif create:
+                rows = [[None] * self.size for _ in range(self.size)]
+                self.chunks[key] = rows
+        elif write and key in self.shared:
+            rows = [row[:] for row in rows]
+            self.chunks[key] = rows
+            self.shared.discard(key)
+        return rows
+
+    def _mark_dirty(self, x: int, y: int):
+        # placeholders are rendered based on their neighbors, so a change on the edge of a chunk
+        # can change how the neighboring chunk renders
+        size = self.size
+        self.dirty.add((x // size, y // size))
+        self.dirty.add(((x + 1) // size, y // size))
+        self.dirty.add(((x - 1) // size, y // size))
+        self.dirty.add((x // size, (y + 1) // size))
+        self.dirty.add((x // size, (y - 1) // size))
+
+    def __getitem__(self, coord: tuple[int, int]) -> str:
+        x, y = coord
+        size = self.size
+        rows = self._chunk((x // size, y // size))
+        if rows is not None:
+            v = rows[y % size][x % size]
+            if v is not None:
+                return v
+        raise KeyError(coord)
+
+    def get(self, coord: tuple[int, int], default=None):
+        x, y = coord
+        size = self.size
+        rows = self._chunk((x // size, y // size))
+        if rows is None:
+            return default
+        v = rows[y % size][x % size]
+        return default if v is None else v
+
+    def __contains__(self, coord) -> bool:
+        return self.get(coord) is not None
+
+    def __setitem__(self, coord: tuple[int, int], value: str):
+        x, y = coord
+        key = (x // self.size, y // self.size)
+        row = self._chunk(key, True, True)[y % self.size]
+        if row[x % self.size] is None:
+            self.count += 1
+        row[x % self.size] = value
+        self.bounds_cache.pop(key, None)
+        self._mark_dirty(x, y)
+
+    def __delitem__(self, coord: tuple[int, int]):
+        x, y = coord
+        key = (x // self.size, y // self.size)
+        if self._chunk(key) is None or self.get(coord) is None:
+            raise KeyError(coord)
+        self._chunk(key, write=True)[y % self.size][x % self.size] = None
+        self.count -= 1
+        self.bounds_cache.pop(key, None)
+        self._mark_dirty(x, y)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def items(self):
+        size = self.size
+        for key in self.chunk_keys():
+            rows = self._chunk(key)
+            if rows is None:
+                continue
+            base_x = key[0] * size
+            base_y = key[1] * size
+            for ly, row in enumerate(rows):
+                for lx, v in enumerate(row):
+                    if v is not None:
+                        yield (base_x + lx, base_y + ly), v
+
+    def chunk_keys(self) -> list[tuple[int, int]]:
+        return list(self.chunks.keys()) + list(self.encoded.keys())
+
+    def get_chunk(self, key: tuple[int, int]) -> list[list[str | None]] | None:
+        """returns the rows of a chunk, don't modify them, use set_chunk() instead"""
+        return self._chunk(key)
+
+    def set_chunk(self, key: tuple[int, int], rows: list[list[str | None]] | None):
+        """replace a whole chunk, None removes it"""
+        self.count -= self._count_cells(self.chunks.get(key) or self.encoded.get(key))
+        self.chunks.pop(key, None)
+        self.encoded.pop(key, None)
+        self.shared.discard(key)
+        self.bounds_cache.pop(key, None)
+        if rows is not None:
+            self.chunks[key] = rows
+            self.count += self._count_cells(rows)
+
+    def pop_dirty(self) -> set[tuple[int, int]]:
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+    def mark_all_dirty(self):
+        self.dirty.update(self.chunk_keys())
+
+    def decode(self, keys: set[tuple[int, int]] | None = None):
+        """
+        decode encoded chunks now instead of on first use. decoding before copy() means the copy
+        shares the decoded rows instead of decoding its own
+        Args:
+            keys (set[tuple[int, int]], optional): chunks to decode. Defaults to None (all).
+        """
+        if keys is None:
+            keys = list(self.encoded.keys())
+        for key in keys:
+            data = self.encoded.pop(key, None)
+            if data is not None:
+                self.chunks[key] = self._decode_chunk(data)
+
+    def copy(self) -> ChunkedGrid:
+        """
+        cheap copy, chunks are shared until either grid writes to them (copy-on-write)
+        """
+        new = ChunkedGrid(size=self.size)
+        new.chunks = self.chunks.copy()
+        new.encoded = self.encoded.copy()
+        new.bounds_cache = self.bounds_cache.copy()
+        new.count = self.count
+        new.shared = set(self.chunks.keys())
+        self.shared.update(self.chunks.keys())
+        return new
+
+    def evict(self, keep: set[tuple[int, int]]):
+        """
+        re-encode decoded chunks that aren't in keep, to free the memory of chunks nobody is
+        looking at
+        """
+        for key in [k for k in self.chunks.keys() if k not in keep]:
+            rows = self.chunks.pop(key)
+            self.shared.discard(key)
+            if self._count_cells(rows):
+                self.encoded[key] = self._encode_chunk(rows)
+
+    def chunk_bounds(self, key: tuple[int, int]) -> tuple[int, int, int, int] | None:
+        if key in self.bounds_cache:
+            return self.bounds_cache[key]
+        rows = self._chunk(key)
+        bounds = None
+        if rows is not None:
+            xs = [lx for row in rows for lx, v in enumerate(row) if v is not None]
+            if xs:
+                ys = [ly for ly, row in enumerate(rows) if any(v is not None for v in row)]
+                base_x = key[0] * self.size
+                base_y = key[1] * self.size
+                bounds = (base_x + min(xs), base_x + max(xs), base_y + min(ys), base_y + max(ys))
+        self.bounds_cache[key] = bounds
+        return bounds
+
+    def render(
+        self,
+        window: set[tuple[int, int]] | None = None,
+        mask: dict[tuple[int, int], bytearray] | None = None,
+    ) -> tuple[str, int, int]:
+        """
+        renders the grid into a string, chunk by chunk
+        Args:
+            window (set[tuple[int, int]], optional): only render these chunks.
+                Defaults to None (all chunks).
+            mask (dict[tuple[int, int], bytearray], optional): bitsets of cells to show, keyed by
+                chunk coord, see ExploredCells. must use the same chunk size as this grid.
+                Defaults to None (show everything).
+        Returns: tuple of (rendered_string, min_x, max_y)
+        """
+        keys = self.chunk_keys()
+        if window is not None:
+            keys = [k for k in keys if k in window]
+        if mask is not None:
+            keys = [k for k in keys if k in mask]
+        bounds = [b for k in keys if (b := self.chunk_bounds(k))]
+        if not bounds:
+            return "", 0, 0
+        min_x = min(b[0] for b in bounds)
+        max_x = max(b[1] for b in bounds)
+        min_y = min(b[2] for b in bounds)
+        max_y = max(b[3] for b in bounds)
+        keys = set(keys)
+        size = self.size
+        lines = []
+        for y in range(max_y, min_y - 1, -1):
+            cy, ly = divmod(y, size)
+            parts = []
+            for cx in range(min_x // size, max_x // size + 1):
+                start = max(min_x, cx * size) - cx * size
+                end = min(max_x, cx * size + size - 1) - cx * size + 1
+                rows = self._chunk((cx, cy)) if (cx, cy) in keys else None
+                if rows is None:
+                    parts.append(" " * (end - start))
+                elif mask is None:
+                    parts.append("".join(" " if v is None else v for v in rows[ly][start:end]))
+                else:
+                    bits = mask[(cx, cy)]
+                    i = ly * size + start
+                    parts.append(
+                        "".join(
+                            v if v is not None and bits[n >> 3] & (1 << (n & 7)) else " "
+                            for n, v in enumerate(rows[ly][start:end], i)
+                        )
+                    )
+            lines.append("".join(parts))
+        return "\n".join(lines), min_x, max_y
+
+    def __getstate__(self):
+        chunks = {f"{k[0]},{k[1]}": v for k, v in self.encoded.items()}
+        for k, rows in self.chunks.items():
+            if self._count_cells(rows):
+                chunks[f"{k[0]},{k[1]}"] = self._encode_chunk(rows)
+        return {"size": self.size, "chunks": chunks}
+
+    def __setstate__(self, state):
+        self.__init__(size=state["size"])
+        for k, v in state["chunks"].items():
+            cx, cy = k.split(",")
+            self.encoded[(int(cx), int(cy))] = v
+            self.count += self._count_cells(v)
+
+    @staticmethod
+    def from_state(state: dict[str, Any] | None) -> ChunkedGrid:
+        """
+        load a grid saved by __getstate__(), or an old style flat grid of {'(x, y)': char}
+        """
+        grid = ChunkedGrid()
+        if state and "chunks" in state:
+            grid.__setstate__(state)
+        elif state:
+            grid.update({str_to_tuple(k): v for k, v in state.items()})
+            grid.dirty.clear()
+        return grid
+
+
+class ExploredCells:
+    """
+    the map cells a character has explored, used for fog of war.
+    cells are stored as one bitset per map chunk (512 bytes for a 64x64 chunk) and chunks are only
+    allocated once the character has seen part of them, so even big maps cost very little.
+    """
+
+    def __init__(self, size: int | None = None) -> None:
+        self.size: int = size if size else settings.MAP_CHUNK_SIZE
+        # key = (area, z), value = {chunk coord: bitset}
+        self.maps: dict[tuple[str, int], dict[tuple[int, int], bytearray]] = {}
+
+    def reveal(self, coord: tuple[str, int, int, int], radius: int):
+        """
+        mark every cell within radius of coord as explored
+        """
+        area, x, y, z = coord
+        size = self.size
+        chunks = self.maps.get((area, z))
+        if chunks is None:
+            chunks = {}
+            self.maps[(area, z)] = chunks
+        for cy in range(y - radius, y + radius + 1):
+            for cx in range(x - radius, x + radius + 1):
+                if (cx - x) ** 2 + (cy - y) ** 2 > radius * radius:
+                    continue
+                key = (cx // size, cy // size)
+                bits = chunks.get(key)
+                if bits is None:
+                    bits = bytearray((size * size + 7) // 8)
+                    chunks[key] = bits
+                i = (cy % size) * size + cx % size
+                bits[i >> 3] |= 1 << (i & 7)
+
+    def is_explored(self, area: str, x: int, y: int, z: int) -> bool:
+        chunks = self.maps.get((area, z))
+        if not chunks:
+            return False
+        bits = chunks.get((x // self.size, y // self.size))
+        if bits is None:
+            return False
+        i = (y % self.size) * self.size + x % self.size
+        return bool(bits[i >> 3] & (1 << (i & 7)))
+
+    def get_mask(self, area: str, z: int) -> dict[tuple[int, int], bytearray]:
+        """returns the explored bitsets for a map, keyed by chunk coord"""
+        return self.maps.get((area, z), {})
+
+    def __getstate__(self):
+        return {
+            "size": self.size,
+            "maps": {
+                tuple_to_str(k): {
+                    f"{c[0]},{c[1]}": base64.b64encode(bits).decode("utf-8")
+                    for c, bits in chunks.items()
+                }
+                for k, chunks in self.maps.items()
+            },
+        }
+
+    def __setstate__(self, state):
+        self.size = state["size"]
+        self.maps = {}
+        for k, chunks in state["maps"].items():
+            restored = {}
+            for c, bits in chunks.items():
+                cx, cy = c.split(",")
+                restored[(int(cx), int(cy))] = bytearray(base64.b64decode(bits))
+            self.maps[str_to_tuple(k)] = restored
+
+
 class LegendEntry:
     """
     this is for adding information about environment symbols on the map.
@@ -61,43 +587,78 @@ class MapInfo:
         self.name = name
         self.map_changed = True
         # pre_grid holds wall, road, and path placeholders
-        self.pre_grid: dict[tuple[int, int], str] = pre_grid if pre_grid else {}
+        self.pre_grid = pre_grid
         # post_grid is the grid after rendering the placeholders
-        self.post_grid: dict[tuple[int, int], str] = post_grid if post_grid else {}
+        self.post_grid = post_grid
         self.legend_entries: list[LegendEntry] = legend_entries if legend_entries else []
         self.objects: dict[int, Object] = {}
         self.listeners: dict[int, Object] = {}
-        self.lock = RLock()
+        self._reset_legend()
+        self.lock = new_lock(self)
+
+    def _reset_legend(self):
+        # the legend is rebuilt at runtime, none of this is saved
+        self.legend: tuple[tuple[str, str, tuple[int, int]], ...] = ()
+        # key = object id, value = index of its entry in self.legend
+        self.legend_index: dict[int, int] = {}
+        self.legend_version = 0
+        self.legend_builds = 0
+        self.legend_built = 0
+        # key = listener id, value = legend_version last sent to them
+        self.legend_sent: dict[int, int] = {}
+
+    @property
+    def pre_grid(self) -> ChunkedGrid:
+        return self._pre_grid
+
+    @pre_grid.setter
+    def pre_grid(self, value: dict[tuple[int, int], str] | None):
+        self._pre_grid = value if isinstance(value, ChunkedGrid) else ChunkedGrid(value)
+
+    @property
+    def post_grid(self) -> ChunkedGrid:
+        return self._post_grid
+
+    @post_grid.setter
+    def post_grid(self, value: dict[tuple[int, int], str] | None):
+        self._post_grid = value if isinstance(value, ChunkedGrid) else ChunkedGrid(value)
 
     def __getstate__(self):
         state = self.__dict__.copy()
         del state["lock"]
         del state["objects"]
         del state["listeners"]
+        del state["_pre_grid"]
+        del state["_post_grid"]
+        # the legend is rebuilt at runtime
+        for k in (
+            "legend",
+            "legend_index",
+            "legend_version",
+            "legend_builds",
+            "legend_built",
+            "legend_sent",
+        ):
+            del state[k]
         state["__import_path__"] = get_import_path(self)
         if self.legend_entries:
             entries = []
             for entry in self.legend_entries:
                 entries.append(entry.__getstate__())
             state["legend_entries"] = entries
-        if self.pre_grid:
-            pre_grid = {}
-            for k, v in self.pre_grid.items():
-                pre_grid[tuple_to_str(k)] = v
-            state["pre_grid"] = pre_grid
-        if self.post_grid:
-            post_grid = {}
-            for k, v in self.post_grid.items():
-                post_grid[tuple_to_str(k)] = v
-            state["post_grid"] = post_grid
-
+        with self.lock:
+            state["pre_grid"] = self.pre_grid.__getstate__()
+            state["post_grid"] = self.post_grid.__getstate__()
         return state
 
     def __setstate__(self, state):
+        pre_grid = state.pop("pre_grid", None)
+        post_grid = state.pop("post_grid", None)
         self.__dict__.update(state)
-        self.lock = RLock()
+        self.lock = new_lock(self)
         self.objects: dict[int, Object] = {}
         self.listeners: dict[int, Object] = {}
+        self._reset_legend()
         if state.get("legend_entries"):
             entries = []
             for entry_state in state["legend_entries"]:
@@ -107,16 +668,11 @@ class MapInfo:
             self.legend_entries = entries
         else:
             self.legend_entries = []
-        if state.get("pre_grid"):
-            pre_grid = {}
-            for k, v in state["pre_grid"].items():
-                pre_grid[str_to_tuple(k)] = v
-            self.pre_grid = pre_grid
-        if state.get("post_grid"):
-            post_grid = {}
-            for k, v in state["post_grid"].items():
-                post_grid[str_to_tuple(k)] = v
-            self.post_grid = post_grid
+        self.pre_grid = ChunkedGrid.from_state(pre_grid)
+        self.post_grid = ChunkedGrid.from_state(post_grid)
+        if self.pre_grid and not self.post_grid:
+            # never rendered before it was saved
+            self.pre_grid.mark_all_dirty()
 
     def place_walls(self, coord: tuple[int, int], char: str):
         """
@@ -134,14 +690,24 @@ class MapInfo:
         self.map_changed = True
 
     @staticmethod
-    def render_grid(grid: dict[tuple[int, int], str]):
+    def render_grid(
+        grid: dict[tuple[int, int], str],
+        window: set[tuple[int, int]] | None = None,
+        mask: dict[tuple[int, int], bytearray] | None = None,
+    ):
         """
         renders the grid into a string
+        Args:
+            grid (dict[tuple[int, int], str]): grid to render
+            window (set[tuple[int, int]], optional): for chunked grids, only render these chunks.
+            mask (dict[tuple[int, int], bytearray], optional): for chunked grids, fog of war mask.
         Returns: tuple of (rendered_string, min_x, max_y)
         """
         if not grid:
             print("grid is empty")
             return "", 0, 0
+        if isinstance(grid, ChunkedGrid):
+            return grid.render(window, mask)
         keys = grid.keys()
         min_x = min(k[0] for k in keys)
         max_x = max(k[0] for k in keys)
@@ -186,179 +752,188 @@ class MapInfo:
         """
         if not grid:
             return {}
+        glyphs = _WALL_GLYPHS.get(style)
+        if not glyphs:
+            return grid
         to_place = {}
         for k, v in grid.items():
             if v == char:
-                n, s, e, w = MapInfo.get_dirs(grid, k, char)
-                if style == "single":
-                    if n and s and e and w:
-                        to_place[k] = "┼"
-                    elif n and s and e:
-                        to_place[k] = "├"
-                    elif n and s and w:
-                        to_place[k] = "┤"
-                    elif n and e and w:
-                        to_place[k] = "┴"
-                    elif s and e and w:
-                        to_place[k] = "┬"
-                    elif n and e:
-                        to_place[k] = "└"
-                    elif n and w:
-                        to_place[k] = "┘"
-                    elif s and e:
-                        to_place[k] = "┌"
-                    elif s and w:
-                        to_place[k] = "┐"
-                    elif n and s:
-                        to_place[k] = "│"
-                    elif e and w:
-                        to_place[k] = "─"
-                    elif n:
-                        to_place[k] = "│"
-                    elif s:
-                        to_place[k] = "│"
-                    elif e:
-                        to_place[k] = "─"
-                    elif w:
-                        to_place[k] = "─"
-                    else:
-                        to_place[k] = "─"
-                elif style == "double":
-                    if n and s and e and w:
-                        to_place[k] = "╬"
-                    elif n and s and e:
-                        to_place[k] = "╠"
-                    elif n and s and w:
-                        to_place[k] = "╣"
-                    elif n and e and w:
-                        to_place[k] = "╩"
-                    elif s and e and w:
-                        to_place[k] = "╦"
-                    elif n and e:
-                        to_place[k] = "╚"
-                    elif n and w:
-                        to_place[k] = "╝"
-                    elif s and e:
-                        to_place[k] = "╔"
-                    elif s and w:
-                        to_place[k] = "╗"
-                    elif n and s:
-                        to_place[k] = "║"
-                    elif e and w:
-                        to_place[k] = "═"
-                    elif n:
-                        to_place[k] = "║"
-                    elif s:
-                        to_place[k] = "║"
-                    elif e:
-                        to_place[k] = "═"
-                    elif w:
-                        to_place[k] = "═"
-                    else:
-                        to_place[k] = "═"
-                elif style == "rounded":
-                    if n and s and e and w:
-                        to_place[k] = "┼"
-                    elif n and s and e:
-                        to_place[k] = "├"
-                    elif n and s and w:
-                        to_place[k] = "┤"
-                    elif n and e and w:
-                        to_place[k] = "┴"
-                    elif s and e and w:
-                        to_place[k] = "┬"
-                    elif n and e:
-                        to_place[k] = "╰"
-                    elif n and w:
-                        to_place[k] = "╯"
-                    elif s and e:
-                        to_place[k] = "╭"
-                    elif s and w:
-                        to_place[k] = "╮"
-                    elif n and s:
-                        to_place[k] = "│"
-                    elif e and w:
-                        to_place[k] = "─"
-                    elif n:
-                        to_place[k] = "│"
-                    elif s:
-                        to_place[k] = "│"
-                    elif e:
-                        to_place[k] = "─"
-                    elif w:
-                        to_place[k] = "─"
-                    else:
-                        to_place[k] = "─"
+                to_place[k] = glyphs[MapInfo.get_dirs(grid, k, char)]
         grid.update(to_place)
         return grid
 
     def pre_render(self):
+        """
+        renders the placeholders in pre_grid into post_grid.
+        only chunks which changed since the last pre_render are rendered again.
+        """
+        styles = {
+            settings.SINGLE_WALL_PLACEHOLDER: _WALL_GLYPHS["single"],
+            settings.DOUBLE_WALL_PLACEHOLDER: _WALL_GLYPHS["double"],
+            settings.ROUNDED_WALL_PLACEHOLDER: _WALL_GLYPHS["rounded"],
+            settings.PATH_PLACEHOLDER: _WALL_GLYPHS["rounded"],
+            settings.ROAD_PLACEHOLDER: _WALL_GLYPHS["double"],
+        }
         with self.lock:
-            rendered = copy.deepcopy(self.pre_grid)
-        MapInfo.render_char(rendered, settings.SINGLE_WALL_PLACEHOLDER, "single")
-        MapInfo.render_char(rendered, settings.DOUBLE_WALL_PLACEHOLDER, "double")
-        MapInfo.render_char(rendered, settings.ROUNDED_WALL_PLACEHOLDER, "rounded")
-        MapInfo.render_char(rendered, settings.PATH_PLACEHOLDER, "rounded")
-        MapInfo.render_char(rendered, settings.ROAD_PLACEHOLDER, "double")
-        rooms = []
-        for k, v in rendered.items():
-            if v == settings.ROOM_PLACEHOLDER:
-                rooms.append(k)
-        for room in rooms:
-            rendered[room] = " "
-        with self.lock:
-            # print("rendered = ", rendered)
-            self.post_grid = rendered
+            pre_grid = self.pre_grid
+            size = pre_grid.size
+            if self.post_grid.size != size:
+                self.post_grid = ChunkedGrid(size=size)
+                pre_grid.mark_all_dirty()
+            for key in pre_grid.pop_dirty():
+                rows = pre_grid.get_chunk(key)
+                if rows is None:
+                    self.post_grid.set_chunk(key, None)
+                    continue
+                base_x = key[0] * size
+                base_y = key[1] * size
+                rendered = []
+                for ly, row in enumerate(rows):
+                    out = row[:]
+                    for lx, v in enumerate(row):
+                        if v is None:
+                            continue
+                        if v == settings.ROOM_PLACEHOLDER:
+                            out[lx] = " "
+                        elif glyphs := styles.get(v):
+                            out[lx] = glyphs[
+                                MapInfo.get_dirs(pre_grid, (base_x + lx, base_y + ly), v)
+                            ]
+                    rendered.append(out)
+                self.post_grid.set_chunk(key, rendered)
+
+    def get_window(self, listener: Object) -> set[tuple[int, int]] | None:
+        """
+        returns the chunks of this map which are rendered for a listener, None means the whole map
+        """
+        loc: Node | None = listener.location
+        if settings.MAP_CHUNK_RADIUS is None or not loc or not loc.is_node:
+            return None
+        r = settings.MAP_CHUNK_RADIUS
+        cx, cy = self.post_grid.chunk_key(loc.coord[1], loc.coord[2])
+        return {(x, y) for x in range(cx - r, cx + r + 1) for y in range(cy - r, cy + r + 1)}
 
     def update_grid(self, coord: tuple[int, int], new_symbol: str):
         with self.lock:
             self.pre_grid[coord] = new_symbol
             self.map_changed = True
-        self.render(True)
+        get_map_handler().renderer.queue_render(self, True)
+
+    def build_legend(self) -> tuple[int, tuple[tuple[str, str, tuple[int, int]], ...]]:
+        """
+        builds the legend shared by every listener of this map, outside of the map lock.
+        the legend version only changes when the legend itself changes.
+        Returns: tuple of (legend_version, legend)
+        """
+        with self.lock:
+            self.legend_builds += 1
+            build = self.legend_builds
+            objects = list(self.objects.values())
+            legend_entries = list(self.legend_entries)
+        legend = []
+        index = {}
+        for o in objects:
+            loc: Node | None = o.location
+            if loc and loc.is_node:
+                index[o.id] = len(legend)
+                legend.append((o.symbol, o.name, (loc.coord[1], loc.coord[2])))
+        legend.extend([(e.symbol, e.desc, e.coord) for e in legend_entries])
+        legend = tuple(legend)
+        with self.lock:
+            # a newer build may have finished first, don't overwrite it with this one
+            if build > self.legend_built and legend != self.legend:
+                self.legend = legend
+                self.legend_index = index
+                self.legend_version += 1
+            self.legend_built = max(build, self.legend_built)
+            return self.legend_version, self.legend
+
+    def legend_for(self, listener: Object) -> list[tuple[str, str, tuple[int, int]]]:
+        """
+        the shared legend minus the listener's own entry
+        """
+        with self.lock:
+            legend = self.legend
+            i = self.legend_index.get(listener.id)
+        if i is None:
+            return list(legend)
+        return [*legend[:i], *legend[i + 1 :]]
+
+    def get_fog(self, listener: Object) -> dict[tuple[int, int], bytearray] | None:
+        """
+        the listener's explored cells on this map, None if fog of war doesn't apply to them
+        """
+        if not settings.FOG_OF_WAR:
+            return None
+        explored = getattr(listener, "explored", None)
+        if explored is None or explored.size != self.post_grid.size:
+            return None
+        loc = listener.location
+        if not loc or not loc.is_node:
+            return None
+        return explored.get_mask(loc.coord[0], loc.coord[3])
+
+    def fogged_legend(
+        self, listener: Object, legend: list[tuple[str, str, tuple[int, int]]]
+    ) -> list[tuple[str, str, tuple[int, int]]]:
+        """
+        drop legend entries for cells the listener hasn't explored
+        """
+        if not settings.FOG_OF_WAR:
+            return legend
+        explored = getattr(listener, "explored", None)
+        if explored is None:
+            return legend
+        loc = listener.location
+        if not loc or not loc.is_node:
+            return legend
+        area, z = loc.coord[0], loc.coord[3]
+        return [e for e in legend if explored.is_explored(area, e[2][0], e[2][1], z)]
 
     def render_legend(self):
+        version, legend = self.build_legend()
+        if len(legend) > settings.MAX_OBJECTS_PER_LEGEND:
+            return
         with self.lock:
-            if len(self.objects) + len(self.legend_entries) > settings.MAX_OBJECTS_PER_LEGEND:
-                return
-            for l in self.listeners.values():
-                entries = [
-                    (o.symbol, o.name, (o.location.coord[1], o.location.coord[2]))
-                    for o in self.objects.values()
-                    if o.id != l.id
-                ]
-                entries.extend([(e.symbol, e.desc, e.coord) for e in self.legend_entries])
-                l.at_legend_update(entries, self.name)
+            listeners = [
+                l for l in self.listeners.values() if self.legend_sent.get(l.id) != version
+            ]
+            for l in listeners:
+                self.legend_sent[l.id] = version
+        for l in listeners:
+            l.at_legend_update(self.fogged_legend(l, self.legend_for(l)), True, self.name)
 
     def render(self, force=False):
         if force or self.map_changed:
             if self.pre_grid:
                 self.pre_render()
             self.map_changed = False
+        version, legend = self.build_legend()
+        show_legend = len(legend) <= settings.MAX_OBJECTS_PER_LEGEND
         t = time.time()
+        frames = []
         with self.lock:
-            show_legend = True
-            if len(self.objects) + len(self.legend_entries) > settings.MAX_OBJECTS_PER_LEGEND:
-                show_legend = False
             for l in self.listeners.values():
-                entries = [
-                    (o.symbol, o.name, (o.location.coord[1], o.location.coord[2]))
-                    for o in self.objects.values()
-                    if o.id != l.id
-                ]
-                entries.extend([(e.symbol, e.desc, e.coord) for e in self.legend_entries])
-                grid_copy = self.post_grid.copy()
-                # grid_copy = copy.deepcopy(self.post_grid)
-                # l.at_legend_update(list(mapables.values()) + legend_entries)
                 last_map_time = l.last_map_time
-                if last_map_time:
-                    if t - last_map_time > 1 / settings.MAP_FPS_LIMIT or force:
-                        grid_copy = l.at_pre_map_render(grid_copy)
-                        map_str, min_x, max_y = MapInfo.render_grid(grid_copy)
-                        l.at_map_update(map_str, entries, min_x, max_y, show_legend, self.name)
-                else:
-                    grid_copy = l.at_pre_map_render(grid_copy)
-                    map_str, min_x, max_y = MapInfo.render_grid(grid_copy)
-                    l.at_map_update(map_str, entries, min_x, max_y, show_legend, self.name)
+                if last_map_time and not force and t - last_map_time <= 1 / settings.MAP_FPS_LIMIT:
+                    continue
+                window = self.get_window(l)
+                # decode into the live grid so it stays hot and the copies share the decoded rows
+                self.post_grid.decode(window)
+                frames.append((l, self.post_grid.copy(), window))
+                self.legend_sent[l.id] = version
+        # everything per listener, including sending, happens outside the lock
+        for l, grid_copy, window in frames:
+            grid_copy = l.at_pre_map_render(grid_copy)
+            map_str, min_x, max_y = MapInfo.render_grid(grid_copy, window, self.get_fog(l))
+            l.at_map_update(
+                map_str,
+                self.fogged_legend(l, self.legend_for(l)),
+                min_x,
+                max_y,
+                show_legend,
+                self.name,
+            )
 
     def add_legend_entry(self, entry: LegendEntry):
         with self.lock:
@@ -373,25 +948,175 @@ class MapInfo:
     def add_listener(self, listener: Object):
         with self.lock:
             self.listeners[listener.id] = listener
+            self.legend_sent.pop(listener.id, None)
 
     def remove_listener(self, listener: Object):
         with self.lock:
             self.listeners.pop(listener.id, None)
+            self.legend_sent.pop(listener.id, None)
 
-    def add_mapable(self, mapable: Object):
+    def evict(self):
+        """
+        re-encode the chunks none of the listeners can see, to free their memory.
+        this can take a while on big maps, queue it with MapRenderer.queue_evict instead of
+        calling it from a command.
+        """
+        if settings.MAP_CHUNK_RADIUS is None:
+            return
+        with self.lock:
+            keep = set()
+            for l in self.listeners.values():
+                keep.update(self.get_window(l) or ())
+            self.pre_grid.evict(keep)
+            self.post_grid.evict(keep)
+
+    def add_mapable(self, mapable: Object, update=True):
+        """
+        Args:
+            mapable (Object): object to show on this map
+            update (bool, optional): send the new legend to listeners right away. Defaults to True.
+        """
         with self.lock:
             self.objects[mapable.id] = mapable
-        self.render_legend()
+        if update:
+            self.render_legend()
 
-    def remove_mapable(self, mapable: Object):
+    def remove_mapable(self, mapable: Object, update=True):
         with self.lock:
             self.objects.pop(mapable.id, None)
-        self.render_legend()
+        if update:
+            self.render_legend()
 
-    def add_mapable_list(self, mapables: list[Object]):
+    def add_mapable_list(self, mapables: list[Object], update=True):
         with self.lock:
             self.objects.update(dict([(m.id, m) for m in mapables]))
-        self.render_legend()
+        if update:
+            self.render_legend()
+
+
+class MapRenderer:
+    """
+    renders maps on a thread of its own so moving doesn't wait on frames being sent to every
+    listener in the area.
+    changes to a map which is already waiting to be rendered are merged into that render, and
+    there's only one render thread, so updates for a map always go out in the order they were made.
+    """
+
+    # what a queued map needs, a map render includes the legend
+    LEGEND = 1
+    MAP = 2
+    FORCE = 4
+    EVICT = 8
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.queue: queue.Queue[MapInfo | None] = queue.Queue()
+        # id(MapInfo) -> (MapInfo, flags) for maps waiting to be rendered
+        self.pending: dict[int, tuple[MapInfo, int]] = {}
+        self.thread: Thread | None = None
+        # instrumentation
+        self.queued = 0
+        self.merged = 0
+        self.rendered = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """number of maps waiting to be rendered"""
+        with self.lock:
+            return len(self.pending)
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "depth": len(self.pending),
+                "max_depth": self.max_depth,
+                "queued": self.queued,
+                "merged": self.merged,
+                "rendered": self.rendered,
+            }
+
+    def stop(self):
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread:
+            self.queue.put(None)
+
+    def flush(self):
+        """
+        wait for every queued map to be rendered
+        """
+        self.queue.join()
+
+    def queue_render(self, mapinfo: MapInfo, force=False):
+        """
+        render a map and send it to its listeners
+        Args:
+            mapinfo (MapInfo): map to render
+            force (bool, optional): same as MapInfo.render(force). Defaults to False.
+        """
+        self._queue(mapinfo, self.MAP | self.FORCE if force else self.MAP)
+
+    def queue_legend(self, mapinfo: MapInfo):
+        """
+        send a map's legend to its listeners
+        """
+        self._queue(mapinfo, self.LEGEND)
+
+    def queue_evict(self, mapinfo: MapInfo):
+        """
+        free the chunks of a map that its listeners can't see, see MapInfo.evict
+        """
+        if not settings.MAP_RENDER_THREAD:
+            # still not on the caller's thread
+            get_async_threadpool().add_background_task(mapinfo.evict)
+            return
+        self._queue(mapinfo, self.EVICT)
+
+    def _queue(self, mapinfo: MapInfo, flags: int):
+        if not settings.MAP_RENDER_THREAD:
+            self._render(mapinfo, flags)
+            return
+        key = id(mapinfo)
+        with self.lock:
+            self.queued += 1
+            entry = self.pending.get(key)
+            if entry:
+                self.pending[key] = (mapinfo, entry[1] | flags)
+                self.merged += 1
+                return
+            self.pending[key] = (mapinfo, flags)
+            if len(self.pending) > self.max_depth:
+                self.max_depth = len(self.pending)
+            if not self.thread:
+                self.thread = Thread(target=self._work_loop, daemon=True, name="MapRenderer")
+                self.thread.start()
+        self.queue.put(mapinfo)
+
+    def _render(self, mapinfo: MapInfo, flags: int):
+        if flags & self.MAP:
+            mapinfo.render(bool(flags & self.FORCE))
+        elif flags & self.LEGEND:
+            mapinfo.render_legend()
+        if flags & self.EVICT:
+            mapinfo.evict()
+
+    def _work_loop(self):
+        while True:
+            mapinfo = self.queue.get()
+            if mapinfo is None:
+                self.queue.task_done()
+                break
+            with self.lock:
+                _, flags = self.pending.pop(id(mapinfo))
+            try:
+                self._render(mapinfo, flags)
+            except Exception:
+                logger.error(traceback.format_exc())
+            with self.lock:
+                self.rendered += 1
+            self.queue.task_done()
 
 
 def _load_file(filename: str) -> dict[str, Any]:
@@ -425,6 +1150,7 @@ class MapHandler:
         else:
             self.data: dict[tuple[str, int], MapInfo] = {}
         self.lock = RLock()
+        self.renderer = MapRenderer()
 
     def save(self):
         logger.info("Saving map data...")
@@ -451,13 +1177,13 @@ class MapHandler:
             with self.lock:
                 mi = self.data.get((loc.coord[0], loc.coord[3]))
             if mi:
-                mi.add_mapable(mapable)
-                mi.render()
+                mi.add_mapable(mapable, False)
+                self.renderer.queue_render(mi)
             else:
                 mi = MapInfo(name=loc.coord[0])
-                mi.add_mapable(mapable)
+                mi.add_mapable(mapable, False)
                 self.set_mapinfo(loc.coord[0], loc.coord[3], mi)
-                mi.render()
+                self.renderer.queue_render(mi)
 
     def add_listener(self, listener: Object):
         """
@@ -484,6 +1210,7 @@ class MapHandler:
                 mi = self.data.get((loc.coord[0], loc.coord[3]))
             if mi:
                 mi.remove_listener(listener)
+                self.renderer.queue_evict(mi)
 
     def move_listener(
         self,
@@ -503,6 +1230,9 @@ class MapHandler:
             self.set_mapinfo(to_coord[0], to_coord[3], to_map)
         if from_map:
             from_map.remove_listener(listener)
+            # moving around inside the same map doesn't leave anything to evict
+            if from_map is not to_map:
+                self.renderer.queue_evict(from_map)
         if to_map:
             to_map.add_listener(listener)
 
@@ -515,14 +1245,11 @@ class MapHandler:
         if from_coord and from_coord[0] == to_coord[0] and from_coord[3] == to_coord[3]:
             with self.lock:
                 current_map = self.data.get((to_coord[0], to_coord[3]))
-            if current_map:
-                current_map.add_mapable(mapable)
-                current_map.render(True)
-            else:
+            if not current_map:
                 current_map = MapInfo()
                 self.set_mapinfo(to_coord[0], to_coord[3], current_map)
-                current_map.add_mapable(mapable)
-                current_map.render(True)
+            current_map.add_mapable(mapable, False)
+            self.renderer.queue_render(current_map, True)
             return
         from_map = None
         with self.lock:
@@ -533,15 +1260,45 @@ class MapHandler:
             to_map = MapInfo()
             self.set_mapinfo(to_coord[0], to_coord[3], to_map)
         if from_map:
-            from_map.remove_mapable(mapable)
-            from_map.render(True)
+            from_map.remove_mapable(mapable, False)
+            self.renderer.queue_render(from_map, True)
         if to_map:
-            to_map.add_mapable(mapable)
-            to_map.render(True)
+            to_map.add_mapable(mapable, False)
+            self.renderer.queue_render(to_map, True)
+
+    def add_mapables(self, mapables: list[Object], to_coord: tuple[str, int, int, int]):
+        """
+        put a batch of mapables that just arrived at to_coord on its map, with one render
+        """
+        with self.lock:
+            to_map = self.data.get((to_coord[0], to_coord[3]))
+        if not to_map:
+            to_map = MapInfo(name=to_coord[0])
+            self.set_mapinfo(to_coord[0], to_coord[3], to_map)
+        to_map.add_mapable_list(mapables, False)
+        self.renderer.queue_render(to_map, True)
+
+    def remove_mapables(self, mapables: list[Object]):
+        """
+        take a batch of mapables off the maps of their current locations, with one legend
+        update per map
+        """
+        by_map: dict[tuple[str, int], list[Object]] = {}
+        for m in mapables:
+            loc = m.location
+            if loc and loc.is_node:
+                by_map.setdefault((loc.coord[0], loc.coord[3]), []).append(m)
+        for key, group in by_map.items():
+            with self.lock:
+                from_map = self.data.get(key)
+            if from_map:
+                for m in group:
+                    from_map.remove_mapable(m, False)
+                self.renderer.queue_legend(from_map)
 
     def remove_mapable(self, mapable: Object, from_area: str, from_z: int):
         with self.lock:
             from_map = self.data.get((from_area, from_z))
         if from_map:
-            from_map.remove_mapable(mapable)
-            from_map.render_legend()
+            from_map.remove_mapable(mapable, False)
+            self.renderer.queue_legend(from_map)
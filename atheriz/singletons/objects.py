@@ -2,6 +2,7 @@ from atheriz.singletons.get import set_id
 from atheriz.objects.persist import save
 from threading import Lock, RLock
 from atheriz.utils import get_import_path, instance_from_string
+from atheriz.singletons.fuzzy import NameIndex
 import atheriz.settings as settings
 from pathlib import Path
 import json
@@ -35,6 +36,10 @@ _ALL_OBJECTS_LOCK = RLock()
 _OBJECT_MAP = {}
 _OBJECT_MAP_LOCK = RLock()
 
+# fuzzy name index over everything in _ALL_OBJECTS, made the first time fuzzy_search is used
+# and kept up to date from then on
+_NAME_INDEX: NameIndex | None = None
+
 
 def filter_by(l: Callable[[Any], bool]) -> list[Any]:
     """Filter objects by a lambda.
@@ -73,6 +78,65 @@ def filter_by_type(import_path: str, l: Callable[[Any], bool]) -> list[Any]:
     return [r for r in results if l(r)]
 
 
+def get_name_index() -> NameIndex:
+    global _NAME_INDEX
+    if _NAME_INDEX is not None:
+        return _NAME_INDEX
+    with _ALL_OBJECTS_LOCK:
+        if _NAME_INDEX is not None:
+            return _NAME_INDEX
+        index = NameIndex()
+        objs = list(_ALL_OBJECTS.values())
+        # objects added from here on index themselves
+        _NAME_INDEX = index
+    # anything deleted while this runs can end up in the index, fuzzy_search skips missing ids
+    for obj in objs:
+        index.add(obj.name, obj.id)
+    return index
+
+
+def fuzzy_search(
+    name: str, max_distance: int = 2, limit: int = 10, l: Callable[[Any], bool] | None = None
+) -> list[tuple[int, Any]]:
+    """Find objects and accounts by name, allowing for typos.
+
+    For example:
+    ```python
+    fuzzy_search("goblni")  # [(2, <goblin>), ...]
+    fuzzy_search("bob", l=lambda x: x.is_account)
+    ```
+
+    Args:
+        name (str): The name to look for, case and extra spaces don't matter.
+        max_distance (int): The most edits (levenshtein distance) a match can be away.
+        limit (int): The most matches to return, 0 for all of them.
+        l (Callable[[Any], bool] | None): Only return matches this returns True for.
+
+    Returns:
+        list[tuple[int, Any]]: (distance, match), closest first.
+    """
+    index = get_name_index()
+    results = []
+    # filtered out matches don't count towards limit, so ask for everything if filtering
+    for d, id in index.search(name, max_distance, 0 if l else limit):
+        with _ALL_OBJECTS_LOCK:
+            obj = _ALL_OBJECTS.get(id)
+        if obj is None or (l and not l(obj)):
+            continue
+        results.append((d, obj))
+        if limit and len(results) >= limit:
+            break
+    return results
+
+
+def rename_object(obj: Any, old_name: str) -> None:
+    """Let the fuzzy name index know obj was renamed."""
+    index = _NAME_INDEX
+    if index is not None and obj.id in _ALL_OBJECTS:
+        index.remove(old_name, obj.id)
+        index.add(obj.name, obj.id)
+
+
 def get(ids: int | Iterable[int]) -> list[Any]:
     """Search for objects by ID.
 
@@ -120,17 +184,65 @@ def add_object(obj: object) -> None:
     path = get_import_path(obj)
     with _ALL_OBJECTS_LOCK:
         _ALL_OBJECTS[obj.id] = obj
+        index = _NAME_INDEX
+    if index is not None:
+        index.add(obj.name, obj.id)
     with _OBJECT_MAP_LOCK:
         s = _OBJECT_MAP.get(path, set())
         s.add(obj.id)
         _OBJECT_MAP[path] = s
 
 
+def add_objects(objs: Iterable[Any]) -> None:
+    """Add a batch of objects to the global object registry, taking each lock once."""
+    global _ALL_OBJECTS, _OBJECT_MAP
+    objs = list(objs)
+    by_path: dict[str, list[int]] = {}
+    for obj in objs:
+        by_path.setdefault(get_import_path(obj), []).append(obj.id)
+    with _ALL_OBJECTS_LOCK:
+        _ALL_OBJECTS.update((obj.id, obj) for obj in objs)
+        index = _NAME_INDEX
+    if index is not None:
+        for obj in objs:
+            index.add(obj.name, obj.id)
+    with _OBJECT_MAP_LOCK:
+        for path, ids in by_path.items():
+            s = _OBJECT_MAP.get(path, set())
+            s.update(ids)
+            _OBJECT_MAP[path] = s
+
+
+def remove_objects(objs: Iterable[Any]) -> None:
+    """Remove a batch of objects from the global object registry, taking each lock once."""
+    global _ALL_OBJECTS, _OBJECT_MAP
+    objs = list(objs)
+    by_path: dict[str, list[int]] = {}
+    for obj in objs:
+        by_path.setdefault(get_import_path(obj), []).append(obj.id)
+    with _ALL_OBJECTS_LOCK:
+        for ids in by_path.values():
+            for id in ids:
+                _ALL_OBJECTS.pop(id, None)
+        index = _NAME_INDEX
+    if index is not None:
+        for obj in objs:
+            index.remove(obj.name, obj.id)
+    with _OBJECT_MAP_LOCK:
+        for path, ids in by_path.items():
+            s = _OBJECT_MAP.get(path, set())
+            s.difference_update(ids)
+            _OBJECT_MAP[path] = s
+
+
 def remove_object(obj: object) -> None:
     """Remove an object from the global object registry."""
     global _ALL_OBJECTS, _OBJECT_MAP
     with _ALL_OBJECTS_LOCK:
         _ALL_OBJECTS.pop(obj.id, None)
+        index = _NAME_INDEX
+    if index is not None:
+        index.remove(obj.name, obj.id)
     with _OBJECT_MAP_LOCK:
         s = _OBJECT_MAP.get(get_import_path(obj), set())
         s.remove(obj.id)
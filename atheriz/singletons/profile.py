@@ -0,0 +1,87 @@
+import os
+import sys
+import sysconfig
+import atheriz.settings as settings
+from atheriz.logger import logger
+
+# python is running without the GIL, threads run python code in parallel
+PROFILE_FREE_THREADED = "free_threaded"
+# the GIL is on (a normal build, or a free-threaded one that turned it back on for an extension),
+# only one thread runs python code at a time
+PROFILE_GIL = "gil"
+
+
+def gil_enabled() -> bool:
+    """True if the GIL is on right now"""
+    probe = getattr(sys, "_is_gil_enabled", None)
+    # older than 3.13, there's always a GIL
+    return probe() if probe else True
+
+
+def free_threaded_build() -> bool:
+    """True if python was built with free-threading, even if the GIL got turned back on"""
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+class ExecutionProfile:
+    """
+    how the server runs, picked once at startup by whether python has the GIL.
+    anything set in settings wins over the profile, THREADPOOL_LIMIT and OFFLOAD_WORKERS left as
+    None are filled in here.
+    """
+
+    def __init__(self, name: str | None = None):
+        cpus = os.cpu_count() or 4
+        self.gil_enabled = gil_enabled()
+        self.free_threaded_build = free_threaded_build()
+        if name is None:
+            name = settings.EXECUTION_PROFILE
+        if name == "auto":
+            name = PROFILE_GIL if self.gil_enabled else PROFILE_FREE_THREADED
+        if name not in (PROFILE_FREE_THREADED, PROFILE_GIL):
+            raise ValueError(f"Unknown execution profile: {name}")
+        self.name = name
+        if name == PROFILE_FREE_THREADED:
+            # every core runs python, and pickling work over to another interpreter is slower
+            # than just running it
+            threads, offload = cpus, 0
+        else:
+            # more threads only fight over the GIL, other processes are the only way to use
+            # more cores
+            threads, offload = min(cpus, 4), max(1, cpus - 1)
+        self.threadpool_limit: int = _pick(settings.THREADPOOL_LIMIT, threads)
+        self.offload_workers: int = _pick(settings.OFFLOAD_WORKERS, offload)
+        # not the profile's to pick. the GIL makes single reads and writes atomic, but attribute
+        # locks also make readers wait while another thread holds the object's lock mid-update
+        # (like move_to), with or without the GIL
+        self.threadsafe_getters_setters: bool = bool(settings.THREADSAFE_GETTERS_SETTERS)
+        striped = settings.LOCK_STRIPES and settings.THREADSAFE_MODE == "lock"
+        if striped and self.threadsafe_getters_setters:
+            # every attribute access takes the owner's lock, so code holding one stripe that reads
+            # something on another can deadlock with a thread doing the same the other way round
+            raise ValueError(
+                "LOCK_STRIPES can't be used with attribute locks in THREADSAFE_MODE 'lock', "
+                "set LOCK_STRIPES = 0 or THREADSAFE_MODE = 'fields'"
+            )
+
+    def __str__(self):
+        return (
+            f"{self.name} (GIL {'on' if self.gil_enabled else 'off'}, "
+            f"{'free-threaded' if self.free_threaded_build else 'standard'} build): "
+            f"{self.threadpool_limit} threads, "
+            f"attribute locks {'on' if self.threadsafe_getters_setters else 'off'}, "
+            f"{self.offload_workers} offload workers"
+        )
+
+    def log(self):
+        logger.info(f"Execution profile: {self}")
+        if self.free_threaded_build and self.gil_enabled:
+            logger.warning(
+                "Python is a free-threaded build but the GIL is on, probably because an extension "
+                "module doesn't support running without it. "
+                "Start with PYTHON_GIL=0 to force it off."
+            )
+
+
+def _pick(setting, default):
+    return default if setting is None else setting
@@ -1,5 +1,14 @@
 from .objects import load_files
-from .get import get_async_threadpool, get_map_handler, get_node_handler, get_server_channel, get_async_ticker
+from .get import (
+    get_async_threadpool,
+    get_map_handler,
+    get_node_handler,
+    get_server_channel,
+    get_async_ticker,
+    get_timing_wheel,
+    get_offload_pool,
+    get_execution_profile,
+)
 from atheriz.singletons.objects import filter_by, _ALL_OBJECTS, _ALL_OBJECTS_LOCK
 from atheriz.objects.persist import save
 import atheriz.settings as settings
@@ -13,6 +22,7 @@ if TYPE_CHECKING:
 
 
 def do_startup():
+    get_execution_profile().log()
     load_files()
     get_async_threadpool()
     get_map_handler()
@@ -34,6 +44,9 @@ def do_shutdown():
         get_map_handler().save()
         get_node_handler().save()
     get_async_ticker().stop()
+    get_timing_wheel().stop()
+    get_map_handler().renderer.stop()
+    get_offload_pool().shutdown()
     get_async_threadpool().stop(False)
     websocket_manager.broadcast("Server is shutting down NOW!")
     # players: list[Object] = filter_by(lambda x: x.is_pc and x.is_connected)
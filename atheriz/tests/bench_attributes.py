@@ -0,0 +1,63 @@
+"""
+attribute access and move_to with no attribute locking, settings.THREADSAFE_MODE = "lock" and
+settings.THREADSAFE_MODE = "fields", for objects and accounts. "fields" installs nothing on
+objects, their schema fields are slots, so for them it should come out the same as no locking:
+
+    python -m atheriz.tests.bench_attributes
+"""
+
+import time
+from atheriz import settings
+from atheriz.singletons import get
+from atheriz.objects.base_obj import Object
+from atheriz.objects.base_account import Account
+from atheriz.objects.nodes import Node
+
+READS = 200000
+MOVES = 20000
+
+
+def bench(mode: str | None) -> tuple[float, float]:
+    # a fresh class per mode, patching is per class
+    cls = type(f"Bench{mode}Object", (Object,), {})
+    get.get_execution_profile().threadsafe_getters_setters = mode is not None
+    settings.THREADSAFE_MODE = mode or "lock"
+    obj = cls.create(None, "walker", "a walker", is_npc=True)
+    a = Node(("bench", 0, 0, 0), "a")
+    b = Node(("bench", 1, 0, 0), "b")
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        # fields, a property and a method lookup
+        obj.location, obj.desc, obj.name, obj.msg
+    reads = READS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(MOVES):
+        obj.move_to(b if i % 2 else a, announce=False)
+    moves = MOVES / (time.perf_counter() - start)
+    return reads, moves
+
+
+def bench_account(mode: str | None) -> float:
+    cls = type(f"Bench{mode}Account", (Account,), {})
+    get.get_execution_profile().threadsafe_getters_setters = mode is not None
+    settings.THREADSAFE_MODE = mode or "lock"
+    account = cls.create(f"bench{mode}", "password")
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        account.name, account.characters, account.is_banned, account.add_character
+    return READS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'mode':<8}{'reads/s':>14}{'moves/s':>14}{'account reads/s':>18}")
+    for mode in (None, "lock", "fields"):
+        reads, moves = bench(mode)
+        account_reads = bench_account(mode)
+        print(f"{mode or 'none':<8}{reads:>14.0f}{moves:>14.0f}{account_reads:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+time of the $conj and $pron lookups with and without their caches, of loading verbs.txt, and of
+announcing a move to a room of 500:
+
+    python -m atheriz.tests.bench_conjugation
+"""
+
+import time
+from atheriz.objects.base_obj import Object
+from atheriz.objects.nodes import Node
+from atheriz.objects.verb_conjugation import conjugate, pronouns
+
+CALLS = 20000
+OCCUPANTS = 500
+MOVES = 200
+
+
+class NullSession:
+    def msg(self, *args, **kwargs):
+        pass
+
+
+def us_per_call(func, calls) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    start = time.perf_counter()
+    conjugate._tables()
+    print(f"loading verbs.txt: {(time.perf_counter() - start) * 1000:.1f} ms, on first use")
+
+    conj = conjugate.verb_actor_stance_components
+    pron = pronouns._pronoun_to_viewpoints
+    rows = (
+        ("$conj(walk), uncached", lambda: conj.__wrapped__("walk")),
+        ("$conj(walk), cached", lambda: conj("walk")),
+        ("$pron(you, op f), uncached", lambda: pron.__wrapped__("you", "op f", None, None, None)),
+        ("$pron(you, op f), cached", lambda: pronouns.pronoun_to_viewpoints("you", "op f")),
+    )
+    print(f"{'':<30}{'us per call':>12}")
+    for label, func in rows:
+        print(f"{label:<30}{us_per_call(func, CALLS):>12.2f}")
+
+    room = Node(("bench_conj", 0, 0, 0), "a crossroads")
+    people = Object.create_many(None, [f"person{i}" for i in range(OCCUPANTS)], is_pc=True)
+    for person in people:
+        person.location = room
+        person.session = NullSession()
+    room.add_objects(people)
+    mover = people[0]
+
+    def cold():
+        conj.cache_clear()
+        mover.announce_move_from(None, "north")
+
+    def warm():
+        mover.announce_move_from(None, "north")
+
+    print(f"announce_move_from, {OCCUPANTS} occupants")
+    print(f"{'caches cleared each time':<30}{us_per_call(cold, MOVES):>12.2f}")
+    print(f"{'caches warm':<30}{us_per_call(warm, MOVES):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
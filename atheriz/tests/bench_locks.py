@@ -0,0 +1,43 @@
+"""
+memory and time to create nodes and objects with a lock each vs settings.LOCK_STRIPES:
+
+    python -m atheriz.tests.bench_locks
+"""
+
+import time
+import tracemalloc
+from atheriz import settings
+from atheriz.singletons import lockpool
+from atheriz.singletons import get
+from atheriz.objects.base_obj import Object
+from atheriz.objects.nodes import Node
+
+NODES = 100000
+OBJECTS = 50000
+
+
+def bench(stripes: int) -> tuple[float, float]:
+    settings.LOCK_STRIPES = stripes
+    lockpool._STRIPES = []
+    get.get_execution_profile().threadsafe_getters_setters = False
+    tracemalloc.start()
+    start = time.perf_counter()
+    nodes = [Node(("bench", i, 0, 0), "a room") for i in range(NODES)]
+    objs = [Object() for _ in range(OBJECTS)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes, objs
+    return size / 1024 / 1024, elapsed
+
+
+def main():
+    print(f"{NODES} nodes and {OBJECTS} objects")
+    print(f"{'stripes':<10}{'MB':>10}{'seconds':>10}")
+    for stripes in (0, 4096):
+        mb, elapsed = bench(stripes)
+        print(f"{stripes or 'off':<10}{mb:>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+time of one actor-stance message going to everyone in a room of 500, parsed once per receiver
+versus compiled once and rendered per receiver, and of whole msg_contents and say calls with and
+without sessions to send to:
+
+    python -m atheriz.tests.bench_msg_contents
+"""
+
+import time
+from atheriz.objects.base_obj import Object, _MSG_CONTENTS_PARSER
+from atheriz.objects.nodes import Node
+
+OCCUPANTS = 500
+ROUNDS = 20
+MESSAGE = '$You() $conj(say), "Anyone seen $you(target)?" and $conj(look) around.'
+
+
+class NullSession:
+    def msg(self, *args, **kwargs):
+        pass
+
+
+def per_round(func) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    room = Node(("bench_msg", 0, 0, 0), "a crowded plaza")
+    people = Object.create_many(None, [f"person{i}" for i in range(OCCUPANTS)], is_pc=True)
+    for person in people:
+        person.location = room
+    room.add_objects(people)
+    speaker, target = people[0], people[1]
+    mapping = {"you": speaker, "target": target}
+
+    def parsed():
+        for receiver in people:
+            _MSG_CONTENTS_PARSER.parse(MESSAGE, caller=speaker, receiver=receiver, mapping=mapping)
+
+    def compiled():
+        template = _MSG_CONTENTS_PARSER.compile(MESSAGE)
+        for receiver in people:
+            template.render(caller=speaker, receiver=receiver, mapping=mapping)
+
+    def msg_contents():
+        room.msg_contents(MESSAGE, from_obj=speaker, mapping=mapping)
+
+    def say():
+        speaker.at_say("Anyone seen the mayor?")
+
+    print(f"{OCCUPANTS} occupants, ms per message")
+    print(f"{'parse per receiver':<24}{per_round(parsed):>10.2f}")
+    print(f"{'compile + render':<24}{per_round(compiled):>10.2f}")
+    for sessions in (False, True):
+        for person in people:
+            person.session = NullSession() if sessions else None
+        suffix = "" if sessions else ", no sessions"
+        print(f"{'msg_contents' + suffix:<24}{per_round(msg_contents):>10.2f}")
+        print(f"{'say' + suffix:<24}{per_round(say):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
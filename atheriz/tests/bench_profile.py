@@ -0,0 +1,68 @@
+"""
+compares the threadpool size picked by the execution profile for this python against the old
+static default (THREADPOOL_LIMIT = os.cpu_count()) on a command-like workload of attribute reads
+and writes on real objects, spread over the threadpool. attribute locks are whatever settings say
+for both runs, the profile doesn't pick them. on a 1-core machine both sizes come out the same, so
+run it on a multi-core machine, with a normal and a free-threaded build:
+
+    python -m atheriz.tests.bench_profile
+"""
+
+import os
+import time
+from threading import Event, Lock
+from atheriz import settings
+from atheriz.objects.base_obj import Object
+from atheriz.singletons.asyncthreadpool import AsyncThreadPool
+from atheriz.singletons.profile import ExecutionProfile
+
+TASKS = 20000
+OBJECTS = 500
+READS = 50
+
+
+def work(obj: Object):
+    # roughly what a command touches: a pile of attribute reads and a write or two
+    for _ in range(READS):
+        obj.name, obj.location, obj.is_pc, obj.id
+    obj.last_touched_by = obj.id
+
+
+def run(objs: list[Object], threads: int) -> float:
+    atp = AsyncThreadPool(threads, loops=1)
+    done = Event()
+    remaining = TASKS
+    lock = Lock()
+
+    def task(obj):
+        nonlocal remaining
+        work(obj)
+        with lock:
+            remaining -= 1
+            if remaining == 0:
+                done.set()
+
+    start = time.perf_counter()
+    for i in range(TASKS):
+        atp.submit(task, (objs[i % OBJECTS],), force=True)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    atp.stop(False)
+    return TASKS / elapsed
+
+
+def main():
+    profile = ExecutionProfile()
+    print(f"picked: {profile}")
+    objs = Object.create_many(None, [f"thing{i}" for i in range(OBJECTS)])
+    static_threads = os.cpu_count() or 4
+    static = run(objs, static_threads)
+    picked = run(objs, profile.threadpool_limit)
+    locks = "on" if settings.THREADSAFE_GETTERS_SETTERS else "off"
+    print(f"attribute locks {locks} for both")
+    print(f"static, {static_threads:>3} threads: {static:>10.0f} tasks/s")
+    print(f"picked, {profile.threadpool_limit:>3} threads: {picked:>10.0f} tasks/s ({picked / static:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
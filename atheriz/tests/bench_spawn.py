@@ -0,0 +1,45 @@
+"""
+time, memory and save size of making 10k identical NPCs with Object.create versus spawn:
+
+    python -m atheriz.tests.bench_spawn
+"""
+
+import json
+import time
+import tracemalloc
+from atheriz.objects.base_obj import Object
+from atheriz.objects.prototypes import Prototype, spawn
+
+COUNT = 10000
+
+
+def create():
+    return [
+        Object.create(None, "goblin", "A small green goblin.", aliases=["gob"], is_npc=True)
+        for _ in range(COUNT)
+    ]
+
+
+def run(make) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    objs = make()
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = sum(len(json.dumps(o.__getstate__())) for o in objs)
+    return elapsed, memory, size
+
+
+def main():
+    proto = Prototype(
+        "bench_goblin", name="goblin", desc="A small green goblin.", aliases=["gob"], is_npc=True
+    )
+    print(f"{'':<8}{'ms':>10}{'MB':>10}{'save KB':>10}")
+    for label, make in (("create", create), ("spawn", lambda: spawn(proto, COUNT))):
+        elapsed, memory, size = run(make)
+        print(f"{label:<8}{elapsed * 1000:>10.1f}{memory / 1e6:>10.1f}{size / 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
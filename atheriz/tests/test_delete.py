@@ -161,3 +161,25 @@ def test_delete_non_recursive_moves_contents():
     assert item_ref[0].location == room
     
     assert any("Moved contents of bag to Room" in m for m in caller.msgs)
+
+def test_create_many_and_delete_many(monkeypatch):
+    monkeypatch.setattr(settings, "MAP_ENABLED", False)
+    node = Node(("bulk", 0, 0, 0), "A field")
+    rats = Object.create_many(None, [f"rat{i}" for i in range(20)], "A rat", node, is_npc=True)
+    ids = [r.id for r in rats]
+    assert ids == list(range(ids[0], ids[0] + 20))
+    assert [r.name for r in rats[:2]] == ["rat0", "rat1"]
+    assert node._contents == set(ids)
+    assert all(r.location is node and r.is_npc for r in rats)
+    assert len(objects.get(ids)) == 20
+
+    chest = Object.create_many(None, ["chest"], location=node, is_container=True)[0]
+    coins = Object.create_many(None, ["coin"] * 3, location=chest)
+    assert len(chest.contents) == 3 and coins[0].last_touched_by == chest.id
+
+    assert Object.delete_many(rats[:10]) == 10
+    assert node._contents == set(ids[10:]) | {chest.id}
+    assert objects.get(ids[:10]) == [] and rats[0].is_deleted and rats[0].location is None
+    assert Object.delete_many([chest], recursive=True) == 4
+    assert objects.get([c.id for c in coins]) == []
+    assert node._contents == set(ids[10:])
@@ -0,0 +1,59 @@
+import pytest
+from atheriz.objects.base_obj import Object
+from atheriz.singletons import objects as obj_singleton
+from atheriz.singletons.fuzzy import BKTree, NameIndex
+
+
+@pytest.fixture(autouse=True)
+def clear_objects():
+    obj_singleton._ALL_OBJECTS.clear()
+    obj_singleton._NAME_INDEX = None
+    yield
+    obj_singleton._ALL_OBJECTS.clear()
+    obj_singleton._NAME_INDEX = None
+
+
+def test_bktree():
+    tree = BKTree()
+    for word in ("goblin", "gobbler", "orc", "troll", "goblins", "goblin"):
+        tree.add(word)
+    assert tree.size == 5
+    assert sorted(tree.search("goblni", 2)) == [(2, "goblin"), (2, "goblins")]
+    assert tree.search("trol", 1) == [(1, "troll")]
+    assert tree.search("dragon", 1) == []
+
+
+def test_name_index():
+    index = NameIndex()
+    index.add("Goblin", 1)
+    index.add("goblin ", 2)
+    index.add("Goblin King", 3)
+    assert len(index) == 2
+    assert index.search("GOBLIN") == [(0, 1), (0, 2)]
+    assert index.search("goblin", limit=1) == [(0, 1)]
+    index.remove("goblin", 1)
+    assert index.search("gobln") == [(1, 2)]
+    for i in range(200):
+        index.add(f"rat {i}", 100 + i)
+        index.remove(f"rat {i}", 100 + i)
+    # dead names got rebuilt away
+    assert index.tree.size <= 2 * len(index) + 64
+
+
+def test_fuzzy_search_tracks_objects():
+    goblin = Object.create(None, "goblin")
+    orc = Object.create(None, "orc")
+    assert [o for _, o in obj_singleton.fuzzy_search("gobiln")] == [goblin]
+    assert obj_singleton._NAME_INDEX is not None
+
+    # made after the index, renamed and deleted while it exists
+    troll = Object.create(None, "troll")
+    assert obj_singleton.fuzzy_search("trol") == [(1, troll)]
+    troll.name = "ogre"
+    assert obj_singleton.fuzzy_search("trol") == []
+    assert obj_singleton.fuzzy_search("ogre", 1) == [(0, troll)]
+    Object.delete_many([troll])
+    assert obj_singleton.fuzzy_search("ogre", 1) == []
+
+    assert obj_singleton.fuzzy_search("orcs", l=lambda x: x is not orc) == []
+    assert obj_singleton.fuzzy_search("orcs", max_distance=0) == []
@@ -0,0 +1,90 @@
+import threading
+import pytest
+from atheriz import settings
+from atheriz.singletons import lockpool
+from atheriz.singletons.lockpool import new_lock, lock_all
+from atheriz.objects.nodes import Node
+from atheriz.objects.base_obj import Object
+from atheriz.singletons import get
+from atheriz.singletons.profile import ExecutionProfile
+
+
+def test_striped_locks(monkeypatch):
+    monkeypatch.setattr(settings, "LOCK_STRIPES", 4)
+    monkeypatch.setattr(lockpool, "_STRIPES", [])
+    nodes = [Node(coord=("TestArea", i, 0, 0)) for i in range(32)]
+    locks = {id(n.lock) for n in nodes}
+    assert len(locks) <= 4
+    # still re-entrant
+    with nodes[0].lock:
+        with nodes[0].lock:
+            pass
+    monkeypatch.setattr(settings, "LOCK_STRIPES", 0)
+    assert new_lock(object()) is not new_lock(object())
+
+
+def test_lock_all_order():
+    """Two threads locking the same pair in opposite order don't deadlock."""
+
+    class Thing:
+        def __init__(self):
+            self.lock = new_lock(self)
+
+    a, b = Thing(), Thing()
+    done = []
+
+    def worker(first, second):
+        for _ in range(2000):
+            with lock_all(first, second, None):
+                pass
+        done.append(True)
+
+    threads = [
+        threading.Thread(target=worker, args=(a, b)),
+        threading.Thread(target=worker, args=(b, a)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+    assert len(done) == 2
+
+
+def test_striped_attribute_locks_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "LOCK_STRIPES", 4)
+    monkeypatch.setattr(settings, "THREADSAFE_MODE", "lock")
+    monkeypatch.setattr(settings, "THREADSAFE_GETTERS_SETTERS", True)
+    with pytest.raises(ValueError):
+        ExecutionProfile()
+    monkeypatch.setattr(settings, "THREADSAFE_MODE", "fields")
+    ExecutionProfile()
+
+
+def test_concurrent_moves_dont_deadlock(monkeypatch):
+    """Objects moved back and forth by several threads at once, with attribute locks on."""
+    monkeypatch.setattr(settings, "LOCK_STRIPES", 0)
+    monkeypatch.setattr(settings, "THREADSAFE_MODE", "lock")
+    monkeypatch.setattr(settings, "THREADSAFE_GETTERS_SETTERS", True)
+    monkeypatch.setattr(get, "_EXECUTION_PROFILE", None)
+    boxes = Object.create_many(None, ["box1", "box2", "box3"])
+    items = Object.create_many(None, ["a", "b", "c", "d"])
+    assert getattr(Object, "_is_thread_safe", False)
+    done = []
+
+    def worker(item, first, second):
+        for _ in range(500):
+            item.move_to(first)
+            second.add_objects([item])
+            second.remove_object(item)
+            item.move_to(second)
+        done.append(True)
+
+    threads = [
+        threading.Thread(target=worker, args=(item, boxes[i % 3], boxes[(i + 1) % 3]))
+        for i, item in enumerate(items)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10.0)
+    assert len(done) == len(items)
@@ -263,3 +263,38 @@ def test_quelled_superuser():
 
     obj.add_lock("control", lambda x: x.is_superuser)
     assert obj.access(accessor, "control") is False
+
+
+# --- ACCESS_CACHE tests ---
+
+
+def test_access_cache(monkeypatch):
+    """Cached results are reused until a lock or the accessor's privileges change."""
+    from atheriz.singletons.access import access_stats, reset_access_stats
+
+    monkeypatch.setattr(settings, "ACCESS_CACHE", True)
+    obj = MockObject()
+    accessor = MockObject()
+    accessor.id = 1
+    assert obj.access == obj._cached_access
+    calls = []
+
+    def builder_lock(x):
+        calls.append(x)
+        return x.is_builder
+
+    obj.add_lock("edit", builder_lock)
+    reset_access_stats()
+    assert obj.access(accessor, "edit") is False
+    assert obj.access(accessor, "edit") is False
+    assert len(calls) == 1
+    assert access_stats()["hits"] == 1 and access_stats()["misses"] == 1
+
+    accessor.privilege_level = 3
+    assert obj.access(accessor, "edit") is True
+    accessor.quelled = True
+    assert obj.access(accessor, "edit") is False
+    obj.clear_locks_by_name("edit")
+    assert obj.access(accessor, "edit") is True
+    assert len(calls) == 3
+    assert access_stats()["hit_rate"] == 0.2
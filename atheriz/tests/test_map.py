@@ -0,0 +1,298 @@
+import pytest
+import threading
+from atheriz.singletons.map import MapInfo, ChunkedGrid, ExploredCells, MapRenderer, MapHandler
+from atheriz import settings
+
+
+def test_chunked_grid_set_get():
+    grid = ChunkedGrid(size=4)
+    grid[(0, 0)] = "a"
+    grid[(-1, -1)] = "b"
+    grid[(9, 2)] = "c"
+    assert grid[(0, 0)] == "a"
+    assert grid.get((-1, -1)) == "b"
+    assert grid.get((5, 5)) is None
+    assert (9, 2) in grid
+    assert len(grid) == 3
+    # only touched chunks are allocated
+    assert set(grid.chunk_keys()) == {(0, 0), (-1, -1), (2, 0)}
+    del grid[(9, 2)]
+    assert len(grid) == 2
+    with pytest.raises(KeyError):
+        grid[(9, 2)]
+
+
+def test_chunked_grid_equals_dict():
+    cells = {(0, 0): ".", (1, 0): "#", (0, 1): ".", (70, -3): "#"}
+    grid = ChunkedGrid(cells)
+    assert grid == cells
+    assert dict(grid.items()) == cells
+
+
+def test_chunked_grid_serialization():
+    cells = {(0, 0): ".", (1, 0): "#", (3, 1): "x", (-5, 2): "\x1b[31m!\x1b[0m"}
+    grid = ChunkedGrid(cells, size=8)
+    state = grid.__getstate__()
+    # single character chunks are stored as row strings, others fall back to sparse cells
+    assert state["chunks"]["0,0"] == [".#", "\x00\x00\x00x"]
+    assert state["chunks"]["-1,0"] == {"3,2": "\x1b[31m!\x1b[0m"}
+
+    restored = ChunkedGrid.from_state(state)
+    # nothing is decoded until it's used
+    assert restored.chunks == {}
+    assert len(restored) == 4
+    assert restored[(3, 1)] == "x"
+    assert list(restored.chunks.keys()) == [(0, 0)]
+    assert restored == cells
+
+
+def test_chunked_grid_legacy_state():
+    restored = ChunkedGrid.from_state({"(0, 0)": ".", "(1, 0)": "#"})
+    assert restored == {(0, 0): ".", (1, 0): "#"}
+
+
+def test_chunked_grid_copy_on_write():
+    grid = ChunkedGrid({(0, 0): "a"})
+    copied = grid.copy()
+    copied[(0, 0)] = "b"
+    copied[(1, 1)] = "c"
+    assert grid == {(0, 0): "a"}
+    assert copied == {(0, 0): "b", (1, 1): "c"}
+
+
+def test_chunked_grid_render_matches_flat_render():
+    cells = {(0, 0): "a", (5, 3): "b", (-2, 1): "c", (9, -4): "d"}
+    flat = MapInfo.render_grid(cells)
+    chunked = MapInfo.render_grid(ChunkedGrid(cells, size=4))
+    assert flat == chunked
+
+
+def test_chunked_grid_render_window():
+    grid = ChunkedGrid({(0, 0): "a", (100, 0): "b"}, size=8)
+    assert grid.render({(0, 0)}) == ("a", 0, 0)
+    assert grid.render({(12, 0)}) == ("b", 100, 0)
+
+
+def test_pre_render_across_chunks():
+    mi = MapInfo("test")
+    mi.pre_grid = ChunkedGrid(size=4)
+    with mi.lock:
+        mi.pre_grid[(3, 0)] = settings.ROOM_PLACEHOLDER
+        mi.place_walls((3, 0), settings.SINGLE_WALL_PLACEHOLDER)
+    mi.pre_render()
+
+    flat = dict(mi.pre_grid.items())
+    MapInfo.render_char(flat, settings.SINGLE_WALL_PLACEHOLDER, "single")
+    flat[(3, 0)] = " "
+    assert mi.post_grid == flat
+    assert mi.post_grid[(4, 1)] == "┐"
+
+    # changing one chunk only re-renders the chunks next to the change
+    mi.pre_grid[(21, 21)] = settings.ROOM_PLACEHOLDER
+    assert mi.pre_grid.dirty == {(5, 5)}
+    mi.pre_render()
+    assert mi.post_grid[(21, 21)] == " "
+    assert mi.post_grid[(4, 1)] == "┐"
+
+
+def test_render_decodes_into_live_grid():
+    mi = MapInfo("test")
+    mi.pre_grid = ChunkedGrid({(x, 0): "#" for x in range(40)}, size=8)
+    mi.pre_render()
+    restored = MapInfo()
+    restored.__setstate__(mi.__getstate__())
+    assert restored.post_grid.chunks == {}
+    restored.add_listener(FakeMapable(1))
+    restored.render(True)
+    # the live grid is decoded once, not a throwaway copy per frame
+    assert (0, 0) in restored.post_grid.chunks
+    assert (0, 0) not in restored.post_grid.encoded
+
+
+class FakeNode:
+    is_node = True
+
+    def __init__(self, x, y):
+        self.coord = ("test", x, y, 0)
+
+
+class FakeMapable:
+    def __init__(self, id, x=0, y=0):
+        self.id = id
+        self.symbol = "@"
+        self.name = f"thing{id}"
+        self.location = FakeNode(x, y)
+        self.last_map_time = None
+        self.legends = []
+        self.maps = []
+
+    def at_legend_update(self, legend, show_legend=True, area="Somewhere"):
+        self.legends.append(legend)
+
+    def at_pre_map_render(self, grid):
+        return grid
+
+    def at_map_update(self, map, legend, min_x, max_y, show_legend=True, area="Somewhere"):
+        self.maps.append(legend)
+
+
+def test_legend_excludes_listener():
+    mi = MapInfo("test")
+    a = FakeMapable(1, 0, 0)
+    b = FakeMapable(2, 1, 1)
+    mi.add_listener(a)
+    mi.add_listener(b)
+    mi.add_mapable_list([a, b])
+    assert a.legends[-1] == [("@", "thing2", (1, 1))]
+    assert b.legends[-1] == [("@", "thing1", (0, 0))]
+
+
+def test_legend_not_resent_when_unchanged():
+    mi = MapInfo("test")
+    a = FakeMapable(1)
+    b = FakeMapable(2)
+    mi.add_listener(a)
+    mi.add_mapable(b)
+    assert len(a.legends) == 1
+    version = mi.legend_version
+    mi.render_legend()
+    mi.add_mapable(b)
+    assert len(a.legends) == 1
+    assert mi.legend_version == version
+
+    b.location = FakeNode(5, 5)
+    mi.render_legend()
+    assert len(a.legends) == 2
+    assert a.legends[-1] == [("@", "thing2", (5, 5))]
+
+    # a full map update carries the legend too
+    b.location = FakeNode(6, 6)
+    mi.render(True)
+    mi.render_legend()
+    assert len(a.legends) == 2
+    assert a.maps[-1] == [("@", "thing2", (6, 6))]
+
+
+def test_map_update_sent_outside_lock():
+    mi = MapInfo("test")
+    mi.pre_grid = ChunkedGrid({(0, 0): "#"})
+    free = []
+
+    def probe():
+        got = mi.lock.acquire(blocking=False)
+        if got:
+            mi.lock.release()
+        free.append(got)
+
+    class Listener(FakeMapable):
+        def at_map_update(self, *args, **kwargs):
+            t = threading.Thread(target=probe)
+            t.start()
+            t.join()
+
+    mi.add_listener(Listener(1))
+    mi.render(True)
+    assert free == [True]
+
+
+def test_explored_cells_reveal():
+    explored = ExploredCells(size=8)
+    explored.reveal(("test", 7, 0, 0), 1)
+    assert explored.is_explored("test", 7, 0, 0)
+    # radius is circular and crosses chunk borders
+    assert explored.is_explored("test", 8, 0, 0)
+    assert explored.is_explored("test", 7, -1, 0)
+    assert not explored.is_explored("test", 8, 1, 0)
+    assert not explored.is_explored("test", 7, 0, 1)
+    assert set(explored.get_mask("test", 0).keys()) == {(0, 0), (1, 0), (0, -1)}
+    # 8x8 bits per chunk
+    assert all(len(b) == 8 for b in explored.get_mask("test", 0).values())
+
+
+def test_explored_cells_serialization():
+    explored = ExploredCells(size=8)
+    explored.reveal(("test", 3, 3, 0), 2)
+    explored.reveal(("other", 100, -50, 2), 0)
+    restored = ExploredCells.__new__(ExploredCells)
+    restored.__setstate__(explored.__getstate__())
+    assert restored.size == 8
+    assert restored.maps == explored.maps
+    assert restored.is_explored("other", 100, -50, 2)
+
+
+def test_fog_of_war_render(monkeypatch):
+    monkeypatch.setattr(settings, "FOG_OF_WAR", True)
+    mi = MapInfo("test")
+    mi.pre_grid = ChunkedGrid({(x, 0): "#" for x in range(-4, 12)}, size=8)
+    mi.pre_render()
+    a = FakeMapable(1, 0, 0)
+    a.explored = ExploredCells(size=8)
+    a.explored.reveal(a.location.coord, 2)
+    b = FakeMapable(2, 10, 0)
+    mi.add_listener(a)
+    mi.add_mapable_list([a, b])
+    assert mi.get_fog(a) is a.explored.get_mask("test", 0)
+    map_str, min_x, max_y = mi.post_grid.render(mask=mi.get_fog(a))
+    # only the explored chunks are rendered and unexplored cells are blank
+    assert (map_str, min_x, max_y) == ("  #####     ", -4, 0)
+    # b is on an unexplored cell so it's left out of a's legend
+    assert a.legends[-1] == []
+
+    # turning fog of war off shows everything again, even to players who explored with it on
+    monkeypatch.setattr(settings, "FOG_OF_WAR", False)
+    assert mi.get_fog(a) is None
+    assert mi.fogged_legend(a, mi.legend_for(a)) == [("@", "thing2", (10, 0))]
+
+
+class BlockingMap:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def render(self, force=False):
+        self.started.set()
+        self.release.wait(5)
+
+
+def test_map_renderer_merges_pending_renders():
+    renderer = MapRenderer()
+    blocker = BlockingMap()
+    renderer.queue_render(blocker)
+    assert blocker.started.wait(5)
+
+    mi = MapInfo("test")
+    a = FakeMapable(1)
+    mi.add_listener(a)
+    mi.add_mapable(FakeMapable(2), False)
+    renderer.queue_legend(mi)
+    renderer.queue_render(mi, True)
+    renderer.queue_render(mi)
+    # the render thread is busy, so the updates for mi are waiting as a single render
+    assert renderer.depth == 1
+    assert a.maps == [] and a.legends == []
+
+    blocker.release.set()
+    renderer.flush()
+    assert len(a.maps) == 1
+    assert renderer.stats() == {
+        "depth": 0,
+        "max_depth": 1,
+        "queued": 4,
+        "merged": 2,
+        "rendered": 2,
+    }
+    renderer.stop()
+
+
+def test_move_listener_evicts_off_the_move():
+    mh = MapHandler()
+    mi = MapInfo("test")
+    mh.set_mapinfo("test", 0, mi)
+    a = FakeMapable(1)
+    mh.move_listener(a, ("test", 1, 0, 0), ("test", 0, 0, 0))
+    # still on the same map, nothing to evict
+    assert mh.renderer.stats()["queued"] == 0
+    mh.move_listener(a, ("other", 0, 0, 0), ("test", 1, 0, 0))
+    assert mh.renderer.stats()["queued"] == 1
+    mh.renderer.flush()
+    mh.renderer.stop()
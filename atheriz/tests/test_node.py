@@ -100,6 +100,111 @@ def test_node_equality():
     assert node1 != node3
 
 
+def test_node_appearance_cache(monkeypatch):
+    from atheriz.objects.base_obj import Object
+
+    monkeypatch.setattr(settings, "APPEARANCE_CACHE", True)
+    node = Node(coord=("TestArea", 0, 0, 0), desc="A dark room")
+    looker = Object.create(None, "Looker", is_pc=True)
+    other = Object.create(None, "Other", is_pc=True)
+    rat = Object.create(None, "rat", is_npc=True)
+    node.add_objects([looker, other, rat])
+
+    def uncached(obj):
+        monkeypatch.setattr(settings, "APPEARANCE_CACHE", False)
+        result = node.return_appearance(obj)
+        monkeypatch.setattr(settings, "APPEARANCE_CACHE", True)
+        return result
+
+    first = node.return_appearance(looker)
+    assert first == uncached(looker)
+    # contents come out in set order, which depends on the ids
+    assert "Looker" not in first and ("Other, rat" in first or "rat, Other" in first)
+    # the fragments are shared by lookers of the same kind, minus the looker themselves
+    assert node.return_appearance(other) == uncached(other)
+    second = node.return_appearance(other)
+    assert "Other" not in second and ("Looker, rat" in second or "rat, Looker" in second)
+    version = node.appearance_version
+    node.return_appearance(looker)
+    assert node.appearance_version == version
+
+    node.desc = "A bright room"
+    assert "A bright room" in node.return_appearance(looker)
+    rat2 = Object.create(None, "rat", is_npc=True)
+    node.add_object(rat2)
+    assert "rat(2)" in node.return_appearance(looker)
+    node.remove_object(other)
+    assert node.return_appearance(looker) == uncached(looker)
+    # renaming or retyping something in here changes how it's listed
+    rat2.location = node
+    rat2.name = "mouse"
+    after = node.return_appearance(looker)
+    assert "rat, mouse" in after or "mouse, rat" in after
+    rat2.is_npc = False
+    assert "mouse" not in node.return_appearance(looker)
+
+
+def test_node_appearance_cache_looker_dependent_names(monkeypatch):
+    from atheriz.objects.base_obj import Object
+
+    class Masked(Object):
+        def get_display_name(self, looker=None, **kwargs):
+            return f"a stranger to {looker.name}"
+
+    class Disguised(Object):
+        def get_display_name(self, looker=None, **kwargs):
+            return "the spy" if looker.is_builder else "a merchant"
+
+        def display_name_key(self, looker):
+            return looker.is_builder
+
+    monkeypatch.setattr(settings, "APPEARANCE_CACHE", True)
+    node = Node(coord=("TestArea", 0, 0, 0), desc="A market")
+    alice = Object.create(None, "Alice", is_pc=True)
+    bob = Object.create(None, "Bob", is_pc=True)
+    builder = Object.create(None, "Builder", is_pc=True)
+    builder.privilege_level = 3
+    spy = Disguised.create(None, "spy", is_npc=True)
+    node.add_objects([spy])
+    # names that say how they depend on the looker are cached apart per answer
+    assert "a merchant" in node.return_appearance(alice)
+    assert "a merchant" in node.return_appearance(bob)
+    assert "the spy" in node.return_appearance(builder)
+
+    # and ones that don't say aren't cached at all
+    (masked,) = Masked.create_many(None, ["masked"], is_npc=True)
+    masked.location = node
+    node.add_object(masked)
+    assert "a stranger to Alice" in node.return_appearance(alice)
+    assert "a stranger to Bob" in node.return_appearance(bob)
+    assert "a stranger to Alice" in node.return_appearance(alice)
+
+    # locks on something in here can change how it's listed
+    version = node.appearance_version
+    masked.add_lock("view", lambda x: True)
+    assert node.appearance_version != version
+    version = node.appearance_version
+    masked.clear_locks_by_name("view")
+    assert node.appearance_version != version
+
+
+def test_node_appearance_cache_uses_overrides():
+    from atheriz.objects.base_obj import Object
+
+    class CrowdNode(Node):
+        def get_display_characters(self, looker, **kwargs):
+            return f"Crowd: {len(self.get_characters(looker))}\n"
+
+    node = CrowdNode(coord=("TestArea", 0, 0, 0), desc="A square")
+    looker = Object.create(None, "Looker", is_pc=True)
+    other = Object.create(None, "Other", is_pc=True)
+    outsider = Object.create(None, "Outsider", is_pc=True)
+    node.add_objects([looker, other])
+    assert "Crowd: 1" in node.return_appearance(looker)
+    assert "Crowd: 1" in node.return_appearance(other)
+    assert "Crowd: 2" in node.return_appearance(outsider)
+
+
 # ==================== NodeGrid Tests ====================
 
 
@@ -0,0 +1,40 @@
+import pytest
+import atheriz.settings as settings
+from atheriz.singletons.profile import (
+    ExecutionProfile,
+    PROFILE_FREE_THREADED,
+    PROFILE_GIL,
+    gil_enabled,
+)
+
+
+@pytest.fixture
+def unset(monkeypatch):
+    for name in ("THREADPOOL_LIMIT", "OFFLOAD_WORKERS"):
+        monkeypatch.setattr(settings, name, None)
+    monkeypatch.setattr(settings, "EXECUTION_PROFILE", "auto")
+
+
+def test_auto_profile_follows_gil(unset):
+    profile = ExecutionProfile()
+    assert profile.name == (PROFILE_GIL if gil_enabled() else PROFILE_FREE_THREADED)
+    assert profile.name in str(profile)
+
+
+def test_profiles(unset, monkeypatch):
+    free = ExecutionProfile(PROFILE_FREE_THREADED)
+    assert free.offload_workers == 0
+    gil = ExecutionProfile(PROFILE_GIL)
+    assert gil.offload_workers >= 1 and gil.threadpool_limit <= 4
+    # attribute locks are left to settings either way
+    monkeypatch.setattr(settings, "THREADSAFE_GETTERS_SETTERS", True)
+    assert ExecutionProfile(PROFILE_GIL).threadsafe_getters_setters
+    monkeypatch.setattr(settings, "THREADSAFE_GETTERS_SETTERS", False)
+    assert not ExecutionProfile(PROFILE_FREE_THREADED).threadsafe_getters_setters
+    # anything set in settings wins
+    monkeypatch.setattr(settings, "EXECUTION_PROFILE", PROFILE_GIL)
+    monkeypatch.setattr(settings, "THREADPOOL_LIMIT", 16)
+    forced = ExecutionProfile()
+    assert forced.name == PROFILE_GIL and forced.threadpool_limit == 16
+    with pytest.raises(ValueError):
+        ExecutionProfile("turbo")
@@ -0,0 +1,76 @@
+import pytest
+from atheriz.objects.base_obj import Object
+from atheriz.objects.nodes import Node
+from atheriz.objects.prototypes import Prototype, spawn, get_prototype
+from atheriz.singletons import objects as obj_singleton
+
+
+@pytest.fixture(autouse=True)
+def clear_objects():
+    obj_singleton._ALL_OBJECTS.clear()
+    yield
+    obj_singleton._ALL_OBJECTS.clear()
+
+
+def make_goblin():
+    return Prototype(
+        "test_goblin",
+        name="goblin",
+        desc="A small green goblin.",
+        aliases=["gob"],
+        is_npc=True,
+        locks={"get": [lambda x: False]},
+    )
+
+
+def test_spawn_shares_prototype_fields():
+    proto = make_goblin()
+    assert get_prototype("test_goblin") is proto
+    node = Node(("proto", 0, 0, 0), "a cave")
+    goblins = spawn("test_goblin", 50, node)
+    assert len(goblins) == 50 and len({g.id for g in goblins}) == 50
+    assert node._contents == {g.id for g in goblins}
+    a, b = goblins[0], goblins[1]
+    assert a.location is node and a.name == "goblin" and a.is_npc
+    assert a.aliases is b.aliases and a.locks is b.locks
+    assert a.external_cmdset is proto.external_cmdset
+    assert a.internal_cmdset is not b.internal_cmdset
+    assert not a.access(b, "get")
+
+    state = a.__getstate__()
+    assert state["prototype"] == "test_goblin"
+    for key in ("name", "desc", "aliases", "is_npc", "locks", "external_cmdset"):
+        assert key not in state
+
+
+def test_copy_on_write():
+    proto = make_goblin()
+    a, b = spawn(proto, 2)
+    a.add_lock("get", lambda x: True)
+    assert a.locks is not proto.shared["locks"]
+    assert len(a.locks["get"]) == 2 and len(b.locks["get"]) == 1
+    a.own("aliases").append("greenie")
+    assert b.aliases == ["gob"]
+    a.name = "Grak"
+    state = a.__getstate__()
+    assert state["name"] == "Grak" and state["aliases"] == ["gob", "greenie"] and "locks" in state
+    assert "name" not in b.__getstate__()
+
+
+def test_prototype_round_trip():
+    proto = make_goblin()
+    (goblin,) = spawn(proto)
+    goblin.desc = "A scarred goblin."
+    new = Object()
+    new.__setstate__(goblin.__getstate__())
+    assert new.prototype is proto and new.id == goblin.id
+    assert new.name == "goblin" and new.desc == "A scarred goblin."
+    assert new.aliases is proto.shared["_aliases"]
+    assert new.external_cmdset is proto.external_cmdset
+
+
+def test_bad_prototypes():
+    with pytest.raises(ValueError):
+        spawn("no_such_prototype")
+    with pytest.raises(ValueError):
+        Prototype("bad", hit_points=10)
@@ -195,3 +195,76 @@ def test_search_plurals():
     results = search(container, "swords")
     assert len(results) == 1
     assert results[0] == obj
+
+
+def test_search_uses_contents_index(monkeypatch):
+    """Big containers search through their index, with the same results."""
+    from atheriz import settings
+
+    monkeypatch.setattr(settings, "SEARCH_INDEX_THRESHOLD", 5)
+    container = Object()
+    container.id = 100
+    container.name = "warehouse"
+    add_object(container)
+    items = []
+    for i, name in enumerate(["coin", "coin", "gem", "crate", "crate", "ruby"]):
+        obj = Object()
+        obj.id = i
+        obj.name = name
+        add_object(obj)
+        container.add_object(obj)
+        obj.location = container
+        items.append(obj)
+
+    assert search(container, "gem") == [items[2]]
+    assert container._search_index is not None
+    assert search(container, "all coin") == items[:2]
+    assert search(container, "coin 2") == [items[1]]
+    assert search(container, "crates") == items[3:5]
+    assert search(container, "ge") == [items[2]]
+    assert search(container, "diamond") == []
+
+    # renames, aliases and removals keep the index up to date
+    items[5].name = "diamond"
+    assert search(container, "diamond") == [items[5]]
+    assert search(container, "ruby") == []
+    items[2].aliases = ["emerald"]
+    assert search(container, "emerald") == [items[2]]
+    container.remove_object(items[0])
+    assert search(container, "all coin") == [items[1]]
+
+
+def test_search_order_across_index_threshold(monkeypatch):
+    """An nth match picks the same object with or without the index."""
+    from atheriz import settings
+
+    monkeypatch.setattr(settings, "SEARCH_INDEX_THRESHOLD", 6)
+    container = Object()
+    container.id = 200
+    container.name = "rack"
+    add_object(container)
+    # ids that a set doesn't iterate in order
+    swords = []
+    for id in (40, 3, 17, 9):
+        obj = Object()
+        obj.id = id
+        obj.name = "sword"
+        add_object(obj)
+        container.add_object(obj)
+        obj.location = container
+        swords.append(obj)
+    by_id = sorted(swords, key=lambda o: o.id)
+    assert container._search_index is None
+    assert search(container, "sword 2") == [by_id[1]]
+    assert search(container, "all sword") == by_id
+
+    for id in (50, 51):
+        obj = Object()
+        obj.id = id
+        obj.name = "shield"
+        add_object(obj)
+        container.add_object(obj)
+        obj.location = container
+    assert search(container, "sword 2") == [by_id[1]]
+    assert container._search_index is not None
+    assert search(container, "all sword") == by_id
@@ -1,8 +1,12 @@
+import base64
+import dill
 import pytest
+import time
 from atheriz.objects.nodes import Node, NodeGrid, NodeArea, NodeLink
 from atheriz.utils import get_import_path
 from atheriz.objects.base_account import Account
 from atheriz.objects.base_obj import Object
+from atheriz.objects.base_script import Script
 from atheriz.commands.cmdset import CmdSet
 from atheriz.singletons import objects as obj_singleton
 from atheriz.singletons.node import (
@@ -22,14 +26,22 @@ def cleanup():
     obj_singleton._ALL_OBJECTS.clear()
 
 
+def _fields(obj):
+    # schema fields are slots, not __dict__ entries
+    state = obj.__dict__.copy()
+    for f in getattr(obj, "_schema", ()):
+        state[f.name] = getattr(obj, f.name)
+    return state
+
+
 def assert_same_state(obj1, obj2):
     """
     Assert that two objects have the same state.
     For primitives, check equality.
     For others, check existence (not None).
     """
-    state1 = obj1.__dict__
-    state2 = obj2.__dict__
+    state1 = _fields(obj1)
+    state2 = _fields(obj2)
 
     # Check key equality
     assert (
@@ -172,7 +184,6 @@ class SimpleObject(Object):
 
 def test_object_serialization():
     obj = SimpleObject()
-    obj.at_object_creation()
     obj.internal_cmdset = CmdSet()
     obj.external_cmdset = CmdSet()
     obj.name = "TestObject"
@@ -183,7 +194,6 @@ def test_object_serialization():
     new_obj = SimpleObject()
     new_obj.__setstate__(state)
 
-    obj.__import_path__ = get_import_path(obj)
     assert_same_state(obj, new_obj)
 
     assert new_obj.name == "TestObject"
@@ -227,6 +237,104 @@ def test_object_serialization_with_locks():
     assert new_obj.access(accessor, "control") is True  # is_builder returns True for priv >= 3
 
 
+def test_account_serialization_atomic_fields(monkeypatch):
+    """Accounts with AtomicField descriptors save and load the same as plain ones."""
+    from atheriz import settings
+    from atheriz.singletons import get
+    from atheriz.utils import AtomicField
+
+    class FieldsAccount(Account):
+        pass
+
+    monkeypatch.setattr(settings, "THREADSAFE_MODE", "fields")
+    monkeypatch.setattr(get.get_execution_profile(), "threadsafe_getters_setters", True)
+    acc = FieldsAccount.create("FieldsUser", "password")
+    assert isinstance(FieldsAccount.__dict__["characters"], AtomicField)
+    # no locking wrapper of its own (Account may have one from tests run in "lock" mode)
+    assert "_is_thread_safe" not in FieldsAccount.__dict__
+    acc.ban_reason = "spam"
+    assert acc.__dict__["ban_reason"] == "spam"
+
+    new_acc = FieldsAccount()
+    new_acc.__setstate__(acc.__getstate__())
+    acc.__import_path__ = get_import_path(acc)
+    assert_same_state(acc, new_acc)
+    assert new_acc.ban_reason == "spam" and new_acc.name == "FieldsUser"
+
+
+def test_object_fields_mode_uses_slots(monkeypatch):
+    """"fields" mode installs nothing on objects, their schema fields are already slots."""
+    from atheriz import settings
+    from atheriz.singletons import get
+    from atheriz.utils import AtomicField
+
+    class FieldsObject(Object):
+        pass
+
+    monkeypatch.setattr(settings, "THREADSAFE_MODE", "fields")
+    monkeypatch.setattr(get.get_execution_profile(), "threadsafe_getters_setters", True)
+    obj = FieldsObject.create(None, "Slotted", "in slots")
+    assert not any(isinstance(v, AtomicField) for v in FieldsObject.__dict__.values())
+    assert "_is_thread_safe" not in FieldsObject.__dict__
+    assert "desc" not in obj.__dict__ and obj.desc == "in slots"
+
+
+def test_object_state_skips_defaults():
+    obj = Object.create(None, "Lean", "a lean object", aliases=["lean"])
+    state = obj.__getstate__()
+    assert state["name"] == "Lean" and state["aliases"] == ["lean"]
+    # defaults and empty containers aren't saved
+    for key in ("symbol", "is_deleted", "channels", "_contents", "locks", "location", "scripts"):
+        assert key not in state
+    assert "desc" not in obj.__dict__
+
+    new_obj = Object()
+    new_obj.__setstate__(state)
+    assert_same_state(obj, new_obj)
+    assert new_obj.symbol == "X" and new_obj.channels == [] and new_obj.locks == {}
+
+
+def test_object_subclass_schema():
+    from atheriz.objects.base_obj import Field
+
+    class Monster(Object):
+        schema = (Field("hp", int, 10), Field("loot", list, factory=list))
+        __slots__ = ("hp", "loot")
+
+    mob = Monster.create(None, "Rat", "a rat")
+    assert mob.hp == 10 and "hp" not in mob.__dict__
+    assert "hp" not in mob.__getstate__()
+    mob.hp = 3
+    mob.loot.append("tail")
+    new_mob = Monster()
+    new_mob.__setstate__(mob.__getstate__())
+    assert new_mob.hp == 3 and new_mob.loot == ["tail"] and new_mob.name == "Rat"
+    # the base schema is left alone
+    assert "hp" not in Object._schema_keys
+
+
+def test_object_loads_full_state():
+    """saves from before the schema have every field"""
+    obj = Object.create(None, "Old", "an old save")
+    state = {f.key: getattr(obj, f.name) for f in obj._schema if f.persist}
+    state.update(
+        _contents=[],
+        internal_cmdset=None,
+        external_cmdset=None,
+        locks=base64.b64encode(dill.dumps({})).decode("utf-8"),
+        location=None,
+        home=None,
+        explored=None,
+        scripts=[],
+        __import_path__=get_import_path(obj),
+    )
+    new_obj = Object()
+    new_obj.__setstate__(state)
+    assert new_obj.name == "Old" and new_obj.desc == "an old save"
+    assert new_obj.id == obj.id and new_obj.locks == {}
+    assert "name" not in new_obj.__dict__
+
+
 def test_nodehandler_serialize_areas():
     area = NodeArea(name="TestAreaHandler")
     areas = {"TestAreaHandler": area}
@@ -317,3 +425,29 @@ def test_mapinfo_serialization():
     assert new_map_info.objects == {}
     assert new_map_info.listeners == {}
     assert new_map_info.lock is not None
+
+
+def test_object_script_serialization():
+    obj = SimpleObject()
+    obj.name = "ScriptedObject"
+    obj.add_script(Script("burn", interval=30.0, repeats=3), autostart=False)
+    script = obj.scripts[0]
+    script.data["fuel"] = 2
+    script.is_active = True
+    script.next_run = time.time() + 10.0
+
+    state = obj.__getstate__()
+    assert state["scripts"][0]["__import_path__"] == "atheriz.objects.base_script.Script"
+
+    new_obj = SimpleObject()
+    new_obj.__setstate__(state)
+    restored = new_obj.get_script("burn")
+    assert restored.obj is new_obj
+    assert restored.data == {"fuel": 2}
+    assert restored.repeats == 3
+    # it picks up where it left off instead of waiting a full interval
+    assert restored.handle is not None
+    assert 9.0 < restored.handle.remaining <= 10.0
+    new_obj.remove_script("burn")
+    assert new_obj.scripts == []
+    assert restored.handle is None and not restored.is_active
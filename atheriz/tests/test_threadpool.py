@@ -3,7 +3,19 @@ import time
 import threading
 import asyncio
 from typing import NoReturn
-from atheriz.singletons.asyncthreadpool import AsyncThreadPool, AsyncTicker
+from atheriz.singletons.asyncthreadpool import (
+    AsyncThreadPool,
+    AsyncTicker,
+    LaneQueue,
+    LANE_INTERACTIVE,
+    LANE_TICK,
+    LANE_BACKGROUND,
+    TimingWheel,
+    TimerHandle,
+    OffloadPool,
+    is_plain,
+)
+from atheriz.mazegen import gen_maze
 
 
 class TestAsyncThreadPool:
@@ -88,6 +100,181 @@ class TestAsyncThreadPool:
 
         atp.stop()
 
+    def test_actor_tasks_run_in_order(self):
+        """Tasks for the same owner run one at a time and in order, sync or async."""
+        atp = AsyncThreadPool(max_threads=4)
+        owners = [object() for _ in range(4)]
+        results = {id(o): [] for o in owners}
+        running = {id(o): 0 for o in owners}
+        overlaps = []
+        done = threading.Event()
+        total = 200
+
+        def step(owner, n):
+            key = id(owner)
+            running[key] += 1
+            if running[key] > 1:
+                overlaps.append(n)
+            time.sleep(0.0005)
+            results[key].append(n)
+            running[key] -= 1
+            if sum(len(r) for r in results.values()) == total * len(owners):
+                done.set()
+
+        async def async_step(owner, n):
+            await asyncio.sleep(0.001)
+            step(owner, n)
+
+        for n in range(total):
+            for o in owners:
+                atp.add_actor_task(o, async_step if n % 10 == 0 else step, o, n)
+
+        assert done.wait(timeout=10.0)
+        assert overlaps == []
+        for o in owners:
+            assert results[id(o)] == list(range(total))
+        # mailboxes are dropped once they're drained
+        deadline = time.time() + 2.0
+        while atp.mailboxes and time.time() < deadline:
+            time.sleep(0.01)
+        assert atp.mailboxes == {}
+
+        atp.stop()
+
+    def test_lane_queue_weighted_order(self):
+        """Lanes are served by weighted round robin without starving the light ones."""
+        q = LaneQueue({LANE_INTERACTIVE: 3, LANE_TICK: 2, LANE_BACKGROUND: 1})
+        for n in range(6):
+            q.put(("b", n), LANE_BACKGROUND)
+            q.put(("t", n), LANE_TICK)
+            q.put(("i", n), LANE_INTERACTIVE)
+        order = [q.get()[0] for _ in range(12)]
+        assert order == ["i", "i", "i", "t", "t", "b", "i", "i", "i", "t", "t", "b"]
+        # once a lane runs dry the others share the threads
+        rest = [q.get()[0] for _ in range(6)]
+        assert rest == ["t", "t", "b", "b", "b", "b"]
+        assert q.qsize() == 0
+        assert q.served == {LANE_INTERACTIVE: 6, LANE_TICK: 6, LANE_BACKGROUND: 6}
+
+    def test_lane_queue_limits(self):
+        """Full lanes drop, reject or block depending on their policy."""
+        q = LaneQueue(
+            {LANE_INTERACTIVE: 1, LANE_TICK: 1, LANE_BACKGROUND: 1},
+            {LANE_INTERACTIVE: 2, LANE_TICK: 2, LANE_BACKGROUND: 1},
+            {LANE_INTERACTIVE: "reject", LANE_TICK: "drop_oldest", LANE_BACKGROUND: "block"},
+        )
+        dropped = []
+        for n in range(3):
+            assert q.put(("t", n), LANE_TICK, on_drop=lambda n=n: dropped.append(n))
+        assert dropped == [0]
+        assert q.put(("i", 0))
+        assert q.put(("i", 1))
+        assert not q.put(("i", 2))
+        # forced tasks go over the limit and are never dropped
+        assert q.put(("i", 3), force=True)
+        assert q.put(("b", 0), LANE_BACKGROUND)
+
+        def producer():
+            q.put(("b", 1), LANE_BACKGROUND)
+
+        t = threading.Thread(target=producer)
+        t.start()
+        time.sleep(0.05)
+        # waiting for room in the background lane
+        assert t.is_alive()
+        items = [q.get() for _ in range(7)]
+        t.join(1.0)
+        assert not t.is_alive()
+        assert ("b", 1) in items
+        assert q.qsize() == 0
+        stats = q.stats()
+        assert stats[LANE_TICK]["dropped"] == 1
+        assert stats[LANE_INTERACTIVE]["rejected"] == 1
+        assert stats[LANE_INTERACTIVE]["enqueued"] == 3
+        assert stats[LANE_BACKGROUND]["blocked"] == 1
+
+    def test_lane_queue_bad_config(self):
+        """Unknown policies and lanes with no share are refused up front."""
+        with pytest.raises(ValueError):
+            LaneQueue({LANE_INTERACTIVE: 1}, policies={LANE_INTERACTIVE: "nope"})
+        with pytest.raises(ValueError):
+            LaneQueue({LANE_INTERACTIVE: 3, LANE_BACKGROUND: 0})
+
+    def test_submit_to_lane(self):
+        atp = AsyncThreadPool(max_threads=2)
+        done = threading.Event()
+        atp.submit(done.set, lane=LANE_BACKGROUND)
+        assert done.wait(timeout=2.0)
+        with pytest.raises(ValueError):
+            atp.submit(done.set, lane="nope")
+        atp.stop()
+
+    def test_submit_mailbox_limit(self):
+        """A full mailbox only rejects tasks that ask for a limit."""
+        atp = AsyncThreadPool(max_threads=2)
+        owner = object()
+        started = threading.Event()
+        release = threading.Event()
+        ran = []
+
+        def hold():
+            started.set()
+            release.wait(2.0)
+
+        assert atp.submit(hold, owner=owner)
+        assert started.wait(2.0)
+        for n in range(3):
+            assert atp.submit(ran.append, (n,), owner=owner, mailbox_limit=3)
+        assert not atp.submit(ran.append, (3,), owner=owner, mailbox_limit=3)
+        # ordered submission without a limit is never turned away
+        assert atp.submit(ran.append, (4,), owner=owner)
+        assert atp.stats()[LANE_INTERACTIVE]["rejected"] == 1
+        release.set()
+        deadline = time.time() + 2.0
+        while len(ran) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        assert ran == [0, 1, 2, 4]
+        atp.stop()
+
+    def test_coroutines_sharded_by_owner(self):
+        """Each owner's coroutines run on one loop, different owners are spread over the loops."""
+        atp = AsyncThreadPool(max_threads=6, loops=3)
+        assert len(atp.loops) == 3
+        # extra loops don't take threads away from sync work
+        assert atp.sync_threads == 5
+        assert len(atp.threads) == 8
+
+        class Owner:
+            def __init__(self, id):
+                self.id = id
+
+        owners = [Owner(i) for i in range(6)]
+        lock = threading.Lock()
+        seen = {}
+        done = threading.Event()
+
+        async def where(owner):
+            with lock:
+                seen.setdefault(owner.id, set()).add(asyncio.get_running_loop())
+                if len(seen) == 6:
+                    done.set()
+
+        for _ in range(3):
+            for o in owners:
+                atp.add_actor_task(o, where, o)
+        assert done.wait(2.0)
+        time.sleep(0.1)
+        atp.stop()
+
+        assert all(len(loops) == 1 for loops in seen.values())
+        assert all(seen[o.id] == {atp.loop_for(o)} for o in owners)
+        assert {atp.loop_for(o) for o in owners} == set(atp.loops)
+        # a small pool still gets every loop asked for
+        small = AsyncThreadPool(max_threads=2, loops=4)
+        assert len(small.loops) == 4
+        assert small.sync_threads == 1
+        small.stop()
+
 
 class TestAsyncTicker:
     def test_ticker(self):
@@ -119,3 +306,209 @@ class TestAsyncTicker:
         # Should have run at least a few times
         # 0.5s / 0.05s = 10 times theoretically. Check for at least 3 to be safe against lag.
         assert current_count >= 3
+
+    def test_tick_batches_and_overruns(self):
+        """Ticks run in one batch per worker and overrunning ticks are merged."""
+        atp = AsyncThreadPool(max_threads=3)
+        slot = AsyncTicker.TimeSlot(1.0, atp, phases=1)
+        release = threading.Event()
+        lock = threading.Lock()
+        calls = []
+
+        class Tickable:
+            def at_tick(self):
+                release.wait(2.0)
+                with lock:
+                    calls.append(self)
+
+        for _ in range(10):
+            slot.add_coro(Tickable().at_tick)
+        slot.running = True
+        slot.tick()
+        # 10 callbacks over 2 sync worker threads
+        assert slot.in_flight == 2
+        slot.tick(0.5)
+        slot.tick()
+        assert slot.overruns == 2
+        assert slot.tick_pending
+
+        release.set()
+        deadline = time.time() + 2.0
+        while (len(calls) < 20 or slot.in_flight) and time.time() < deadline:
+            time.sleep(0.01)
+        stats = slot.stats()
+        assert len(calls) == 20
+        assert stats["ticks"] == 2
+        assert stats["max_lag"] == 0.5
+        assert stats["last_duration"] > 0
+        slot.stop()
+        atp.stop()
+
+    def test_tick_not_held_by_busy_owner(self):
+        """A tick deferred into a busy owner's mailbox doesn't keep the phase busy."""
+        atp = AsyncThreadPool(max_threads=3)
+        slot = AsyncTicker.TimeSlot(1.0, atp, phases=1)
+        release = threading.Event()
+        started = threading.Event()
+        ticked = threading.Event()
+
+        class Busy:
+            def long_task(self):
+                started.set()
+                release.wait(2.0)
+
+            def at_tick(self):
+                ticked.set()
+
+        busy = Busy()
+        atp.add_actor_task(busy, busy.long_task)
+        assert started.wait(1.0)
+        slot.add_coro(busy.at_tick)
+        slot.running = True
+        slot.tick()
+        deadline = time.time() + 1.0
+        while slot.in_flight and time.time() < deadline:
+            time.sleep(0.01)
+        assert slot.in_flight == 0
+        assert not ticked.is_set()
+
+        release.set()
+        assert ticked.wait(1.0)
+        slot.stop()
+        atp.stop()
+
+
+    def test_tick_phases_and_idle_areas(self):
+        """Callbacks are split into phases by id and skip ticks where no player is around."""
+        atp = AsyncThreadPool(max_threads=2)
+        slot = AsyncTicker.TimeSlot(1.0, atp, phases=4)
+        lock = threading.Lock()
+        ran = []
+
+        class Player:
+            is_pc = True
+            is_connected = True
+
+        class Room:
+            is_node = True
+
+            def __init__(self, area, contents):
+                self.coord = (area, 0, 0, 0)
+                self.contents = contents
+
+        class Npc:
+            def __init__(self, id, location):
+                self.id = id
+                self.location = location
+
+            def at_tick(self):
+                with lock:
+                    ran.append(self.id)
+
+        watched = Room("test_watched", [Player()])
+        empty = Room("test_empty", [])
+        for i in range(8):
+            slot.add_coro(Npc(i, watched if i % 2 == 0 else empty).at_tick)
+        assert [len(b) for b in slot.buckets] == [2, 2, 2, 2]
+
+        def settle(count):
+            deadline = time.time() + 2.0
+            while (len(ran) < count or slot.in_flight) and time.time() < deadline:
+                time.sleep(0.01)
+
+        slot.running = True
+        slot.tick(phase=0)
+        slot.tick(phase=1)
+        settle(2)
+        # who's around is only looked at once per cycle
+        empty.contents.append(Player())
+        slot.tick(phase=1)
+        settle(2)
+        assert sorted(ran) == [0, 4]
+        # so a player arriving wakes them up on the next cycle
+        slot.tick(phase=0)
+        slot.tick(phase=1)
+        settle(6)
+        assert sorted(ran) == [0, 0, 1, 4, 4, 5]
+        assert slot.stats()["idle_skipped"] == 4
+        slot.stop()
+        atp.stop()
+
+
+class TestTimingWheel:
+    def test_delay_cancel_and_repeat(self):
+        """One-shot timers fire once, cancelled ones never, repeating ones keep going."""
+        atp = AsyncThreadPool(max_threads=2)
+        wheel = TimingWheel(atp, resolution=0.01)
+        lock = threading.Lock()
+        calls = []
+
+        def record(name):
+            with lock:
+                calls.append(name)
+
+        wheel.delay(0.05, record, "once")
+        wheel.delay(0.05, record, "cancelled").cancel()
+        repeating = wheel.delay(0.03, record, "repeat", repeat=True)
+        time.sleep(0.3)
+        repeating.cancel()
+        time.sleep(0.05)
+        with lock:
+            result = list(calls)
+        wheel.stop()
+        atp.stop()
+
+        assert result.count("once") == 1
+        assert "cancelled" not in result
+        assert result.count("repeat") >= 3
+        assert len(wheel) == 0
+
+    def test_cascade(self):
+        """Timers on the upper levels move down and expire on exactly their tick."""
+        wheel = TimingWheel(AsyncThreadPool(max_threads=1), resolution=1.0)
+        handles = {}
+        for tick in (5, 300, 70000):
+            h = TimerHandle(print, (), {}, None, None, 0.0)
+            h.tick = tick
+            wheel._place(h)
+            wheel.count += 1
+            handles[tick] = h
+        # 70000 is past the first two levels
+        assert handles[70000] in wheel.wheels[2][1]
+
+        fired = {}
+        while wheel.current < 70000:
+            due = []
+            wheel._advance(due)
+            for h in due:
+                fired[h.tick] = wheel.current
+        assert fired == {5: 5, 300: 300, 70000: 70000}
+        assert len(wheel) == 0
+        wheel.atp.stop()
+
+
+class TestOffload:
+    def test_plain_data_only(self):
+        """Only plain data can be shipped out, game objects would arrive as detached copies."""
+        assert is_plain((1, "a", [2.0, None], {"k": (True, b"x")}, {3}))
+        assert not is_plain([object()])
+        pool = OffloadPool(workers=0)
+        with pytest.raises(TypeError):
+            pool.submit(gen_maze, object(), 2)
+
+    @pytest.mark.parametrize("workers,backend", [(0, "auto"), (1, "process")])
+    def test_offload_maze(self, workers, backend):
+        """Mazes come back as plain data, from another process or the threadpool."""
+        pool = OffloadPool(workers=workers, backend=backend)
+        cells, map = pool.submit(gen_maze, 6, 4).result(timeout=10)
+        pool.shutdown(True)
+        # dead ends never lead anywhere, so they aren't cells
+        assert 0 < len(cells) < 24
+        assert set(map) == set(cells)
+        # every exit between two cells has a matching exit back
+        for (x, y), (n, s, e, w) in cells.items():
+            assert 0 <= x < 6 and 0 <= y < 4
+            if n and (x, y + 1) in cells:
+                assert cells[(x, y + 1)][1]
+            if e and (x + 1, y) in cells:
+                assert cells[(x + 1, y)][3]
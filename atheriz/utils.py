@@ -13,9 +13,62 @@ _ANSI_COLOR = r"\x1b\[[0-9;]+m"
 _COLOR_REGEX = re.compile(_ANSI_COLOR)
 
 
+class AtomicField:
+    """
+    a declared field stored in the instance dict, without locking. dicts lock themselves on
+    free-threaded builds (and the GIL covers them otherwise) so a read never sees half a write,
+    and a write is a single reference swap. anything that reads then writes still needs obj.lock.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj):
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+def install_atomic_fields(cls):
+    """
+    give cls an AtomicField for every name in thread_safe_fields on it or its bases, skipping
+    names the class already has, like properties, class attributes and slots (slot reads and
+    writes are already single reference swaps, so Object's schema fields need nothing)
+    """
+    if cls.__dict__.get("_has_atomic_fields", False):
+        return
+    for klass in cls.__mro__:
+        for name in klass.__dict__.get("thread_safe_fields", ()):
+            if not hasattr(cls, name):
+                setattr(cls, name, AtomicField(name))
+    cls._has_atomic_fields = True
+
+
 def ensure_thread_safe(obj):
-    """Patches the class of the provided object if not already patched."""
+    """
+    Patches the class of the provided object if not already patched.
+    see settings.THREADSAFE_MODE for how.
+    """
+    from atheriz import settings
+
     cls = obj.__class__
+    if settings.THREADSAFE_MODE == "fields":
+        install_atomic_fields(cls)
+        return
 
     # only patch once
     if getattr(cls, "_is_thread_safe", False):